@@ -0,0 +1,393 @@
+#  SPDX-FileCopyrightText: 2023 EasyScience contributors  <core@easyscience.software>
+#  SPDX-License-Identifier: BSD-3-Clause
+#  © 2021-2023 Contributors to the EasyScience project <https://github.com/easyScience/EasyScience
+
+__author__ = 'github.com/wardsimon'
+__version__ = '0.1.0'
+
+import multiprocessing
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+import xarray as xr
+
+from easyscience.fitting import FitResults
+from easyscience.fitting.minimizers.utils import current_value
+
+SCHEDULERS = ['threads', 'processes']
+
+# Number of points read at a time from data which are not held in memory
+READ_BLOCK_SIZE = 2**20
+
+_WORKER_PLAN = None
+
+
+def _init_worker(plan: 'FitPlan') -> None:
+    global _WORKER_PLAN
+    _WORKER_PLAN = plan
+
+
+def _worker_evaluate_block(values: List[float], start: int, stop: int) -> np.ndarray:
+    for parameter, value in zip(_WORKER_PLAN._parameters, values):
+        parameter.value = value
+    # The parameters set by constraints depend on the values just set, as in the fit function of the minimizer
+    for constraint in _WORKER_PLAN._constraints:
+        constraint()
+    return _WORKER_PLAN._evaluate_block(start, stop)
+
+
+class FitPlan:
+    """
+    Precomputed evaluation plan for fitting a DataArray. The broadcast coordinate matrix and the flattened observations
+    are built once, in the C order which `DataArray.stack(all_x=dims)` would produce. Evaluating the model during a fit
+    is then a single NumPy call followed by a reshape, without creating any xarray objects.
+
+    If chunks are given the points are split into blocks along the leading dimension. The blocks are evaluated on a
+    local pool of threads or forked processes and written into a preallocated output vector.
+
+    Points with a NaN observation or weight can be excluded with `mask_invalid`. The plan then only holds
+    the valid points, and unless the model function is vectorized, the model is only evaluated at those.
+    """
+
+    def __init__(
+        self,
+        data_array: xr.DataArray,
+        compute_func: Callable,
+        postcompute_func: Optional[Callable] = None,
+        args: Tuple[Any, ...] = (),
+        fn_kwargs: Optional[dict] = None,
+        vectorize: bool = False,
+        chunks: Optional[Union[int, Tuple[int, ...]]] = None,
+        scheduler: str = 'threads',
+        workers: Optional[int] = None,
+        parameters: Optional[List] = None,
+        constraints: Optional[List] = None,
+    ):
+        """
+        :param data_array: DataArray which is going to be fitted
+        :param compute_func: Model function. It is given the coordinate matrix of shape (N x n_dims), or (N,) for 1D
+            data. If `vectorize` is set it is given the coordinate grid of shape (*data_shape x n_dims) instead.
+        :param postcompute_func: Function applied to the model result, shaped as the data, after every evaluation
+        :param args: Additional arguments for the model function. Arrays are broadcast to the data and added as extra
+            coordinate columns, anything else is passed on positionally.
+        :param fn_kwargs: Key-word arguments for the model function
+        :param vectorize: Should the model function be given the coordinates as a grid rather than a matrix
+        :param chunks: Chunk size along the leading dimension, or one chunk size per dimension in which case all but
+            the first must span their dimension. `None` evaluates all points in one call.
+        :param scheduler: How chunks are evaluated, one of `SCHEDULERS`. Without the fork start method `processes`
+            falls back to `threads`.
+        :param workers: Number of threads or processes. `None` uses all cores
+        :param parameters: Parameters of the model. The process scheduler sends their values to the workers before
+            every evaluation.
+        :param constraints: Fit constraints, which the process scheduler applies in the workers after setting the
+            parameter values
+        """
+        if scheduler not in SCHEDULERS:
+            raise ValueError(f'Invalid scheduler: {scheduler}. The following schedulers are available: {SCHEDULERS}')
+        if scheduler == 'processes' and chunks is not None and parameters is None:
+            raise ValueError('The parameters of the model are needed to evaluate chunks on processes')
+        if scheduler == 'processes' and 'fork' not in multiprocessing.get_all_start_methods():
+            warnings.warn('The processes scheduler needs the fork start method, using threads instead', stacklevel=2)
+            scheduler = 'threads'
+        self.dims = tuple(data_array.dims)
+        self.shape = tuple(data_array.shape)
+        self.size = int(data_array.size)
+        self.coords = data_array.coords
+        self.vectorize = vectorize
+        self._compute_func = compute_func
+        self._postcompute_func = postcompute_func
+        self._fn_kwargs = {} if fn_kwargs is None else fn_kwargs
+        self._extra_args = [arg for arg in args if not isinstance(arg, np.ndarray)]
+
+        coordinates = [self._coordinate(data_array, dim) for dim in self.dims]
+        columns = [grid.reshape(-1) for grid in np.meshgrid(*coordinates, indexing='ij')]
+        columns += [np.broadcast_to(arg, self.shape).reshape(-1) for arg in args if isinstance(arg, np.ndarray)]
+        points = np.column_stack(columns)
+        if points.shape[1] == 1:
+            points = points.reshape(-1)
+        self.points = points
+
+        self.scheduler = scheduler
+        self._workers = workers
+        self._parameters = parameters
+        self._constraints = [] if constraints is None else constraints
+        self._chunk_bounds = None if chunks is None else self._make_chunk_bounds(chunks)
+        self._model_bounds = self._chunk_bounds
+        self.observations = self.read(data_array)
+        # Indices, in stacked order, of the points which take part in the fit. None if all points do
+        self.valid = None
+        self._valid_points = None
+        self._output = None
+        self._executor = None
+
+    @staticmethod
+    def _coordinate(data_array: xr.DataArray, dim: str) -> np.ndarray:
+        if dim in data_array.coords:
+            return np.asarray(data_array.coords[dim].values)
+        return np.arange(data_array.sizes[dim])
+
+    def _make_chunk_bounds(self, chunks: Union[int, Tuple[int, ...]]) -> List[Tuple[int, int]]:
+        if isinstance(chunks, (int, np.integer)):
+            chunks = (chunks,)
+        if len(chunks) > len(self.shape):
+            raise ValueError(f'Got {len(chunks)} chunk sizes for {len(self.shape)} dimensions')
+        for chunk, length in zip(chunks[1:], self.shape[1:]):
+            if chunk not in (None, -1, length):
+                raise ValueError('Chunks can only split the leading dimension')
+        rows = self.shape[0] if chunks[0] in (None, -1) else int(chunks[0])
+        if rows < 1:
+            raise ValueError('Chunk sizes must be positive')
+        step = rows * (self.size // self.shape[0])
+        return [(start, min(start + step, self.size)) for start in range(0, self.size, step)]
+
+    @property
+    def n_points(self) -> int:
+        """
+        Number of points which take part in the fit.
+
+        :return: Number of valid points
+        :rtype: int
+        """
+        return self.observations.size
+
+    @property
+    def fit_points(self) -> np.ndarray:
+        """
+        Coordinates of the points which take part in the fit.
+
+        :return: Coordinate matrix of the valid points
+        :rtype: numpy.ndarray
+        """
+        if self.valid is None:
+            return self.points
+        return self._valid_points
+
+    def mask_invalid(self, weights: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Exclude the points with a NaN observation or weight, e.g. from a NaN sigma, from the fit. This is done once,
+        afterwards the observations, the coordinates and the evaluated model only cover the valid points. Infinite
+        observations and zero or infinite weights are not masked, they point at a problem with the data.
+
+        :param weights: Flat weights in stacked order
+        :return: Weights of the valid points
+        :rtype: numpy.ndarray
+        """
+        valid = ~np.isnan(self.observations)
+        if weights is not None:
+            valid &= ~np.isnan(weights)
+            if np.any((weights[valid] == 0) | np.isinf(weights[valid])):
+                raise ValueError('Zero or infinite weights, e.g. from zero sigmas, cannot be fitted')
+        if np.any(np.isinf(self.observations[valid])):
+            raise ValueError('Infinite observations cannot be fitted')
+        if np.all(valid):
+            return weights
+        self.valid = np.flatnonzero(valid)
+        self.observations = self.observations[self.valid]
+        self._valid_points = self.points[self.valid]
+        self._output = None
+        if self._chunk_bounds is not None and not self.vectorize:
+            edges = np.searchsorted(self.valid, [start for start, _ in self._chunk_bounds] + [self.size])
+            self._model_bounds = [(int(start), int(stop)) for start, stop in zip(edges[:-1], edges[1:]) if stop > start]
+        if weights is not None:
+            weights = weights[self.valid]
+        return weights
+
+    @property
+    def n_chunks(self) -> int:
+        """
+        Number of blocks the points are evaluated in.
+
+        :return: Number of chunks, 1 if the plan is not chunked
+        :rtype: int
+        """
+        if self._model_bounds is None:
+            return 1
+        return len(self._model_bounds)
+
+    @property
+    def inputs(self) -> np.ndarray:
+        """
+        Independent values in the form given to the model function.
+
+        :return: Coordinate matrix of the valid points, or a grid view of all points for vectorized functions
+        :rtype: numpy.ndarray
+        """
+        if not self.vectorize:
+            return self.fit_points
+        if self.points.ndim == 1:
+            return self.points.reshape(self.shape)
+        return self.points.reshape(self.shape + (self.points.shape[1],))
+
+    def evaluate(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Evaluate the model with the current parameter values.
+
+        :param out: Optional flat array of `n_points` elements the result is written into
+        :return: Flat model values at the valid points in stacked order. For a chunked plan without `out` this is the
+            plan's own output vector, which is reused by the next evaluation.
+        :rtype: numpy.ndarray
+        """
+        # Unless the function is vectorized, the model is evaluated at the valid points only
+        all_points = self.valid is None or self.vectorize
+        if self._model_bounds is None:
+            result = self._compute_func(self.inputs, *self._extra_args, **self._fn_kwargs)
+        else:
+            direct = not all_points or self.valid is None
+            result = self._evaluate_chunks(out if direct and self._postcompute_func is None else None)
+        if self._postcompute_func is not None:
+            result = np.reshape(result, self.shape) if all_points else self.expand(result)
+            result = self._postcompute_func(result)
+            all_points = True
+        result = np.reshape(result, -1)
+        if all_points and self.valid is not None:
+            result = result[self.valid]
+        if out is None:
+            return result
+        if not np.may_share_memory(result, out):
+            out[:] = result
+        return out
+
+    def _evaluate_block(self, start: int, stop: int) -> np.ndarray:
+        if self.vectorize:
+            points = self.points[start:stop]
+            points = points.reshape((-1,) + self.shape[1:] + points.shape[1:])
+        else:
+            points = self.fit_points[start:stop]
+        return self._compute_func(points, *self._extra_args, **self._fn_kwargs)
+
+    def _evaluate_chunks(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        if self.scheduler == 'threads':
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers)
+            blocks = self._executor.map(lambda bounds: self._evaluate_block(*bounds), self._model_bounds)
+        else:
+            if self._executor is None:
+                # Forking hands every worker its own copy of the plan and the model without pickling them
+                context = multiprocessing.get_context('fork')
+                self._executor = context.Pool(self._workers or os.cpu_count(), _init_worker, (self,))
+            values = [current_value(parameter) for parameter in self._parameters]
+            blocks = self._executor.starmap(_worker_evaluate_block, [(values, *bounds) for bounds in self._model_bounds])
+        for (start, stop), block in zip(self._model_bounds, blocks):
+            block = np.reshape(block, -1)
+            if out is None:
+                if self._output is None:
+                    self._output = np.empty(self.size if self.vectorize else self.n_points, dtype=block.dtype)
+                out = self._output
+            out[start:stop] = block
+        return out
+
+    def close(self) -> None:
+        """
+        Shut down the threads or processes used to evaluate chunks.
+        """
+        if self._executor is None:
+            return
+        if self.scheduler == 'threads':
+            self._executor.shutdown()
+        else:
+            self._executor.close()
+            self._executor.join()
+        self._executor = None
+
+    def read(self, data_array: xr.DataArray, func: Optional[Callable] = None) -> np.ndarray:
+        """
+        Flatten a DataArray shaped as the data into stacked order. Data held in memory, including memory-mapped
+        files, are returned as a view. Lazily loaded data are streamed block-wise along the leading dimension, and
+        `func` is applied to every block, so that neither the full data nor the full intermediate are loaded twice.
+
+        :param data_array: DataArray with the same dimensions as the data
+        :param func: Optional element-wise function applied to the values, e.g. a sigma generator
+        :return: Flat array
+        :rtype: numpy.ndarray
+        """
+        data_array = data_array.transpose(*self.dims)
+        if func is None and isinstance(data_array.variable._data, np.ndarray):
+            return np.reshape(data_array.variable._data, -1)
+        output = None
+        for start, stop in self._read_bounds():
+            rows = slice(start * self.shape[0] // self.size, stop * self.shape[0] // self.size)
+            block = data_array[{self.dims[0]: rows}].values
+            if func is not None:
+                block = np.asarray(func(block))
+            if output is None:
+                output = np.empty(self.size, dtype=block.dtype)
+            output[start:stop] = np.reshape(block, -1)
+        return output
+
+    def _read_bounds(self) -> List[Tuple[int, int]]:
+        if self._chunk_bounds is not None:
+            return self._chunk_bounds
+        row_size = self.size // self.shape[0]
+        step = max(1, READ_BLOCK_SIZE // row_size) * row_size
+        return [(start, min(start + step, self.size)) for start in range(0, self.size, step)]
+
+    def flatten(self, values: Any) -> np.ndarray:
+        """
+        Flatten an array shaped as the data, e.g. weights, into stacked order.
+
+        :param values: Array or DataArray with the same shape as the data
+        :return: Flat array
+        :rtype: numpy.ndarray
+        """
+        if isinstance(values, xr.DataArray):
+            values = self.read(values)
+        values = np.reshape(values, -1)
+        if values.size != self.size:
+            raise ValueError(f'Expected {self.size} values, got {values.size}')
+        return values
+
+    def expand(self, values: np.ndarray, fill_value: float = np.nan) -> np.ndarray:
+        """
+        Scatter values of the valid points back onto all points.
+
+        :param values: Flat array with a value for every valid point
+        :param fill_value: Value of the excluded points
+        :return: Array shaped as the data
+        :rtype: numpy.ndarray
+        """
+        if self.valid is None:
+            return np.reshape(values, self.shape)
+        expanded = np.full(self.size, fill_value, dtype=np.result_type(values, fill_value))
+        expanded[self.valid] = np.reshape(values, -1)
+        return expanded.reshape(self.shape)
+
+    def to_data_array(self, values: np.ndarray, name: Optional[str] = None) -> xr.DataArray:
+        """
+        Reshape flat values in stacked order back into a DataArray with the dimensions and coordinates of the data.
+        Values of the valid points only are expanded, with NaN at the excluded points.
+
+        :param values: Flat array
+        :param name: Name of the new DataArray
+        :return: DataArray shaped as the data
+        :rtype: xarray.DataArray
+        """
+        if np.size(values) != self.size:
+            values = self.expand(values)
+        return xr.DataArray(np.reshape(values, self.shape), dims=self.dims, coords=self.coords, name=name)
+
+    def unpack_results(self, fit_results: FitResults) -> FitResults:
+        """
+        Convert fit results obtained on the flat arrays of this plan into DataArrays shaped as the data.
+
+        :param fit_results: Results of a fit to be modified
+        :return: Modified fit results
+        :rtype: FitResults
+        """
+        for item in ['y_obs', 'y_calc', 'y_err']:
+            values = getattr(fit_results, item)
+            if isinstance(values, np.ndarray) and values.size == self.n_points:
+                setattr(fit_results, item, self.to_data_array(values, name=item))
+        x_dataset = xr.Dataset()
+        columns = [self.points] if self.points.ndim == 1 else self.points.T
+        for dim, column in zip(self.dims, columns):
+            x_dataset[dim + '_broadcast'] = self.to_data_array(column, name=dim + '_broadcast')
+        fit_results.x_matrices = x_dataset
+        return fit_results
@@ -5,6 +5,7 @@
 __author__ = 'github.com/wardsimon'
 __version__ = '0.1.0'
 
+import os
 import weakref
 from typing import Any
 from typing import Callable
@@ -19,12 +20,23 @@ import numpy as np
 # import pint_xarray
 import xarray as xr
 
-from easyscience import ureg
 from easyscience.fitting import FitResults
+from easyscience.Utils.units import ureg_unit
+
+from .fit_plan import FitPlan
 
 T_ = TypeVar('T_')
 
 
+def _along(axis: int, start: int, stop: int = None) -> Tuple[slice, ...]:
+    """
+    Index of `start:stop` along `axis`, or of `:start` if `stop` is not given.
+    """
+    if stop is None:
+        start, stop = 0, start
+    return (slice(None),) * axis + (slice(start, stop),)
+
+
 @xr.register_dataset_accessor('easyscience')
 class EasyScienceDatasetAccessor:
     """
@@ -49,6 +61,13 @@ class EasyScienceDatasetAccessor:
         self._obj = xarray_obj
         self._core_object = None
         self.__error_mapper = {}
+        self.__lazy_sigmas = {}
+        # Variables computed element-wise from another one, {derived_label: (variable_label, derived_func)}
+        self.__derived_variables = {}
+        # Arrays with room for more frames, {variable_label: (buffer, dim)}, see `append_frames`
+        self.__frame_buffers = {}
+        # Files opened by `load_variables`, the lazily loaded variables are read from them
+        self.__sources = []
         self.sigma_label_prefix = 's_'
         if self._obj.attrs.get('name', None) is None:
             self._obj.attrs['name'] = ''
@@ -169,7 +188,7 @@ class EasyScienceDatasetAccessor:
         :rtype: None
         """
         self._obj.coords[coordinate_name] = coordinate_values
-        self._obj.attrs['units'][coordinate_name] = ureg.Unit(unit)
+        self._obj.attrs['units'][coordinate_name] = ureg_unit(unit)
 
     def remove_coordinate(self, coordinate_name: str):
         """
@@ -192,6 +211,7 @@ class EasyScienceDatasetAccessor:
         variable_sigma: Union[List[T_], np.ndarray] = None,
         unit: str = '',
         auto_sigma: bool = False,
+        lazy_sigma: bool = False,
     ):
         """
         Create a DataArray from known coordinates and data, assign it to the dataset under a given name. Variances can
@@ -209,6 +229,8 @@ class EasyScienceDatasetAccessor:
         :type unit: str
         :param auto_sigma: Should the sigma DataArray be automatically calculated assuming gaussian probability?
         :type auto_sigma: bool
+        :param lazy_sigma: Should generated sigmas only be computed, chunk-wise, when they are needed for a fit?
+        :type lazy_sigma: bool
         :return: None
         :rtype: None
         """
@@ -235,7 +257,7 @@ class EasyScienceDatasetAccessor:
             # CASE 1, user has supplied sigmas
             if isinstance(variable_sigma, Callable):
                 # CASE 1-1, The sigmas are created by some kind of generator
-                self.sigma_generator(variable_name, variable_sigma)
+                self.sigma_generator(variable_name, variable_sigma, lazy=lazy_sigma)
             elif isinstance(variable_sigma, np.ndarray):
                 # CASE 1-2, The sigmas are a numpy arrays
                 self.sigma_attach(variable_name, variable_sigma)
@@ -248,16 +270,16 @@ class EasyScienceDatasetAccessor:
             # CASE 2, No sigmas have been supplied.
             if auto_sigma:
                 # CASE 2-1, Automatically generate the sigmas using gaussian probability
-                self.sigma_generator(variable_name)
+                self.sigma_generator(variable_name, lazy=lazy_sigma)
 
         # Set units for the newly created DataArray
-        self._obj.attrs['units'][variable_name] = ureg.Unit(unit)
+        self._obj.attrs['units'][variable_name] = ureg_unit(unit)
         # If a sigma has been attached, attempt to work out the units.
         if unit and variable_sigma is None and auto_sigma:
-            self._obj.attrs['units'][self.sigma_label_prefix + variable_name] = ureg.Unit(unit + ' ** 0.5')
+            self._obj.attrs['units'][self.sigma_label_prefix + variable_name] = ureg_unit(unit + ' ** 0.5')
         else:
             if auto_sigma:
-                self._obj.attrs['units'][self.sigma_label_prefix + variable_name] = ureg.Unit('')
+                self._obj.attrs['units'][self.sigma_label_prefix + variable_name] = ureg_unit('')
 
     def remove_variable(self, variable_name: str):
         """
@@ -269,15 +291,229 @@ class EasyScienceDatasetAccessor:
         :rtype: None
         """
         del self._obj[variable_name]
+        self.__derived_variables.pop(variable_name, None)
+
+    def add_derived_variable(
+        self,
+        derived_label: str,
+        variable_label: str,
+        derived_func: Callable,
+        unit: str = '',
+    ):
+        """
+        Add a DataArray computed element-wise from another DataArray, e.g. a normalised intensity. The function is
+        registered, so that when frames are appended with `append_frames` it is only applied to the new frames.
+
+        :param derived_label: Name of the DataArray which will be created and added to the dataset
+        :type derived_label: str
+        :param variable_label: Name of the DataArray the new one is computed from
+        :type variable_label: str
+        :param derived_func: Element-wise function of the form f(x), returning an array of the same shape as the input
+        :type derived_func: Callable
+        :param unit: Unit associated with the new DataArray
+        :type unit: str
+        :return: None
+        :rtype: None
+        """
+        self._obj[derived_label] = derived_func(self._obj[variable_label])
+        self._obj.attrs['units'][derived_label] = ureg_unit(unit)
+        self.__derived_variables[derived_label] = (variable_label, derived_func)
+
+    def append_frames(
+        self,
+        dim: str,
+        coordinate_values: Union[List[T_], np.ndarray],
+        variables: dict,
+    ):
+        """
+        Append frames along a dimension, e.g. time during a live acquisition. Variables which were derived from
+        the appended ones, including generated sigmas, are only computed for the new frames. The variables are views
+        of arrays which grow geometrically, so that the existing frames are only copied when those are full. The
+        coordinate of the dimension is copied on every call.
+
+        :param dim: Dimension to append along
+        :type dim: str
+        :param coordinate_values: Coordinate values of the new frames
+        :type coordinate_values: Union[List[T_], numpy.ndarray]
+        :param variables: New frames of every variable along `dim` which is not derived, {variable_label: values}.
+            The values have the dimensions of the variable.
+        :type variables: dict
+        :return: None
+        :rtype: None
+        """
+        coordinate_values = np.atleast_1d(np.asarray(coordinate_values))
+        along = [name for name, variable in self._obj.data_vars.items() if dim in variable.dims]
+        missing = [name for name in along if name not in variables and name not in self.__derived_variables]
+        if missing:
+            raise ValueError(f'New frames must be supplied for the variables: {missing}')
+
+        frames = {}
+        for name, values in variables.items():
+            variable = self._obj[name]
+            coords = {key: coord for key, coord in variable.coords.items() if dim not in coord.dims}
+            coords[dim] = coordinate_values
+            frames[name] = xr.DataArray(values, dims=variable.dims, coords=coords)
+        # Derived variables are registered after the variables they are computed from
+        for name, (variable_label, derived_func) in self.__derived_variables.items():
+            if name in along and name not in frames:
+                frames[name] = derived_func(frames[variable_label])
+
+        combined = {name: self.__append_to_buffer(name, dim, frames[name]) for name in along}
+        coordinate = np.concatenate([self._obj.coords[dim].values, coordinate_values])
+        for name in along:
+            del self._obj[name]
+        self._obj.coords[dim] = coordinate
+        for name in along:
+            self._obj[name] = combined[name]
+
+    def __append_to_buffer(self, name: str, dim: str, frames: xr.DataArray) -> xr.Variable:
+        """
+        The variable `name` with `frames` appended along `dim`. The frames are written into spare room of the array
+        the variable is a view of, which is only reallocated, with twice the size, when it is full. A variable which
+        is not a view made here, e.g. one which was replaced, is first copied into a new array.
+        """
+        variable = self._obj[name].variable
+        axis = variable.dims.index(dim)
+        n_old = variable.shape[axis]
+        n_new = n_old + frames.sizes[dim]
+        dtype = np.result_type(variable.dtype, frames.dtype)
+        buffer, buffer_dim = self.__frame_buffers.get(name, (None, None))
+        is_view = (
+            buffer is not None
+            and buffer_dim == dim
+            and buffer.dtype == dtype
+            and isinstance(variable._data, np.ndarray)
+            and variable._data.base is buffer
+            and variable._data.shape == buffer[_along(axis, n_old)].shape
+        )
+        if not is_view or buffer.shape[axis] < n_new:
+            shape = list(variable.shape)
+            shape[axis] = max(2 * n_new, 1)
+            new_buffer = np.empty(shape, dtype=dtype)
+            new_buffer[_along(axis, n_old)] = variable.values
+            buffer = new_buffer
+            self.__frame_buffers[name] = (buffer, dim)
+        buffer[_along(axis, n_old, n_new)] = frames.transpose(*variable.dims).values
+        return xr.Variable(variable.dims, buffer[_along(axis, n_new)], attrs=variable.attrs)
+
+    def add_memmap_variable(
+        self,
+        variable_name: str,
+        variable_coordinates: Union[str, List[str]],
+        filename: str,
+        dtype: str = 'float64',
+        mode: str = 'r',
+        offset: int = 0,
+        variable_sigma: Callable = None,
+        unit: str = '',
+        auto_sigma: bool = False,
+    ):
+        """
+        Create a DataArray backed by a raw binary file through `numpy.memmap`. The file is only paged into memory as it
+        is read, so the data can be larger than the available RAM. Generated sigmas are lazy.
+
+        :param variable_name: Name of the DataArray which will be created and added to the dataset
+        :type variable_name: str
+        :param variable_coordinates: List of coordinates, which set the shape of the data in the file
+        :type variable_coordinates: str, List[str]
+        :param filename: Path to the binary file, stored in C order
+        :type filename: str
+        :param dtype: Data type of the file
+        :type dtype: str
+        :param mode: File mode, see `numpy.memmap`
+        :type mode: str
+        :param offset: Offset in bytes of the data in the file
+        :type offset: int
+        :param variable_sigma: Function generating the sigmas from the data
+        :type variable_sigma: Callable
+        :param unit: Unit associated with the DataArray
+        :type unit: str
+        :param auto_sigma: Should the sigmas be generated assuming gaussian probability?
+        :type auto_sigma: bool
+        :return: None
+        :rtype: None
+        """
+        if isinstance(variable_coordinates, str):
+            variable_coordinates = [variable_coordinates]
+        for dimension in variable_coordinates:
+            if dimension not in self._obj.coords.keys():
+                raise ValueError(f'The supplied coordinate `{dimension}` must first be defined.')
+        shape = tuple(self._obj.sizes[dimension] for dimension in variable_coordinates)
+        values = np.memmap(filename, dtype=dtype, mode=mode, offset=offset, shape=shape)
+        self.add_variable(
+            variable_name,
+            variable_coordinates,
+            values,
+            variable_sigma=variable_sigma,
+            unit=unit,
+            auto_sigma=auto_sigma,
+            lazy_sigma=True,
+        )
+
+    def load_variables(
+        self,
+        filename: str,
+        variable_names: Union[str, List[str]] = None,
+        engine: str = None,
+        auto_sigma: bool = False,
+    ):
+        """
+        Attach variables from a NetCDF, HDF5 or zarr store through xarray's lazy backends. Only the coordinates are
+        read, the data stay on disk until they are used. Generated sigmas are lazy. The store is kept open until
+        `close` is called or the DataSet is garbage collected.
+
+        :param filename: Path to the file or store
+        :type filename: str
+        :param variable_names: Variables to attach. All data variables of the store if not given
+        :type variable_names: str, List[str]
+        :param engine: xarray backend, e.g. `netcdf4`, `h5netcdf`, `scipy` or `zarr`
+        :type engine: str
+        :param auto_sigma: Should the sigmas be generated assuming gaussian probability?
+        :type auto_sigma: bool
+        :return: None
+        :rtype: None
+        """
+        source = xr.open_dataset(filename, engine=engine, chunks=None, cache=False)
+        self.__sources.append(source)
+        if variable_names is None:
+            variable_names = list(source.data_vars)
+        elif isinstance(variable_names, str):
+            variable_names = [variable_names]
+        for variable_name in variable_names:
+            variable = source[variable_name]
+            for dimension in variable.dims:
+                if dimension not in self._obj.coords.keys():
+                    coordinate = source.coords.get(dimension, None)
+                    values = np.arange(source.sizes[dimension]) if coordinate is None else coordinate.values
+                    unit = '' if coordinate is None else coordinate.attrs.get('units', '')
+                    self.add_coordinate(dimension, values, unit=unit)
+            self._obj[variable_name] = variable
+            self._obj.attrs['units'][variable_name] = ureg_unit(variable.attrs.get('units', ''))
+            if auto_sigma:
+                self.sigma_generator(variable_name, lazy=True)
+
+    def close(self) -> None:
+        """
+        Close the stores opened by `load_variables`. Variables which have not been loaded into memory can no longer be
+        read afterwards.
+
+        :return: None
+        :rtype: None
+        """
+        for source in self.__sources:
+            source.close()
+        self.__sources = []
 
     def sigma_generator(
         self,
         variable_label: str,
         sigma_func: Callable = lambda x: np.sqrt(np.abs(x)),
         label_prefix: str = None,
+        lazy: bool = False,
     ):
         """
-        Generate sigmas off of a DataArray based on a function.
+        Generate sigmas off of a DataArray based on a function. Lazy sigmas are not stored in the DataSet, the function
+        is applied chunk-wise to the data when the sigmas are needed for a fit.
 
         :param variable_label: Name of the DataArray to perform the calculation on
         :type variable_label: str
@@ -285,11 +521,20 @@ class EasyScienceDatasetAccessor:
         :type sigma_func: Callable
         :param label_prefix: What prefix should be used to designate a sigma DataArray from a data DataArray
         :type label_prefix: str
+        :param lazy: Should the sigmas only be computed when they are needed?
+        :type lazy: bool
         :return: None
         :rtype: None
         """  # noqa: E501
+        if lazy:
+            self.__error_mapper.pop(variable_label, None)
+            self.__lazy_sigmas[variable_label] = sigma_func
+            return
         sigma_values = sigma_func(self._obj[variable_label])
         self.sigma_attach(variable_label, sigma_values, label_prefix)
+        # Register the sigmas, so that only appended frames have to be generated
+        sigma_label = self.__error_mapper[variable_label]
+        self.__derived_variables[sigma_label] = (variable_label, sigma_func)
 
     def sigma_attach(
         self,
@@ -318,6 +563,8 @@ class EasyScienceDatasetAccessor:
 
         # Map the original DataArray to the new sigma DataArray
         self.__error_mapper[variable_label] = sigma_label
+        self.__lazy_sigmas.pop(variable_label, None)
+        self.__derived_variables.pop(sigma_label, None)
         # Assign the sigma DataArray to the DataSet
         if not isinstance(sigma_values, xr.DataArray):
             self._obj[sigma_label] = (
@@ -358,6 +605,24 @@ class EasyScienceDatasetAccessor:
         f = f.stack(all_x=n_array)
         return f
 
+    def __fit_weights(self, variable_label: str) -> Union[xr.DataArray, Callable, None]:
+        """
+        Fit weights of a DataArray from its sigmas. Lazy sigmas give a function, which generates the weights
+        chunk-wise from the data.
+        """
+        if self.__error_mapper.get(variable_label, False):
+            with np.errstate(divide='ignore'):
+                return 1 / self._obj[self.__error_mapper[variable_label]]
+        if self.__lazy_sigmas.get(variable_label, False):
+            sigma_func = self.__lazy_sigmas[variable_label]
+
+            def weights_func(values):
+                with np.errstate(divide='ignore'):
+                    return 1 / np.asarray(sigma_func(values))
+
+            return weights_func
+        return None
+
     def fit(
         self,
         fitter,
@@ -367,27 +632,36 @@ class EasyScienceDatasetAccessor:
         fit_kwargs: dict = None,
         fn_kwargs: dict = None,
         vectorized: bool = False,
+        dask_chunks: Union[int, Tuple[int, ...]] = None,
+        scheduler: str = 'threads',
+        workers: int = None,
         **kwargs,
     ) -> List[FitResults]:
         """
         Perform a fit on one or more DataArrays. This fit utilises a given fitter from `EasyScience.fitting.Fitter`, though
         there are a few differences to a standard EasyScience fit. In particular, key-word arguments to control the
-        optimisation algorithm go in the `fit_kwargs` dictionary, fit function key-word arguments go in the `fn_kwargs`
-        and given key-word arguments control the `xarray.apply_ufunc` function.
+        optimisation algorithm go in the `fit_kwargs` dictionary and fit function key-word arguments go in the
+        `fn_kwargs`. Each DataArray is evaluated through its own `FitPlan`.
 
         :param fitter: Fitting object which controls the fitting
         :type fitter: EasyScience.fitting.Fitter
         :param args: Arguments to go to the fit function
         :type args: Any
-        :param dask: Dask control string. See `xarray.apply_ufunc` documentation
+        :param dask: Dask control string. Anything but `forbidden` evaluates the fit function in chunks
         :type dask: str
         :param fit_kwargs: Dictionary of key-word arguments to be supplied to the Fitting control
         :type fit_kwargs: dict
         :param fn_kwargs: Dictionary of key-words to be supplied to the fit function
         :type fn_kwargs: dict
-        :param vectorized: Should the fit function be given dependents in a single object or split
+        :param vectorized: Should the fit function be given the coordinates as a grid rather than as a matrix
         :type vectorized: bool
-        :param kwargs: Key-word arguments for `xarray.apply_ufunc`. See `xarray.apply_ufunc` documentation
+        :param dask_chunks: How to split the leading dimension of each DataArray. Defaults to one chunk per worker
+        :type dask_chunks: Union[int, Tuple[int..]]
+        :param scheduler: Evaluate the chunks on `threads` or on forked `processes`
+        :type scheduler: str
+        :param workers: Number of threads or processes. `None` uses all cores
+        :type workers: int
+        :param kwargs: Kept for compatibility, the fit plan does not use `xarray.apply_ufunc`
         :type kwargs: Any
         :return: Results of the fit
         :rtype: List[FitResults]
@@ -404,11 +678,10 @@ class EasyScienceDatasetAccessor:
         if len(data_arrays) == 1:
             variable_label = data_arrays[0]
             dataset = self._obj[variable_label]
-            if self.__error_mapper.get(variable_label, False):
-                # Pull out any sigmas and send them to the fitter.
-                temp = self._obj[self.__error_mapper[variable_label]]
-                temp[xr.ufuncs.isnan(temp)] = 1e5
-                fit_kwargs['weights'] = temp
+            weights = self.__fit_weights(variable_label)
+            if weights is not None:
+                # Points with a NaN sigma are left out of the fit by the fit plan.
+                fit_kwargs['weights'] = weights
             # Perform a standard DataArray fit.
             return dataset.EasyScience.fit(
                 fitter,
@@ -417,59 +690,75 @@ class EasyScienceDatasetAccessor:
                 fn_kwargs=fn_kwargs,
                 dask=dask,
                 vectorize=vectorized,
+                dask_chunks=dask_chunks,
+                scheduler=scheduler,
+                workers=workers,
                 **kwargs,
             )
         else:
             # In this case we are fitting multiple datasets to the same fn!
-            bdim_f = [self._obj[p].EasyScience.fit_prep(fitter.fit_function) for p in data_arrays]
-            dim_names = [
-                list(self._obj[p].dims.keys()) if isinstance(self._obj[p].dims, dict) else self._obj[p].dims
+            old_fit_func = fitter.fit_function
+            parameters = fitter.fit_object.get_fit_parameters()
+            constraints = fitter.fit_constraints()
+            plans = [
+                self._obj[p].EasyScience.fit_plan(
+                    old_fit_func,
+                    *args,
+                    fn_kwargs=fn_kwargs,
+                    vectorize=vectorized,
+                    dask=dask,
+                    dask_chunks=dask_chunks,
+                    scheduler=scheduler,
+                    workers=workers,
+                    parameters=parameters,
+                    constraints=constraints,
+                )
                 for p in data_arrays
             ]
-            bdims = [bdim[0] for bdim in bdim_f]
-            fs = [bdim[1] for bdim in bdim_f]
-            old_fit_func = fitter.fit_function
 
-            fn_array = []
-            y_list = []
-            for _idx, d in enumerate(bdims):
-                dims = self._obj[data_arrays[_idx]].dims
-                if isinstance(dims, dict):
-                    dims = list(dims.keys())
-
-                def local_fit_func(x, *args, idx=None, **kwargs):
-                    kwargs['vectorize'] = vectorized
-                    res = xr.apply_ufunc(
-                        fs[idx],
-                        *bdims[idx],
-                        *args,
-                        dask=dask,
-                        kwargs=fn_kwargs,
-                        **kwargs,
-                    )
-                    if dask != 'forbidden':
-                        res.compute()
-                    return res.stack(all_x=dim_names[idx])
-
-                y_list.append(self._obj[data_arrays[_idx]].stack(all_x=dims))
-                fn_array.append(local_fit_func)
+            # Prepare the valid points and their weights of every DataArray once
+            weights = []
+            for variable_label, plan in zip(data_arrays, plans):
+                variable_weights = self.__fit_weights(variable_label)
+                if callable(variable_weights):
+                    variable_weights = plan.read(self._obj[variable_label], variable_weights)
+                elif variable_weights is not None:
+                    variable_weights = plan.flatten(variable_weights)
+                weights.append(plan.mask_invalid(variable_weights))
+            if any(variable_weights is not None for variable_weights in weights):
+                fit_kwargs['weights'] = np.concatenate(
+                    [
+                        1 / np.sqrt(np.abs(plan.observations)) if variable_weights is None else variable_weights
+                        for plan, variable_weights in zip(plans, weights)
+                    ]
+                )
+            else:
+                fit_kwargs.pop('weights', None)
+
+            # Every DataArray writes its results into its own slice of a persistent buffer
+            offsets = np.cumsum([0] + [plan.n_points for plan in plans])
+            y = np.concatenate([plan.observations for plan in plans], axis=0)
+            buffer = np.empty(y.size, dtype=np.result_type(y.dtype, float))
 
             def fit_func(x, *args, **kwargs):
-                res = []
-                for idx in range(len(fn_array)):
-                    res.append(fn_array[idx](x, *args, idx=idx, **kwargs))
-                return xr.DataArray(np.concatenate(res, axis=0), coords={'all_x': x}, dims='all_x')
+                for plan, start, stop in zip(plans, offsets[:-1], offsets[1:]):
+                    plan.evaluate(out=buffer[start:stop])
+                return buffer
 
+            # A new fit function means a new minimizer, which has to be given the constraints again
             fitter.initialize(fitter.fit_object, fit_func)
+            for constraint in constraints:
+                fitter.add_fit_constraint(constraint)
             try:
-                if fit_kwargs.get('weights', None) is not None:
-                    del fit_kwargs['weights']
-                x = xr.DataArray(np.arange(np.sum([y.size for y in y_list])), dims='all_x')
-                y = xr.DataArray(np.concatenate(y_list, axis=0), coords={'all_x': x}, dims='all_x')
+                x = np.arange(y.size)
                 f_res = fitter.fit(x, y, **fit_kwargs)
-                f_res = check_sanity_multiple(f_res, [self._obj[p] for p in data_arrays])
+                f_res = check_sanity_multiple(f_res, [self._obj[p] for p in data_arrays], plans)
             finally:
                 fitter.fit_function = old_fit_func
+                for constraint in constraints:
+                    fitter.add_fit_constraint(constraint)
+                for plan in plans:
+                    plan.close()
             return f_res
 
 
@@ -649,6 +938,66 @@ class EasyScienceDataarrayAccessor:
 
         return bdims, func
 
+    def fit_plan(
+        self,
+        func_in: Callable,
+        *args,
+        fn_kwargs: dict = None,
+        vectorize: bool = False,
+        dask: str = 'forbidden',
+        dask_chunks: Union[int, Tuple[int, ...]] = None,
+        scheduler: str = 'threads',
+        workers: int = None,
+        parameters: List = None,
+        constraints: List = None,
+    ) -> FitPlan:
+        """
+        Compile a fit plan for the DataArray. The broadcast coordinates and the flattened data are computed once, so
+        the plan can evaluate `func_in` during a fit without any xarray bookkeeping.
+
+        :param func_in: Function to be evaluated on the coordinates of the DataArray.
+        :type func_in: Callable
+        :param args: Additional arguments for the function. Arrays are added as extra coordinate columns.
+        :type args: Any
+        :param fn_kwargs: Dictionary of key-words to be supplied to the function
+        :type fn_kwargs: dict
+        :param vectorize: Should the function be given the coordinates as a grid rather than as a matrix
+        :type vectorize: bool
+        :param dask: Dask control string. Anything but `forbidden` evaluates the function in chunks
+        :type dask: str
+        :param dask_chunks: How to split the leading dimension. Defaults to one chunk per worker
+        :type dask_chunks: Union[int, Tuple[int..]]
+        :param scheduler: Evaluate the chunks on `threads` or on forked `processes`
+        :type scheduler: str
+        :param workers: Number of threads or processes. `None` uses all cores
+        :type workers: int
+        :param parameters: Parameters of the model, needed by the `processes` scheduler
+        :type parameters: List
+        :param constraints: Fit constraints, applied in the workers of the `processes` scheduler
+        :type constraints: List
+        :return: Compiled fit plan
+        :rtype: FitPlan
+        """
+        self._obj.attrs['computation']['compute_func'] = func_in
+        chunks = None
+        if dask != 'forbidden':
+            chunks = dask_chunks
+            if chunks is None:
+                chunks = -(-self._obj.shape[0] // (workers or os.cpu_count()))
+        return FitPlan(
+            self._obj,
+            self.compute_func,
+            postcompute_func=self._obj.attrs['computation']['postcompute_func'],
+            args=args,
+            fn_kwargs=fn_kwargs,
+            vectorize=vectorize,
+            chunks=chunks,
+            scheduler=scheduler,
+            workers=workers,
+            parameters=parameters,
+            constraints=constraints,
+        )
+
     def generate_points(self) -> xr.DataArray:
         """
         Generate an expanded DataArray of points which corresponds to broadcasted dimensions (`all_x`) which have been
@@ -677,27 +1026,38 @@ class EasyScienceDataarrayAccessor:
         fn_kwargs: dict = None,
         vectorize: bool = False,
         dask: str = 'forbidden',
+        dask_chunks: Union[int, Tuple[int, ...]] = None,
+        scheduler: str = 'threads',
+        workers: int = None,
         **kwargs,
     ) -> FitResults:
         """
         Perform a fit on the given DataArray. This fit utilises a given fitter from `EasyScience.fitting.Fitter`, though
         there are a few differences to a standard EasyScience fit. In particular, key-word arguments to control the
-        optimisation algorithm go in the `fit_kwargs` dictionary, fit function key-word arguments go in the `fn_kwargs`
-        and given key-word arguments control the `xarray.apply_ufunc` function.
+        optimisation algorithm go in the `fit_kwargs` dictionary and fit function key-word arguments go in the
+        `fn_kwargs`. The coordinates are broadcast once into a `FitPlan`, so the fit function is called with plain
+        NumPy arrays on every iteration.
 
         :param fitter: Fitting object which controls the fitting
         :type fitter: EasyScience.fitting.Fitter
         :param args: Arguments to go to the fit function
         :type args: Any
-        :param dask: Dask control string. See `xarray.apply_ufunc` documentation
+        :param dask: Dask control string. Anything but `forbidden` evaluates the fit function in chunks
         :type dask: str
-        :param fit_kwargs: Dictionary of key-word arguments to be supplied to the Fitting control
+        :param dask_chunks: How to split the leading dimension. Defaults to one chunk per worker
+        :type dask_chunks: Union[int, Tuple[int..]]
+        :param scheduler: Evaluate the chunks on `threads` or on forked `processes`
+        :type scheduler: str
+        :param workers: Number of threads or processes. `None` uses all cores
+        :type workers: int
+        :param fit_kwargs: Dictionary of key-word arguments to be supplied to the Fitting control. The `weights` may
+            be given as a function, which is applied chunk-wise to the data
         :type fit_kwargs: dict
         :param fn_kwargs: Dictionary of key-words to be supplied to the fit function
         :type fn_kwargs: dict
-        :param vectorize: Should the fit function be given dependents in a single object or split
+        :param vectorize: Should the fit function be given the coordinates as a grid rather than as a matrix
         :type vectorize: bool
-        :param kwargs: Key-word arguments for `xarray.apply_ufunc`. See `xarray.apply_ufunc` documentation
+        :param kwargs: Kept for compatibility, the fit plan does not use `xarray.apply_ufunc`
         :type kwargs: Any
         :return: Results of the fit
         :rtype: FitResults
@@ -709,45 +1069,52 @@ class EasyScienceDataarrayAccessor:
         if fit_kwargs is None:
             fit_kwargs = {}
         old_fit_func = fitter.fit_function
+        constraints = fitter.fit_constraints()
+
+        # Broadcast the coordinates and flatten the data once, the plan is then evaluated on every iteration
+        plan = self.fit_plan(
+            fitter.fit_function,
+            *args,
+            fn_kwargs=fn_kwargs,
+            vectorize=vectorize,
+            dask=dask,
+            dask_chunks=dask_chunks,
+            scheduler=scheduler,
+            workers=workers,
+            parameters=fitter.fit_object.get_fit_parameters(),
+            constraints=constraints,
+        )
 
-        # Wrap and broadcast
-        bdims, f = self.fit_prep(fitter.fit_function)
-        dims = self._obj.dims
-
-        # Find which coords we need
-        if isinstance(dims, dict):
-            dims = list(dims.keys())
-
-        # Wrap the wrap in a callable
         def local_fit_func(x, *args, **kwargs):
             """
-            Function which will be called by the fitter. This will deal with sending the function the correct data.
+            Function which will be called by the fitter. The coordinates are already held by the plan.
             """
-            kwargs['vectorize'] = vectorize
-            res = xr.apply_ufunc(f, *bdims, *args, dask=dask, kwargs=fn_kwargs, **kwargs)
-            if dask != 'forbidden':
-                res.compute()
-            return res.stack(all_x=dims)
+            return plan.evaluate()
 
-        # Set the new callable to the fitter and initialize
+        # Set the new callable to the fitter and initialize, the new minimizer has to be given the constraints again
         fitter.initialize(fitter.fit_object, local_fit_func)
-        # Make EasyScience.fitting.Fitter compatible `x`
-        x_for_fit = xr.concat(bdims, dim='fit_dim')
-        x_for_fit = x_for_fit.stack(all_x=[d.name for d in bdims])
+        for constraint in constraints:
+            fitter.add_fit_constraint(constraint)
         try:
-            # Deal with any sigmas if supplied
-            if fit_kwargs.get('weights', None) is not None:
-                fit_kwargs['weights'] = xr.DataArray(
-                    np.array(fit_kwargs['weights']),
-                    dims=['all_x'],
-                    coords={'all_x': x_for_fit.all_x},
-                )
+            # Deal with any weights if supplied, a callable generates them from the data
+            weights = fit_kwargs.get('weights', None)
+            if callable(weights):
+                weights = plan.read(self._obj, weights)
+            elif weights is not None:
+                weights = plan.flatten(weights)
+            # Points with a NaN observation or weight are left out of the fit
+            weights = plan.mask_invalid(weights)
+            if weights is not None:
+                fit_kwargs['weights'] = weights
             # Try to perform a fit
-            f_res = fitter.fit(x_for_fit, self._obj.stack(all_x=dims), **fit_kwargs)
-            f_res = check_sanity_single(f_res)
+            f_res = fitter.fit(plan.fit_points, plan.observations, **fit_kwargs)
+            f_res = plan.unpack_results(f_res)
         finally:
             # Reset the fit function on the fitter to the old fit function.
             fitter.fit_function = old_fit_func
+            for constraint in constraints:
+                fitter.add_fit_constraint(constraint)
+            plan.close()
         return f_res
 
 
@@ -784,7 +1151,9 @@ def check_sanity_single(fit_results: FitResults) -> FitResults:
     return fit_results
 
 
-def check_sanity_multiple(fit_results: FitResults, originals: List[xr.DataArray]) -> List[FitResults]:
+def check_sanity_multiple(
+    fit_results: FitResults, originals: List[xr.DataArray], plans: List[FitPlan] = None
+) -> List[FitResults]:
     """
     Convert the multifit FitResults from a fitter compatible state to a list of recognizable DataArray states.
 
@@ -792,13 +1161,23 @@ def check_sanity_multiple(fit_results: FitResults, originals: List[xr.DataArray]
     :type fit_results: FitResults
     :param originals: List of DataArrays which were fitted against, so we can resize and re-chunk the results
     :type originals: List[xr.DataArray]
+    :param plans: Fit plans of the DataArrays, needed when points have been left out of the fit
+    :type plans: List[FitPlan]
     :return: Modified fit results
     :rtype: List[FitResults]
     """
 
     return_results = []
     offset = 0
-    for item in originals:
+    for idx, item in enumerate(originals):
+        n_points = item.size if plans is None else plans[idx].n_points
+
+        def unpack(values: np.ndarray, name: str) -> xr.DataArray:
+            values = np.reshape(values, -1)[offset : offset + n_points]
+            if plans is not None:
+                return plans[idx].to_data_array(values, name=name)
+            return xr.DataArray(values.reshape(item.shape), dims=item.dims, coords=item.coords, name=name)
+
         current_results = fit_results.__class__()
         # Fill out the basic stuff....
         current_results.engine_result = fit_results.engine_result
@@ -808,16 +1187,10 @@ def check_sanity_multiple(fit_results: FitResults, originals: List[xr.DataArray]
         current_results.p0 = fit_results.p0
         # now the tricky stuff
         current_results.x = item.EasyScience.generate_points()
-        current_results.y_obs = item.copy()
+        current_results.y_obs = item.copy(deep=False)
         current_results.y_obs.name = f'{item.name}_obs'
-        current_results.y_calc = xr.DataArray(
-            fit_results.y_calc[offset : offset + item.size].data,
-            dims=item.dims,
-            coords=item.coords,
-            name=f'{item.name}_calc',
-        )
-        offset += item.size
-        current_results.residual = current_results.y_calc - current_results.y_obs
-        current_results.residual.name = f'{item.name}_residual'
+        current_results.y_calc = unpack(fit_results.y_calc, f'{item.name}_calc')
+        current_results.y_err = unpack(fit_results.y_err, f'{item.name}_err')
+        offset += n_points
         return_results.append(current_results)
     return return_results
@@ -12,11 +12,15 @@ from numbers import Number
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
+from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
 from typing import Tuple
 from typing import Union
 
+import numpy as np
+
 from easyscience.global_object.undo_redo import NotarizedDict
 from easyscience.Objects.new_variable.descriptor_base import DescriptorBase
 from easyscience.Objects.ObjectClasses import BasedBase
@@ -81,6 +85,11 @@ class BaseCollection(BasedBase, MutableSequence):
 
         # Set kwargs, also useful for serialization
         self._kwargs = NotarizedDict(**_kwargs)
+        # (value epoch, item ids, items, values) of the last `value_array`
+        self._value_array_cache = None
+        # (dict version, keys in order) and (dict version, name epoch, name -> positions) for indexing
+        self._keys_cache = None
+        self._names_cache = None
 
         for key in kwargs.keys():
             if key in self.__dict__.keys() or key in self.__slots__:
@@ -108,13 +117,12 @@ class BaseCollection(BasedBase, MutableSequence):
         """
         t_ = type(value)
         if issubclass(t_, (BasedBase, Descriptor, DescriptorBase)):
-            update_key = list(self._kwargs.keys())
-            values = list(self._kwargs.values())
             # Update the internal dict
             new_key = value.unique_name
-            update_key.insert(index, new_key)
-            values.insert(index, value)
-            self._kwargs.reorder(**{k: v for k, v in zip(update_key, values)})
+            data = self._kwargs.data
+            keys = list(self._keys())
+            keys.insert(index, new_key)
+            self._kwargs.reorder(**{key: value if key == new_key else data[key] for key in keys})
             # ADD EDGE
             self._global_object.map.add_edge(self, value)
             self._global_object.map.reset_type(value, 'created_internal')
@@ -122,6 +130,64 @@ class BaseCollection(BasedBase, MutableSequence):
         else:
             raise AttributeError('Only EasyScience objects can be put into an EasyScience group')
 
+    def extend(self, values: Iterable[Union[V, B]]) -> None:
+        """
+        Append objects to the end of the collection in one go, objects already in the collection keep their place.
+        Unlike appending them one by one, the collection is reordered once, the map edges are added in one batch and a
+        single undo entry is made. The interface bindings are not batched: as for `append`, every new object is given
+        the interface of the collection and generates its own bindings.
+
+        :param values: Objects to be appended.
+        :type values: Iterable[Union[BasedBase, Descriptor]]
+        :return: None
+        :rtype: None
+        """
+        values = list(values)
+        if type(self).insert is not BaseCollection.insert:
+            # Subclasses may do more on insert, so they are extended one by one
+            for value in values:
+                self.append(value)
+            return
+        for value in values:
+            if not issubclass(type(value), (BasedBase, Descriptor, DescriptorBase)):
+                raise AttributeError('Only EasyScience objects can be put into an EasyScience group')
+        # An object given more than once is only added once
+        data = self._kwargs.data
+        # Objects already in the collection keep their place, an object given more than once is only added once
+        added = {value.unique_name: value for value in values if value.unique_name not in data}
+        if not added:
+            return
+        # Update the internal dict
+        self._kwargs.reorder(**data, **added)
+        added = list(added.values())
+        # ADD EDGES
+        self._global_object.map.add_edges(self, added)
+        interface = self.interface
+        for value in added:
+            self._global_object.map.reset_type(value, 'created_internal')
+            value.interface = interface
+
+    @classmethod
+    def from_iterable(
+        cls, name: str, values: Iterable[Union[V, B]], interface: Optional[iF] = None, **kwargs
+    ) -> BaseCollection:
+        """
+        Create a collection from the objects of an iterable. The bindings to the interface are generated once for the
+        whole collection.
+
+        :param name: Name of the collection
+        :type name: str
+        :param values: Objects of the collection
+        :type values: Iterable[Union[BasedBase, Descriptor]]
+        :param interface: Interface of the collection
+        :param kwargs: Additional arguments for the collection
+        :return: The collection
+        """
+        collection = cls(name, *values, **kwargs)
+        if interface is not None:
+            collection.interface = interface
+        return collection
+
     def __getitem__(self, idx: Union[int, slice]) -> Union[V, B]:
         """
         Get an item in the collection based on it's index.
@@ -132,19 +198,18 @@ class BaseCollection(BasedBase, MutableSequence):
         :rtype: Union[Parameter, Descriptor, BaseObj, 'BaseCollection']
         """
         if isinstance(idx, slice):
-            start, stop, step = idx.indices(len(self))
-            return self.__class__(getattr(self, 'name'), *[self[i] for i in range(start, stop, step)])
-        if str(idx) in self._kwargs.keys():
-            return self._kwargs[str(idx)]
+            return self.__class__(getattr(self, 'name'), *[self._kwargs.data[key] for key in self._keys()[idx]])
+        if str(idx) in self._kwargs.data:
+            return self._kwargs.data[str(idx)]
         if isinstance(idx, str):
-            idx = [index for index, item in enumerate(self) if item.name == idx]
-            noi = len(idx)
+            positions = self._names().get(idx, [])
+            noi = len(positions)
             if noi == 0:
                 raise IndexError('Given index does not exist')
             elif noi == 1:
-                idx = idx[0]
+                idx = positions[0]
             else:
-                return self.__class__(getattr(self, 'name'), *[self[i] for i in idx])
+                return self.__class__(getattr(self, 'name'), *[self[i] for i in positions])
         elif not isinstance(idx, int) or isinstance(idx, bool):
             if isinstance(idx, bool):
                 raise TypeError('Boolean indexing is not supported at the moment')
@@ -153,8 +218,7 @@ class BaseCollection(BasedBase, MutableSequence):
                     raise IndexError(f'Given index {idx} is out of bounds')
             except TypeError:
                 raise IndexError('Index must be of type `int`/`slice` or an item name (`str`)')
-        keys = list(self._kwargs.keys())
-        return self._kwargs[keys[idx]]
+        return self._kwargs.data[self._keys()[idx]]
 
     def __setitem__(self, key: int, value: Union[B, V]) -> None:
         """
@@ -169,12 +233,10 @@ class BaseCollection(BasedBase, MutableSequence):
             item = self.__getitem__(key)
             item.value = value
         elif issubclass(type(value), (BasedBase, Descriptor, DescriptorBase)):
-            update_key = list(self._kwargs.keys())
-            values = list(self._kwargs.values())
-            old_item = values[key]
+            item_key = self._keys()[key]
+            old_item = self._kwargs.data[item_key]
             # Update the internal dict
-            update_dict = {update_key[key]: value}
-            self._kwargs.update(update_dict)
+            self._kwargs[item_key] = value
             # ADD EDGE
             self._global_object.map.add_edge(self, value)
             self._global_object.map.reset_type(value, 'created_internal')
@@ -193,10 +255,10 @@ class BaseCollection(BasedBase, MutableSequence):
         :return:
         :rtype:
         """
-        keys = list(self._kwargs.keys())
-        item = self._kwargs[keys[key]]
+        item_key = self._keys()[key]
+        item = self._kwargs.data[item_key]
         self._global_object.map.prune_vertex_from_edge(self, item)
-        del self._kwargs[keys[key]]
+        del self._kwargs[item_key]
 
     def __len__(self) -> int:
         """
@@ -205,7 +267,31 @@ class BaseCollection(BasedBase, MutableSequence):
         :return: Number of items in this collection.
         :rtype: int
         """
-        return len(self._kwargs.keys())
+        return len(self._kwargs.data)
+
+    def _keys(self) -> List[str]:
+        """
+        The keys of the items in order. The list is cached until items are added, removed or reordered.
+        """
+        cache = self._keys_cache
+        if cache is None or cache[0] != self._kwargs._version:
+            cache = (self._kwargs._version, list(self._kwargs.data))
+            self._keys_cache = cache
+        return cache[1]
+
+    def _names(self) -> Dict[str, List[int]]:
+        """
+        The positions of the items by name. The mapping is cached until items are added, removed or reordered, or any
+        object is renamed.
+        """
+        cache = self._names_cache
+        if cache is None or cache[0] != self._kwargs._version or cache[1] != self._global_object.name_epoch:
+            names = {}
+            for position, item in enumerate(self._kwargs.data.values()):
+                names.setdefault(item.name, []).append(position)
+            cache = (self._kwargs._version, self._global_object.name_epoch, names)
+            self._names_cache = cache
+        return cache[2]
 
     def _convert_to_dict(self, in_dict, encoder, skip: List[str] = [], **kwargs) -> dict:
         """
@@ -235,6 +321,41 @@ class BaseCollection(BasedBase, MutableSequence):
         """
         return tuple(self._kwargs.values())
 
+    @property
+    def value_array(self) -> np.ndarray:
+        """
+        The values of the items as a read-only array, e.g. the coefficients of a polynomial. The array is cached and
+        only rebuilt when a value of any `Descriptor`/`Parameter` changed or the items of the collection changed.
+        Items whose value comes from an interface are read every time, as a changed interface value is only noticed
+        when it is read.
+
+        :return: Values of the items
+        :rtype: np.ndarray
+        """
+        items = tuple(self._kwargs.data.values())
+        for item in items:
+            if getattr(getattr(item, '_callback', None), 'fget', None) is not None:
+                # Updates the value, and the value epoch, if the interface value changed
+                item.value
+        item_ids = tuple(map(id, items))
+        cache = self._value_array_cache
+        if cache is not None and cache[0] == self._global_object.value_epoch and cache[1] == item_ids:
+            return cache[3]
+        values = []
+        for item in items:
+            ## TODO clean when full move to new_variable
+            if isinstance(item, Descriptor):
+                values.append(item.raw_value)
+            elif hasattr(item, 'value') and not isinstance(item, BasedBase):
+                values.append(item.value)
+            else:
+                raise TypeError(f'{item} does not have a value')
+        values = np.array(values, dtype=np.float64)
+        values.flags.writeable = False
+        # Reading the values can update them from a callback, so the epoch is taken afterwards
+        self._value_array_cache = (self._global_object.value_epoch, item_ids, items, values)
+        return values
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__} `{getattr(self, 'name')}` of length {len(self)}"
 
@@ -7,12 +7,17 @@ from __future__ import annotations
 __author__ = 'github.com/wardsimon'
 __version__ = '0.1.0'
 
+import inspect
 from abc import ABCMeta
 from typing import TYPE_CHECKING
+from typing import Any
 from typing import Callable
+from typing import Dict
 from typing import List
 from typing import NamedTuple
 from typing import Optional
+from typing import Set
+from typing import Tuple
 from typing import Type
 from typing import TypeVar
 
@@ -31,6 +36,9 @@ class InterfaceFactoryTemplate:
         self._interfaces: List[_C] = interface_list
         self._current_interface: _C
         self.__interface_obj: _M = None
+        # Interface objects and their binding state, per interface name. Switching back reuses them.
+        self._pool: Dict[str, InterfaceState] = {}
+        self._state: InterfaceState = None
         self.create(*args, **kwargs)
 
     def create(self, *args, **kwargs):
@@ -55,12 +63,14 @@ class InterfaceFactoryTemplate:
         interfaces = self.available_interfaces
         if interface_name in interfaces:
             self._current_interface = self._interfaces[interfaces.index(interface_name)]
-        self.__interface_obj = self._current_interface(*args, **kwargs)
+        self._activate(InterfaceState(self._current_interface(*args, **kwargs)))
 
     def switch(self, new_interface: str, fitter: Optional[Type[Fitter]] = None):
         """
-        Changes the current interface to a new interface. The current interface is destroyed and
-        all ComponentSerializer parameters carried over to the new interface. i.e. pick up where you left off.
+        Changes the current interface to a new interface. All ComponentSerializer parameters are carried over to the
+        new interface. i.e. pick up where you left off. Interface objects are kept per name, so switching back to an
+        interface reuses its object and only the parameters which changed in the meantime are set again when the
+        bindings are regenerated.
 
         :param new_interface: name of new interface to be created
         :type new_interface: str
@@ -72,7 +82,10 @@ class InterfaceFactoryTemplate:
         interfaces = self.available_interfaces
         if new_interface in interfaces:
             self._current_interface = self._interfaces[interfaces.index(new_interface)]
-            self.__interface_obj = self._current_interface()
+            state = self._pool.get(new_interface, None)
+            if state is None:
+                state = InterfaceState(self._current_interface())
+            self._activate(state)
         else:
             raise AttributeError('The user supplied interface is not valid.')
         if fitter is not None:
@@ -119,6 +132,52 @@ class InterfaceFactoryTemplate:
         """
         return self.return_name(self._current_interface)
 
+    @property
+    def batched(self) -> bool:
+        """
+        Does the current interface declare `set_many` or `get_many`? If so, parameter changes are collected and pushed
+        in one `set_many` call by `flush`, and the values read from the interface are cached until the next flush.
+
+        `set_many` is called with `{link_name: {inner_key: value, ...}, ...}` and `get_many` with
+        `{link_name: [inner_key, ...], ...}`, returning the values in the same nested form as `set_many` takes them.
+
+        :return: Does the current interface batch parameter changes?
+        :rtype: bool
+        """
+        return self._state.batched
+
+    def flush(self) -> None:
+        """
+        Push the parameter changes collected since the last flush to a batched interface. This is done
+        automatically before the fitting function is called.
+        """
+        self._state.bindings.flush()
+
+    @property
+    def changed(self) -> Dict[str, Set[str]]:
+        """
+        The inner keys of every link which were set since the fitting function was last called, i.e. the parameters
+        the current interface has not calculated with yet. Interfaces whose `fit_func` takes a `changed` argument are
+        given these, so that they can recalculate only the affected components.
+
+        :return: `{link_name: {inner_key, ...}, ...}`
+        :rtype: dict
+        """
+        return {link_name: set(keys) for link_name, keys in self._state.changed.items()}
+
+    def _take_changed(self) -> Dict[str, Set[str]]:
+        changed = self.changed
+        self._state.changed.clear()
+        return changed
+
+    def _activate(self, state: InterfaceState) -> None:
+        if self._state is not None:
+            # Changes for the interface we leave are pushed to it, so that its synced values are correct
+            self._state.bindings.flush()
+        self._state = state
+        self._pool[self.current_interface_name] = state
+        self.__interface_obj = state.interface
+
     @property
     def fit_func(
         self,
@@ -137,16 +196,50 @@ class InterfaceFactoryTemplate:
         #"""
 
         def __fit_func(*args, **kwargs):
+            self._prepare_call(kwargs)
             return self.__interface_obj.fit_func(*args, **kwargs)
 
+        # Lets e.g. a `MultiFitter` start several calculations before waiting for them
+        __fit_func.submit = self.submit
         return __fit_func
 
+    def submit(self, *args, **kwargs) -> Optional[Any]:
+        """
+        Start the calculation of the current interface without waiting for it, if the interface can do that (see
+        `ProcessInterface.submit`).
+
+        :param args: positional arguments for the fitting function
+        :param kwargs: key/value pair arguments for the fitting function.
+        :return: The pending calculation, whose `result()` waits for it, or None if the interface calculates in
+            `fit_func` only
+        """
+        submit = getattr(self.__interface_obj, 'submit', None)
+        if submit is None:
+            return None
+        self._prepare_call(kwargs)
+        return submit(*args, **kwargs)
+
+    def _prepare_call(self, kwargs: Dict[str, Any]) -> None:
+        # Pushes pending parameter changes and passes on which changed, if the interface takes them
+        state = self._state
+        state.bindings.flush()
+        changed = self._take_changed()
+        if state.accepts_changed is None:
+            try:
+                state.accepts_changed = 'changed' in inspect.signature(state.interface.fit_func).parameters
+            except (TypeError, ValueError):
+                state.accepts_changed = False
+        if state.accepts_changed:
+            kwargs.setdefault('changed', changed)
+
     def call(self, *args, **kwargs):
         return self.fit_func(*args, **kwargs)
 
     def generate_bindings(self, model, *args, ifun=None, **kwargs):
         """
-        Automatically bind a `Parameter` to the corresponding interface.
+        Automatically bind a `Parameter` to the corresponding interface. The binding table of a model is made once
+        per interface object and reused until the linkable attributes of the model change. Only the values which
+        differ from those last set on the interface are set again.
         :param name: parameter name
         :type name: str
         :return: binding property
@@ -154,25 +247,23 @@ class InterfaceFactoryTemplate:
         """
         import easyscience.Objects.new_variable.parameter
 
-        class_links = self.__interface_obj.create(model)
+        state = self._state
         props = model._get_linkable_attributes()
-        props_names = [prop.name for prop in props]
-        for item in class_links:
-            for item_key in item.name_conversion.keys():
-                if item_key not in props_names:
-                    continue
-                idx = props_names.index(item_key)
-                prop = props[idx]
-
-                ## TODO clean when full move to new_variable
-                if isinstance(prop, easyscience.Objects.new_variable.parameter.Parameter):
-                    # Should be fetched this way to ensure we don't get value from callback
-                    prop_value = prop.value_no_call_back
-                else:
-                    prop_value = prop.raw_value
+        table = state.binding_table(model, props)
+        for prop, item_key, callback in table:
+            ## TODO clean when full move to new_variable
+            if isinstance(prop, easyscience.Objects.new_variable.parameter.Parameter):
+                # Should be fetched this way to ensure we don't get value from callback
+                prop_value = prop.value_no_call_back
+            else:
+                prop_value = prop.raw_value
 
-                prop._callback = item.make_prop(item_key)
-                prop._callback.fset(prop_value)
+            prop._callback = callback
+            if not state.is_synced(item_key, prop_value):
+                callback.fset(prop_value)
+        if state.batched:
+            # The initial values are pushed in one call
+            state.bindings.flush()
 
     def __call__(self, *args, **kwargs) -> _M:
         return self.__interface_obj
@@ -210,10 +301,18 @@ class ItemContainer(NamedTuple):
     getter_fn: Callable
     setter_fn: Callable
 
-    def make_prop(self, parameter_name) -> property:
+    def make_prop(self, parameter_name, on_set: Optional[Callable[[str, str, Any], None]] = None) -> property:
         return property(
             fget=self.__make_getter(parameter_name),
-            fset=self.__make_setter(parameter_name),
+            fset=self.__make_setter(parameter_name, on_set),
+        )
+
+    def make_batched_prop(self, parameter_name: str, bindings: BatchedBindings) -> property:
+        inner_key = self.name_conversion.get(parameter_name, None)
+        bindings.register(self, inner_key)
+        return property(
+            fget=lambda: bindings.get(self, inner_key),
+            fset=lambda value: bindings.set(self, inner_key, value),
         )
 
     def convert_key(self, lookup_key: str) -> str:
@@ -227,12 +326,161 @@ class ItemContainer(NamedTuple):
 
         return get_value
 
-    def __make_setter(self, get_name: str) -> Callable:
+    def __make_setter(self, get_name: str, on_set: Optional[Callable[[str, str, Any], None]] = None) -> Callable:
         def set_value(value):
             inner_key = self.name_conversion.get(get_name, None)
             self.setter_fn(self.link_name, **{inner_key: value})
+            if on_set is not None:
+                on_set(self.link_name, inner_key, value)
 
         return set_value
 
 
+class BatchedBindings:
+    """
+    Parameter bindings to an interface which declares `set_many` and/or `get_many`. Set values are kept as pending
+    changes until `flush` pushes them in a single `set_many` call, and the values read through the bindings are
+    cached until the next flush. Without `set_many` values are set one by one, without `get_many` they are read one
+    by one, but they are still cached.
+    """
+
+    def __init__(self, interface: Callable[[], Any], on_set: Optional[Callable[[str, str, Any], None]] = None):
+        """
+        :param interface: Returns the current interface object
+        :param on_set: Called with the link name, inner key and value of every set value
+        """
+        self._interface = interface
+        self._on_set = on_set
+        self._items: Dict[Tuple[str, str], ItemContainer] = {}
+        self._pending: Dict[Tuple[str, str], Any] = {}
+        self._cache: Dict[Tuple[str, str], Any] = {}
+
+    @property
+    def pending(self) -> Dict[Tuple[str, str], Any]:
+        """
+        Changes which have not been pushed to the interface yet, as `{(link_name, inner_key): value}`.
+        """
+        return dict(self._pending)
+
+    def register(self, item: ItemContainer, inner_key: str) -> None:
+        self._items[(item.link_name, inner_key)] = item
+
+    def set(self, item: ItemContainer, inner_key: str, value: Any) -> None:
+        key = (item.link_name, inner_key)
+        self._cache[key] = value
+        if self._on_set is not None:
+            self._on_set(item.link_name, inner_key, value)
+        if hasattr(self._interface(), 'set_many'):
+            self._pending[key] = value
+        else:
+            item.setter_fn(item.link_name, **{inner_key: value})
+
+    def get(self, item: ItemContainer, inner_key: str) -> Any:
+        key = (item.link_name, inner_key)
+        if key in self._cache:
+            return self._cache[key]
+        interface = self._interface()
+        if not hasattr(interface, 'get_many'):
+            value = item.getter_fn(item.link_name, inner_key)
+            self._cache[key] = value
+            return value
+        # Values are only read after the pending changes were pushed
+        self.flush()
+        requests = {}
+        for link_name, request_key in self._items.keys():
+            requests.setdefault(link_name, []).append(request_key)
+        for link_name, values in interface.get_many(requests).items():
+            for request_key, value in values.items():
+                self._cache[(link_name, request_key)] = value
+        if key not in self._cache:
+            self._cache[key] = item.getter_fn(item.link_name, inner_key)
+        return self._cache[key]
+
+    def flush(self) -> None:
+        """
+        Push the pending changes in one `set_many` call and forget the cached values.
+        """
+        self._cache.clear()
+        if not self._pending:
+            return
+        updates = {}
+        for (link_name, inner_key), value in self._pending.items():
+            updates.setdefault(link_name, {})[inner_key] = value
+        self._pending = {}
+        self._interface().set_many(updates)
+
+    def clear(self) -> None:
+        """
+        Forget the bindings, pending changes and cached values, e.g. when the interface is replaced.
+        """
+        self._items.clear()
+        self._pending.clear()
+        self._cache.clear()
+
+
+class InterfaceState:
+    """
+    An interface object together with its bindings: the binding tables of the models bound to it, the values last
+    set on it and the inner keys set since the fitting function was last called.
+    """
+
+    def __init__(self, interface: Any):
+        """
+        :param interface: The interface object
+        """
+        self.interface = interface
+        # Inner keys per link name which were set since the last call of the fitting function
+        self.changed: Dict[str, Set[str]] = {}
+        # Values as last set on the interface, per (link_name, inner_key)
+        self.synced: Dict[Tuple[str, str], Any] = {}
+        self.accepts_changed: Optional[bool] = None
+        self.batched = hasattr(interface, 'set_many') or hasattr(interface, 'get_many')
+        self.bindings = BatchedBindings(lambda: self.interface, self.record)
+        # Per model unique name: the ids of the linkable attributes and [(prop, (link_name, inner_key), callback)]
+        self._tables: Dict[str, Tuple[Tuple[int, ...], List[Tuple[Any, Tuple[str, str], property]]]] = {}
+
+    def record(self, link_name: str, inner_key: str, value: Any) -> None:
+        self.changed.setdefault(link_name, set()).add(inner_key)
+        self.synced[(link_name, inner_key)] = value
+
+    def is_synced(self, key: Tuple[str, str], value: Any) -> bool:
+        """
+        Was `value` the last value set on the interface for `key`?
+        """
+        if key not in self.synced:
+            return False
+        try:
+            return bool(self.synced[key] == value)
+        except Exception:
+            # e.g. arrays, which are always set again
+            return False
+
+    def binding_table(self, model, props: List) -> List[Tuple[Any, Tuple[str, str], property]]:
+        """
+        Bindings of the linkable attributes `props` of `model`. The links are only requested from the interface, with
+        `interface.create(model)`, for a model which was not bound to it yet or whose linkable attributes changed.
+        """
+        signature = tuple(id(prop) for prop in props)
+        cached = self._tables.get(model.unique_name, None)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        by_name = {}
+        for prop in props:
+            # The first attribute of a name is bound, as before
+            by_name.setdefault(prop.name, prop)
+        table = []
+        for item in self.interface.create(model):
+            for item_key in item.name_conversion.keys():
+                prop = by_name.get(item_key, None)
+                if prop is None:
+                    continue
+                if self.batched:
+                    callback = item.make_batched_prop(item_key, self.bindings)
+                else:
+                    callback = item.make_prop(item_key, self.record)
+                table.append((prop, (item.link_name, item.name_conversion.get(item_key, None)), callback))
+        self._tables[model.unique_name] = (signature, table)
+        return table
+
+
 iF = TypeVar('iF', bound=InterfaceFactoryTemplate)
@@ -100,6 +100,7 @@ class BasedBase(ComponentSerializer):
         :return: None
         """
         self._name = new_name
+        self._global_object.name_epoch += 1
 
     @property
     def interface(self) -> iF:
@@ -35,6 +35,8 @@ from easyscience.global_object.undo_redo import property_stack_deco
 from easyscience.Objects.core import ComponentSerializer
 from easyscience.Utils.classTools import addProp
 from easyscience.Utils.Exceptions import CoreSetException
+from easyscience.Utils.units import pint_conversion
+from easyscience.Utils.units import pint_unit
 
 if TYPE_CHECKING:
     from easyscience.Constraints import C
@@ -122,7 +124,7 @@ class Descriptor(ComponentSerializer):
         if isinstance(units, ureg.Unit):
             self._units = ureg.Quantity(1, units=deepcopy(units))
         elif isinstance(units, (str, type(None))):
-            self._units = ureg.parse_expression(units)
+            self._units = pint_unit(units)
         else:
             raise AttributeError('Units must be a string or a pint unit object')
         # Clunky method of keeping self.value up to date
@@ -201,6 +203,25 @@ class Descriptor(ComponentSerializer):
         self._unique_name = new_unique_name
         self._global_object.map.add_vertex(self)
 
+    @property
+    def name(self) -> str:
+        """
+        Get the name of the object.
+
+        :return: name of the object.
+        """
+        return self._name
+
+    @name.setter
+    def name(self, new_name: str):
+        """
+        Set the name of the object.
+
+        :param new_name: name of the object.
+        """
+        self._name = new_name
+        self._global_object.name_epoch += 1
+
     @property
     def display_name(self) -> str:
         """
@@ -245,10 +266,11 @@ class Descriptor(ComponentSerializer):
         """
         if not isinstance(unit_str, str):
             unit_str = str(unit_str)
-        new_unit = ureg.parse_expression(unit_str)
+        new_unit = pint_unit(unit_str)
         self._units = new_unit
         self._args['units'] = str(new_unit)
         self._value = self.__class__._constructor(**self._args)
+        self._global_object.value_epoch += 1
 
     @property
     def value(self) -> Any:
@@ -294,6 +316,7 @@ class Descriptor(ComponentSerializer):
             value = int(value)
         self._args['value'] = value
         self._value = self.__class__._constructor(**self._args)
+        self._global_object.value_epoch += 1
 
     @value.setter
     @property_stack_deco
@@ -353,8 +376,9 @@ class Descriptor(ComponentSerializer):
 
         :param unit_str: New unit in string form
         """
-        new_unit = ureg.parse_expression(unit_str)
+        new_unit = pint_unit(unit_str)
         self._value = self._value.to(new_unit)
+        self._global_object.value_epoch += 1
         self._units = new_unit
         self._args['value'] = self.raw_value
         self._args['units'] = str(self.unit)
@@ -633,8 +657,9 @@ class Parameter(Descriptor):
         super().convert_unit(new_unit)
         # Deal with min/max. Error is auto corrected
         if not self.value.unitless and old_unit != 'dimensionless':
-            self._min = Q_(self.min, old_unit).to(self._units).magnitude
-            self._max = Q_(self.max, old_unit).to(self._units).magnitude
+            scale, offset = pint_conversion(old_unit, str(self._args['units']))
+            self._min = scale * self.min + offset
+            self._max = scale * self.max + offset
         # Log the new converted error
         self._args['error'] = self.value.error.magnitude
 
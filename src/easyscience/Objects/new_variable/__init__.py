@@ -1,11 +1,19 @@
+from .descriptor_array import DescriptorArray
+from .descriptor_array import ParameterArray
 from .descriptor_bool import DescriptorBool
 from .descriptor_number import DescriptorNumber
 from .descriptor_str import DescriptorStr
+from .expression import Expression
+from .expression import lazy
 from .parameter import Parameter
 
 __all__ = [
+    DescriptorArray,
     DescriptorBool,
     DescriptorNumber,
     DescriptorStr,
+    Expression,
     Parameter,
+    ParameterArray,
+    lazy,
 ]
@@ -0,0 +1,755 @@
+#  SPDX-FileCopyrightText: 2023 EasyScience contributors  <core@easyscience.software>
+#  SPDX-License-Identifier: BSD-3-Clause
+#  © 2021-2023 Contributors to the EasyScience project <https://github.com/easyScience/EasyScience
+
+from __future__ import annotations
+
+import numbers
+from typing import Any
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+import scipp as sc
+from numpy.typing import ArrayLike
+from scipp import UnitError
+from scipp import Variable
+
+from easyscience import global_object
+from easyscience.global_object.undo_redo import property_stack_deco
+from easyscience.Utils.Exceptions import CoreSetException
+from easyscience.Utils.units import to_unit
+
+from .descriptor_base import DescriptorBase
+from .descriptor_number import base_unit
+
+Index = Union[int, Tuple[int, ...]]
+
+
+class ArrayElement:
+    """
+    A single element of a `DescriptorArray`. It holds no value of its own, but reads and writes the array.
+    """
+
+    __slots__ = ('_array', '_index')
+
+    def __init__(self, array: DescriptorArray, flat_index: int):
+        self._array = array
+        self._index = flat_index
+
+    @property
+    def index(self) -> Tuple[int, ...]:
+        return tuple(int(i) for i in np.unravel_index(self._index, self._array.shape))
+
+    @property
+    def parent(self) -> DescriptorArray:
+        return self._array
+
+    @property
+    def name(self) -> str:
+        return f'{self._array.name}[{", ".join(str(i) for i in self.index)}]'
+
+    @property
+    def unique_name(self) -> str:
+        # Minimizers use the unique name in parameter names, so it has to be a valid identifier
+        return f'{self._array.unique_name}__{self._index}'
+
+    @property
+    def value(self) -> float:
+        return float(self._array.full_value.values.flat[self._index])
+
+    @value.setter
+    @property_stack_deco
+    def value(self, value: numbers.Number) -> None:
+        if not isinstance(value, numbers.Number) or isinstance(value, bool):
+            raise TypeError(f'{value=} must be a number')
+        self._write(float(value))
+
+    @property
+    def raw_value(self) -> float:
+        return self.value
+
+    @property
+    def unit(self) -> str:
+        return self._array.unit
+
+    @property
+    def variance(self) -> Optional[float]:
+        variances = self._array.full_value.variances
+        return None if variances is None else float(variances.flat[self._index])
+
+    @variance.setter
+    @property_stack_deco
+    def variance(self, variance: float) -> None:
+        if not isinstance(variance, numbers.Number) or isinstance(variance, bool):
+            raise TypeError(f'{variance=} must be a number')
+        if variance < 0:
+            raise ValueError(f'{variance=} must be positive')
+        variances = self._array.full_value.variances
+        if variances is None:
+            variances = np.zeros(self._array.shape)
+        variances.flat[self._index] = float(variance)
+        self._array.full_value.variances = variances
+
+    @property
+    def error(self) -> Optional[float]:
+        variance = self.variance
+        return None if variance is None else float(np.sqrt(variance))
+
+    @error.setter
+    def error(self, value: float) -> None:
+        if not isinstance(value, numbers.Number) or isinstance(value, bool):
+            raise TypeError(f'{value=} must be a number')
+        if value < 0:
+            raise ValueError(f'{value=} must be positive')
+        self.variance = float(value) ** 2
+
+    def _write(self, value: float) -> None:
+        self._array.full_value.values.flat[self._index] = value
+        global_object.value_epoch += 1
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is type(self) and other._array is self._array and other._index == self._index
+
+    def __hash__(self) -> int:
+        return hash((id(self._array), self._index))
+
+    def __repr__(self) -> str:
+        unit = '' if self.unit == 'dimensionless' else f' {self.unit}'
+        return f"<{self.__class__.__name__} '{self.name}': {self.value:.4f}{unit}>"
+
+
+class ParameterArrayElement(ArrayElement):
+    """
+    A single element of a `ParameterArray`, with its own bounds and fixed state. Minimizers use it like a single
+    parameter.
+    """
+
+    __slots__ = ()
+
+    @property
+    def value(self) -> float:
+        return float(self._array.full_value.values.flat[self._index])
+
+    @value.setter
+    @property_stack_deco
+    def value(self, value: numbers.Number) -> None:
+        """
+        Set the value of the element. Values outside of the bounds are set to the bounds.
+        """
+        if not self._array.enabled:
+            if global_object.debug:
+                raise CoreSetException(f'{str(self)} is not enabled.')
+            return
+        if not isinstance(value, numbers.Number) or isinstance(value, bool):
+            raise TypeError(f'{value=} must be a number')
+        self._write(float(np.clip(value, self.min, self.max)))
+
+    @property
+    def min(self) -> float:
+        return float(self._array._min.values.flat[self._index])
+
+    @min.setter
+    @property_stack_deco
+    def min(self, min_value: numbers.Number) -> None:
+        if not isinstance(min_value, numbers.Number):
+            raise TypeError('`min` must be a number')
+        if np.isclose(min_value, self.max, rtol=1e-9, atol=0.0):
+            raise ValueError('The min and max bounds cannot be identical. Please use fixed=True instead to fix the value.')
+        if min_value > self.value:
+            raise ValueError(f'The current value ({self.value}) is smaller than the desired min value ({min_value}).')
+        self._array._min.values.flat[self._index] = float(min_value)
+
+    @property
+    def max(self) -> float:
+        return float(self._array._max.values.flat[self._index])
+
+    @max.setter
+    @property_stack_deco
+    def max(self, max_value: numbers.Number) -> None:
+        if not isinstance(max_value, numbers.Number):
+            raise TypeError('`max` must be a number')
+        if np.isclose(max_value, self.min, rtol=1e-9, atol=0.0):
+            raise ValueError('The min and max bounds cannot be identical. Please use fixed=True instead to fix the value.')
+        if max_value < self.value:
+            raise ValueError(f'The current value ({self.value}) is greater than the desired max value ({max_value}).')
+        self._array._max.values.flat[self._index] = float(max_value)
+
+    @property
+    def bounds(self) -> Tuple[float, float]:
+        return self.min, self.max
+
+    @property
+    def fixed(self) -> bool:
+        return bool(self._array._fixed.flat[self._index])
+
+    @fixed.setter
+    @property_stack_deco
+    def fixed(self, fixed: bool) -> None:
+        if not isinstance(fixed, bool):
+            raise ValueError(f'{fixed=} must be a boolean. Got {type(fixed)}')
+        self._array._fixed.flat[self._index] = fixed
+
+    @property
+    def free(self) -> bool:
+        return not self.fixed
+
+    @free.setter
+    def free(self, value: bool) -> None:
+        self.fixed = not value
+
+    @property
+    def enabled(self) -> bool:
+        return self._array.enabled
+
+    @property
+    def user_constraints(self) -> dict:
+        # Elements can not be constrained on their own
+        return {}
+
+    def __repr__(self) -> str:
+        string = super().__repr__()[:-1]
+        if self.fixed:
+            string += ' (fixed)'
+        return f'{string}, bounds=[{self.min!r}:{self.max!r}]>'
+
+
+class DescriptorArray(DescriptorBase):
+    """
+    A `Descriptor` for an array of numbers with a unit. The internal representation is a single scipp variable, so
+    that a large set of values is one object with one map vertex instead of one object per value.
+    Single elements are accessed by indexing, e.g. `descriptor[3].value = 1.0`.
+    """
+
+    _element_class = ArrayElement
+
+    def __init__(
+        self,
+        name: str,
+        value: ArrayLike,
+        unit: Optional[Union[str, sc.Unit]] = '',
+        variance: Optional[ArrayLike] = None,
+        dims: Optional[List[str]] = None,
+        unique_name: Optional[str] = None,
+        description: Optional[str] = None,
+        url: Optional[str] = None,
+        display_name: Optional[str] = None,
+        parent: Optional[Any] = None,
+    ):
+        """Constructor for the DescriptorArray class
+
+        :param name: Name of the descriptor
+        :param value: Values of the descriptor
+        :param unit: Unit of all values
+        :param variance: Variances of the values, of the same shape as the values
+        :param dims: Names of the dimensions of the values, `dim_0`, `dim_1`, ... if not given
+        :param description: Description of the descriptor
+        :param url: URL of the descriptor
+        :param display_name: Display name of the descriptor
+        :param parent: Parent of the descriptor
+
+        .. note:: Undo/Redo functionality is implemented for the attributes `variance` and `value`, of the whole array
+            and of single elements.
+        """
+        values = self._as_array(value, 'value')
+        if values.ndim == 0:
+            raise ValueError(f'{value=} must be an array, use a DescriptorNumber for single values')
+        if variance is not None:
+            variance = self._as_array(variance, 'variance', values.shape)
+            if np.any(variance < 0):
+                raise ValueError(f'{variance=} must be positive')
+        if dims is None:
+            dims = [f'dim_{index}' for index in range(values.ndim)]
+        if len(dims) != values.ndim:
+            raise ValueError(f'{dims=} must name all {values.ndim} dimensions of the values')
+        if not isinstance(unit, sc.Unit) and not isinstance(unit, str):
+            raise TypeError(f'{unit=} must be a scipp unit or a string representing a valid scipp unit')
+        try:
+            self._array = sc.array(dims=list(dims), values=values, variances=variance, unit=unit)
+        except Exception as message:
+            raise UnitError(message)
+        super().__init__(
+            name=name,
+            unique_name=unique_name,
+            description=description,
+            url=url,
+            display_name=display_name,
+            parent=parent,
+        )
+
+        # Call convert_unit during initialization to ensure that the unit has no numbers in it, and to ensure unit consistency.
+        if self.unit is not None:
+            self.convert_unit(base_unit(self.unit))
+
+    @classmethod
+    def from_scipp(cls, name: str, full_value: Variable, **kwargs) -> DescriptorArray:
+        """
+        Create a DescriptorArray from a scipp array.
+
+        :param name: Name of the descriptor
+        :param full_value: Values of the descriptor as a scipp array
+        :param kwargs: Additional parameters for the descriptor
+        :return: DescriptorArray
+        """
+        if not isinstance(full_value, Variable) or len(full_value.dims) == 0:
+            raise TypeError(f'{full_value=} must be a scipp array')
+        return cls(
+            name=name,
+            value=full_value.values,
+            unit=full_value.unit,
+            variance=full_value.variances,
+            dims=list(full_value.dims),
+            **kwargs,
+        )
+
+    @property
+    def full_value(self) -> Variable:
+        """
+        Get the values of self as a scipp array.
+
+        :return: Values of self with unit and variances.
+        """
+        return self._array
+
+    @full_value.setter
+    def full_value(self, full_value: Variable) -> None:
+        raise AttributeError(
+            f'Full_value is read-only. Change the value and variance seperately. Or create a new {self.__class__.__name__}.'
+        )
+
+    @property
+    def value(self) -> np.ndarray:
+        """
+        Get a copy of the values. Set single values through the elements, e.g. `descriptor[3].value = 1.0`.
+
+        :return: Values of self without unit.
+        """
+        return self._array.values.copy()
+
+    @value.setter
+    @property_stack_deco
+    def value(self, value: ArrayLike) -> None:
+        """
+        Set all values of self.
+
+        :param value: New values of the same shape as the current values
+        """
+        self._array.values = self._as_array(value, 'value', self.shape)
+        global_object.value_epoch += 1
+
+    @property
+    def dims(self) -> List[str]:
+        return list(self._array.dims)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(self._array.shape)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+    @property
+    def unit(self) -> str:
+        """
+        Get the unit.
+
+        :return: Unit as a string.
+        """
+        return str(self._array.unit)
+
+    @unit.setter
+    def unit(self, unit_str: str) -> None:
+        raise AttributeError(
+            (
+                f'Unit is read-only. Use convert_unit to change the unit between allowed types '
+                f'or create a new {self.__class__.__name__} with the desired unit.'
+            )
+        )  # noqa: E501
+
+    @property
+    def variance(self) -> Optional[np.ndarray]:
+        """
+        Get a copy of the variances.
+
+        :return: variances, None if the values have no variances.
+        """
+        variances = self._array.variances
+        return None if variances is None else variances.copy()
+
+    @variance.setter
+    @property_stack_deco
+    def variance(self, variance: Optional[ArrayLike]) -> None:
+        """
+        Set all variances.
+
+        :param variance: New variances of the same shape as the values, or None
+        """
+        if variance is not None:
+            variance = self._as_array(variance, 'variance', self.shape)
+            if np.any(variance < 0):
+                raise ValueError(f'{variance=} must be positive')
+        self._array.variances = variance
+
+    @property
+    def error(self) -> Optional[np.ndarray]:
+        """
+        The standard deviations of the values.
+
+        :return: Errors associated with the values, None if the values have no variances.
+        """
+        variances = self._array.variances
+        return None if variances is None else np.sqrt(variances)
+
+    @error.setter
+    def error(self, value: Optional[ArrayLike]) -> None:
+        """
+        Set the standard deviations of the values.
+
+        :param value: New errors of the same shape as the values, or None
+        """
+        if value is not None:
+            value = self._as_array(value, 'error', self.shape)
+            if np.any(value < 0):
+                raise ValueError(f'{value=} must be positive')
+            value = value**2
+        self.variance = value
+
+    def convert_unit(self, unit_str: str) -> None:
+        """
+        Convert the values from one unit system to another.
+
+        :param unit_str: New unit in string form
+        """
+        if not isinstance(unit_str, str):
+            raise TypeError(f'{unit_str=} must be a string representing a valid scipp unit')
+        new_array = to_unit(self._array, unit_str)
+        if new_array is not self._array:
+            self._array = new_array
+            global_object.value_epoch += 1
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, index: Index) -> ArrayElement:
+        """
+        Get a view of a single element. The view reads and writes the values of self.
+
+        :param index: Index of the element, a tuple of indices for multidimensional arrays
+        :return: The element
+        """
+        return self._element_class(self, self._flat_index(index))
+
+    def __iter__(self) -> Iterator[ArrayElement]:
+        return (self._element_class(self, flat_index) for flat_index in range(self.size))
+
+    # Just to get return type right
+    def __copy__(self) -> DescriptorArray:
+        return super().__copy__()
+
+    def __repr__(self) -> str:
+        """Return printable representation."""
+        obj_unit = self._array.unit
+        obj_unit = '' if obj_unit == 'dimensionless' else f' {obj_unit}'
+        return f"<{self.__class__.__name__} '{self._name}': shape={self.shape}{obj_unit}>"
+
+    def _flat_index(self, index: Index) -> int:
+        if isinstance(index, numbers.Integral) and not isinstance(index, bool):
+            index = (index,)
+        if not isinstance(index, tuple) or not all(isinstance(i, numbers.Integral) and not isinstance(i, bool) for i in index):
+            raise TypeError(f'{index=} must be an integer or a tuple of integers')
+        if len(index) != len(self.shape):
+            raise IndexError(f'{index=} must have one index for each of the {len(self.shape)} dimensions')
+        for i, size in zip(index, self.shape):
+            if not -size <= i < size:
+                raise IndexError(f'{index=} is out of range for shape {self.shape}')
+        return int(np.ravel_multi_index(tuple(i % size for i, size in zip(index, self.shape)), self.shape))
+
+    @staticmethod
+    def _as_array(value: ArrayLike, label: str, shape: Optional[Tuple[int, ...]] = None) -> np.ndarray:
+        try:
+            array = np.array(value, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise TypeError(f'{label} must be an array of numbers') from None
+        if shape is not None and array.shape != shape:
+            raise ValueError(f'{label} must have the shape {shape}, got {array.shape}')
+        return array
+
+
+class ParameterArray(DescriptorArray):
+    """
+    A ParameterArray is a DescriptorArray which can be used in fitting. Every element has its own bounds and can be
+    fixed on its own. `get_fit_parameters` expands the free elements into element views, which the minimizers vary
+    like single parameters while the values stay in one array.
+    """
+
+    _element_class = ParameterArrayElement
+
+    def __init__(
+        self,
+        name: str,
+        value: ArrayLike,
+        unit: Optional[Union[str, sc.Unit]] = '',
+        variance: Optional[ArrayLike] = None,
+        min: Optional[ArrayLike] = -np.inf,
+        max: Optional[ArrayLike] = np.inf,
+        fixed: Optional[Union[bool, ArrayLike]] = False,
+        dims: Optional[List[str]] = None,
+        unique_name: Optional[str] = None,
+        description: Optional[str] = None,
+        url: Optional[str] = None,
+        display_name: Optional[str] = None,
+        enabled: Optional[bool] = True,
+        parent: Optional[Any] = None,
+    ):
+        """
+        This class is an extension of a `DescriptorArray` for values used in fitting.
+
+        :param name: Name of this object
+        :param value: Values of this object
+        :param unit: Unit of all values
+        :param variance: Variances of the values, zero if not given
+        :param min: Minimum values for fitting, a single number for all elements or one per element
+        :param max: Maximum values for fitting, a single number for all elements or one per element
+        :param fixed: Can the elements vary while fitting? A single bool for all elements or one per element
+        :param dims: Names of the dimensions of the values
+        :param description: A brief summary of what this object is
+        :param url: Lookup url for documentation/information
+        :param display_name: The name of the object as it should be displayed
+        :param enabled: Can the objects values be set
+        :param parent: The object which is the parent to this one
+
+        .. note::
+            Undo/Redo functionality is implemented for the attributes `value`, `error`, `min`, `max`, `fixed`
+        """
+        values = self._as_array(value, 'value')
+        if variance is None:
+            variance = np.zeros(values.shape)
+        min_values = self._broadcast(min, 'min', values.shape)
+        max_values = self._broadcast(max, 'max', values.shape)
+        self._check_bounds(values, min_values, max_values)
+        fixed = self._broadcast_fixed(fixed, values.shape)
+
+        super().__init__(
+            name=name,
+            value=values,
+            unit=unit,
+            variance=variance,
+            dims=dims,
+            unique_name=unique_name,
+            description=description,
+            url=url,
+            display_name=display_name,
+            parent=parent,
+        )
+        # The values may have been converted to the base unit, the bounds are converted with them
+        self._min = sc.array(dims=self.dims, values=min_values, unit=unit).to(unit=self._array.unit)
+        self._max = sc.array(dims=self.dims, values=max_values, unit=unit).to(unit=self._array.unit)
+        self._fixed = fixed
+        self._enabled = enabled
+
+    @property
+    def value(self) -> np.ndarray:
+        """
+        Get a copy of the values. Set single values through the elements, e.g. `parameter[3].value = 1.0`.
+
+        :return: Values of self without unit.
+        """
+        return self._array.values.copy()
+
+    @value.setter
+    @property_stack_deco
+    def value(self, value: ArrayLike) -> None:
+        """
+        Set all values of self. Values outside of the bounds are set to the bounds.
+
+        :param value: New values of the same shape as the current values
+        """
+        if not self.enabled:
+            if global_object.debug:
+                raise CoreSetException(f'{str(self)} is not enabled.')
+            return
+        values = self._as_array(value, 'value', self.shape)
+        self._array.values = np.clip(values, self._min.values, self._max.values)
+        global_object.value_epoch += 1
+
+    def set_flat_values(self, indices: ArrayLike, values: ArrayLike) -> None:
+        """
+        Set the values of several elements in one go, e.g. of all free elements while fitting. Unlike setting the
+        elements one by one this is a single write and a single undo/redo step. Values outside of the bounds are set
+        to the bounds.
+
+        :param indices: Flat indices of the elements
+        :param values: New values of the elements
+        """
+        new_values = self._array.values.copy()
+        new_values.flat[np.asarray(indices, dtype=int)] = values
+        self.value = new_values
+
+    def convert_unit(self, unit_str: str) -> None:
+        """
+        Perform unit conversion. The values, maxima and minima can change on unit change.
+
+        :param unit_str: New unit in string form
+        """
+        super().convert_unit(unit_str)
+        if hasattr(self, '_min'):
+            self._min = to_unit(self._min, unit_str)
+            self._max = to_unit(self._max, unit_str)
+
+    @property
+    def min(self) -> np.ndarray:
+        """
+        Get a copy of the minimum values for fitting.
+
+        :return: minimum values
+        """
+        return self._min.values.copy()
+
+    @min.setter
+    @property_stack_deco
+    def min(self, min_value: ArrayLike) -> None:
+        """
+        Set the minimum values for fitting.
+        - implements undo/redo functionality.
+
+        :param min_value: new minimum values, a single number for all elements or one per element
+        """
+        min_values = self._broadcast(min_value, 'min', self.shape)
+        self._check_bounds(self._array.values, min_values, self._max.values)
+        self._min.values = min_values
+
+    @property
+    def max(self) -> np.ndarray:
+        """
+        Get a copy of the maximum values for fitting.
+
+        :return: maximum values
+        """
+        return self._max.values.copy()
+
+    @max.setter
+    @property_stack_deco
+    def max(self, max_value: ArrayLike) -> None:
+        """
+        Set the maximum values for fitting.
+        - implements undo/redo functionality.
+
+        :param max_value: new maximum values, a single number for all elements or one per element
+        """
+        max_values = self._broadcast(max_value, 'max', self.shape)
+        self._check_bounds(self._array.values, self._min.values, max_values)
+        self._max.values = max_values
+
+    @property
+    def fixed(self) -> np.ndarray:
+        """
+        Which elements can not vary while fitting?
+
+        :return: Copy of the mask, True = fixed, False = can vary
+        """
+        return self._fixed.copy()
+
+    @fixed.setter
+    @property_stack_deco
+    def fixed(self, fixed: Union[bool, ArrayLike]) -> None:
+        """
+        Change which elements can vary while fitting.
+        - implements undo/redo functionality.
+
+        :param fixed: True = fixed, False = can vary. A single bool for all elements or one per element
+        """
+        if not self.enabled:
+            if global_object.stack.enabled:
+                # Remove the recorded change from the stack
+                global_object.stack.pop()
+            if global_object.debug:
+                raise CoreSetException(f'{str(self)} is not enabled.')
+            return
+        self._fixed = self._broadcast_fixed(fixed, self.shape)
+
+    @property
+    def free(self) -> np.ndarray:
+        return ~self._fixed
+
+    @free.setter
+    def free(self, value: Union[bool, ArrayLike]) -> None:
+        self.fixed = ~self._broadcast_fixed(value, self.shape)
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Logical property to see if the objects values can be directly set.
+
+        :return: Can the objects values be set
+        """
+        return self._enabled
+
+    @enabled.setter
+    @property_stack_deco
+    def enabled(self, value: bool) -> None:
+        """
+        Enable and disable the direct setting of the objects values.
+
+        :param value: True - objects values can be set, False - the opposite
+        """
+        self._enabled = value
+
+    def get_parameters(self) -> List[ParameterArrayElement]:
+        """
+        Get all elements as a list.
+
+        :return: List of element views.
+        """
+        return list(self)
+
+    def get_fit_parameters(self) -> List[ParameterArrayElement]:
+        """
+        Get the elements which can be fitted (and are not fixed) as a list.
+
+        :return: List of element views which can be used in fitting.
+        """
+        if not self.enabled:
+            return []
+        return [ParameterArrayElement(self, int(flat_index)) for flat_index in np.flatnonzero(~self._fixed)]
+
+    # Just to get return type right
+    def __copy__(self) -> ParameterArray:
+        return super().__copy__()
+
+    def __repr__(self) -> str:
+        """
+        Return printable representation of a ParameterArray object.
+        """
+        n_free = int(np.count_nonzero(~self._fixed))
+        return f'{super().__repr__()[:-1]}, free={n_free}>'
+
+    @staticmethod
+    def _broadcast(value: ArrayLike, label: str, shape: Tuple[int, ...]) -> np.ndarray:
+        array = DescriptorArray._as_array(value, label)
+        try:
+            return np.broadcast_to(array, shape).copy()
+        except ValueError:
+            raise ValueError(f'{label} must be a number or have the shape {shape}, got {array.shape}') from None
+
+    @staticmethod
+    def _broadcast_fixed(fixed: Union[bool, ArrayLike], shape: Tuple[int, ...]) -> np.ndarray:
+        fixed = np.asarray(fixed)
+        if fixed.dtype != np.bool_:
+            raise TypeError('`fixed` must be True, False or an array of booleans')
+        try:
+            return np.broadcast_to(fixed, shape).copy()
+        except ValueError:
+            raise ValueError(f'`fixed` must be a bool or have the shape {shape}, got {fixed.shape}') from None
+
+    @staticmethod
+    def _check_bounds(values: np.ndarray, min_values: np.ndarray, max_values: np.ndarray) -> None:
+        if np.any(values < min_values):
+            raise ValueError('The values can not be less than the min values')
+        if np.any(values > max_values):
+            raise ValueError('The values can not be greater than the max values')
+        if np.any(np.isclose(min_values, max_values, rtol=1e-9, atol=0.0)):
+            raise ValueError('The min and max bounds cannot be identical. Please use fixed=True instead to fix the value.')
@@ -104,6 +104,7 @@ class DescriptorBase(ComponentSerializer, metaclass=abc.ABCMeta):
         if not isinstance(new_name, str):
             raise TypeError('Name must be a string')
         self._name = new_name
+        global_object.name_epoch += 1
 
     @property
     def display_name(self) -> str:
@@ -12,7 +12,9 @@ import scipp as sc
 from scipp import UnitError
 from scipp import Variable
 
+from easyscience import global_object
 from easyscience.global_object.undo_redo import property_stack_deco
+from easyscience.Utils.units import to_unit
 
 from .descriptor_base import DescriptorBase
 
@@ -125,6 +127,7 @@ class DescriptorNumber(DescriptorBase):
         if not isinstance(value, numbers.Number) or isinstance(value, bool):
             raise TypeError(f'{value=} must be a number')
         self._scalar.value = float(value)
+        global_object.value_epoch += 1
 
     @property
     def unit(self) -> str:
@@ -202,11 +205,10 @@ class DescriptorNumber(DescriptorBase):
         """
         if not isinstance(unit_str, str):
             raise TypeError(f'{unit_str=} must be a string representing a valid scipp unit')
-        try:
-            new_unit = sc.Unit(unit_str)
-        except UnitError as message:
-            raise UnitError(message) from None
-        self._scalar = self._scalar.to(unit=new_unit)
+        new_scalar = to_unit(self._scalar, unit_str)
+        if new_scalar is not self._scalar:
+            self._scalar = new_scalar
+            global_object.value_epoch += 1
 
     # Just to get return type right
     def __copy__(self) -> DescriptorNumber:
@@ -243,13 +245,11 @@ class DescriptorNumber(DescriptorBase):
                 raise UnitError('Numbers can only be added to dimensionless values')
             new_value = self.full_value + other
         elif type(other) is DescriptorNumber:
-            original_unit = other.unit
             try:
-                other.convert_unit(self.unit)
+                other_value = to_unit(other.full_value, self.unit)
             except UnitError:
                 raise UnitError(f'Values with units {self.unit} and {other.unit} cannot be added') from None
-            new_value = self.full_value + other.full_value
-            other.convert_unit(original_unit)
+            new_value = self.full_value + other_value
         else:
             return NotImplemented
         descriptor_number = DescriptorNumber.from_scipp(name=self.name, full_value=new_value)
@@ -273,13 +273,11 @@ class DescriptorNumber(DescriptorBase):
                 raise UnitError('Numbers can only be subtracted from dimensionless values')
             new_value = self.full_value - other
         elif type(other) is DescriptorNumber:
-            original_unit = other.unit
             try:
-                other.convert_unit(self.unit)
+                other_value = to_unit(other.full_value, self.unit)
             except UnitError:
                 raise UnitError(f'Values with units {self.unit} and {other.unit} cannot be subtracted') from None
-            new_value = self.full_value - other.full_value
-            other.convert_unit(original_unit)
+            new_value = self.full_value - other_value
         else:
             return NotImplemented
         descriptor_number = DescriptorNumber.from_scipp(name=self.name, full_value=new_value)
@@ -393,11 +391,17 @@ class DescriptorNumber(DescriptorBase):
         return descriptor_number
 
     def _base_unit(self) -> str:
-        string = str(self._scalar.unit)
-        for i, letter in enumerate(string):
-            if letter == 'e':
-                if string[i : i + 2] not in ['e+', 'e-']:
-                    return string[i:]
-            elif letter not in ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9', '.', '+', '-']:
+        return base_unit(str(self._scalar.unit))
+
+
+def base_unit(string: str) -> str:
+    """
+    The unit without its numeric factor, e.g. `m` for `1e3 m`.
+    """
+    for i, letter in enumerate(string):
+        if letter == 'e':
+            if string[i : i + 2] not in ['e+', 'e-']:
                 return string[i:]
-        return ''
+        elif letter not in ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9', '.', '+', '-']:
+            return string[i:]
+    return ''
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import numbers
+from typing import Any
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+import scipp as sc
+from scipp import UnitError
+from scipp import Variable
+
+from easyscience.Utils.units import scipp_factor
+from easyscience.Utils.units import to_unit
+
+from .descriptor_number import DescriptorNumber
+from .descriptor_number import base_unit
+from .parameter import Parameter
+
+Operand = Union['Expression', DescriptorNumber, numbers.Number]
+
+
+def lazy(obj: Operand) -> Expression:
+    """
+    Start a lazy expression, e.g. `lazy(a) * b + c`. Arithmetic on an `Expression` only builds an expression tree,
+    no `DescriptorNumber` or `Parameter` is made for the intermediate results.
+
+    :param obj: `DescriptorNumber`, `Parameter`, number or `Expression`
+    :return: Expression of `obj`
+    """
+    if isinstance(obj, Expression):
+        return obj
+    if isinstance(obj, bool) or not isinstance(obj, (DescriptorNumber, numbers.Number)):
+        raise TypeError(f'{obj=} must be a DescriptorNumber, a Parameter or a number')
+    return Expression('leaf', (obj,))
+
+
+class _Result(NamedTuple):
+    # Value of a (sub-)expression, its bounds and whether it depends on a Parameter
+    value: Variable
+    min: float
+    max: float
+    parametric: bool
+
+
+class Expression:
+    """
+    Lazily evaluated arithmetic of `DescriptorNumber`, `Parameter` and numbers. The whole tree is evaluated in one go
+    by `evaluate`, which makes no objects, or by `materialize`, which makes only the final `DescriptorNumber` or
+    `Parameter`. Units, variances and the bounds of parameters are propagated as by the arithmetic of the operands.
+    The operands are read when the expression is evaluated, not when it is built.
+    """
+
+    __slots__ = ('_op', '_operands')
+
+    def __init__(self, op: str, operands: Tuple):
+        self._op = op
+        self._operands = operands
+
+    def __repr__(self) -> str:
+        if self._op == 'leaf':
+            operand = self._operands[0]
+            return operand.name if isinstance(operand, DescriptorNumber) else repr(operand)
+        if self._op in _UNARY:
+            return f'{self._op}({self._operands[0]!r})'
+        return f'({self._operands[0]!r} {_SYMBOLS[self._op]} {self._operands[1]!r})'
+
+    @property
+    def leaves(self) -> List[DescriptorNumber]:
+        """
+        The descriptors and parameters the expression depends on.
+        """
+        if self._op == 'leaf':
+            operand = self._operands[0]
+            return [operand] if isinstance(operand, DescriptorNumber) else []
+        leaves = []
+        for operand in self._operands:
+            for leaf in operand.leaves:
+                if not any(leaf is known for known in leaves):
+                    leaves.append(leaf)
+        return leaves
+
+    def evaluate(self) -> Variable:
+        """
+        Evaluate the expression without making any `DescriptorNumber` or `Parameter`.
+
+        :return: The value as a scipp scalar
+        """
+        return self._evaluate().value
+
+    @property
+    def value(self) -> numbers.Number:
+        return self.evaluate().value
+
+    @property
+    def unit(self) -> str:
+        return str(self.evaluate().unit)
+
+    @property
+    def variance(self) -> Optional[float]:
+        return self.evaluate().variance
+
+    @property
+    def error(self) -> Optional[float]:
+        variance = self.variance
+        return None if variance is None else float(np.sqrt(variance))
+
+    def bounds(self) -> Tuple[float, float]:
+        """
+        The bounds of the expression, from the bounds of the parameters it depends on.
+        """
+        result = self._evaluate()
+        return result.min, result.max
+
+    def materialize(self, name: Optional[str] = None, **kwargs) -> Union[DescriptorNumber, Parameter]:
+        """
+        Evaluate the expression into a new `Parameter`, if it depends on a parameter, or `DescriptorNumber`.
+
+        :param name: Name of the result, its unique name if not given
+        :param kwargs: Additional parameters for the result
+        :return: The result
+        """
+        result = self._evaluate()
+        if result.parametric:
+            kwargs.update(min=result.min, max=result.max)
+            obj = Parameter.from_scipp(name=name or 'expression', full_value=result.value, **kwargs)
+        else:
+            obj = DescriptorNumber.from_scipp(name=name or 'expression', full_value=result.value, **kwargs)
+        if name is None:
+            obj.name = obj.unique_name
+        return obj
+
+    def _evaluate(self) -> _Result:
+        if self._op == 'leaf':
+            return _leaf(self._operands[0])
+        return _OPERATIONS[self._op](*(operand._evaluate() for operand in self._operands))
+
+    def _binary(self, op: str, other: Any, reflected: bool = False) -> Expression:
+        if isinstance(other, bool) or not isinstance(other, (Expression, DescriptorNumber, numbers.Number)):
+            return NotImplemented
+        operands = (lazy(other), self) if reflected else (self, lazy(other))
+        return Expression(op, operands)
+
+    def __add__(self, other: Operand) -> Expression:
+        return self._binary('add', other)
+
+    def __radd__(self, other: Operand) -> Expression:
+        return self._binary('add', other, reflected=True)
+
+    def __sub__(self, other: Operand) -> Expression:
+        return self._binary('sub', other)
+
+    def __rsub__(self, other: Operand) -> Expression:
+        return self._binary('sub', other, reflected=True)
+
+    def __mul__(self, other: Operand) -> Expression:
+        return self._binary('mul', other)
+
+    def __rmul__(self, other: Operand) -> Expression:
+        return self._binary('mul', other, reflected=True)
+
+    def __truediv__(self, other: Operand) -> Expression:
+        return self._binary('truediv', other)
+
+    def __rtruediv__(self, other: Operand) -> Expression:
+        return self._binary('truediv', other, reflected=True)
+
+    def __pow__(self, other: Operand) -> Expression:
+        return self._binary('pow', other)
+
+    def __rpow__(self, other: Operand) -> Expression:
+        return self._binary('pow', other, reflected=True)
+
+    def __neg__(self) -> Expression:
+        return Expression('neg', (self,))
+
+    def __abs__(self) -> Expression:
+        return Expression('abs', (self,))
+
+
+def _leaf(operand: Union[DescriptorNumber, numbers.Number]) -> _Result:
+    if isinstance(operand, Parameter):
+        return _Result(operand.full_value, operand.min, operand.max, True)
+    if isinstance(operand, DescriptorNumber):
+        return _Result(operand.full_value, operand.value, operand.value, False)
+    return _Result(sc.scalar(float(operand)), float(operand), float(operand), False)
+
+
+def _to_unit(result: _Result, unit: Union[str, sc.Unit]) -> _Result:
+    if result.value.unit == unit:
+        return result
+    factor = scipp_factor(str(result.value.unit), str(unit))
+    return _Result(to_unit(result.value, str(unit)), result.min * factor, result.max * factor, result.parametric)
+
+
+def _to_base_unit(result: _Result) -> _Result:
+    return _to_unit(result, base_unit(str(result.value.unit)))
+
+
+def _same_unit(first: _Result, second: _Result, verb: str) -> _Result:
+    try:
+        return _to_unit(second, first.value.unit)
+    except UnitError:
+        raise UnitError(f'Values with units {first.value.unit} and {second.value.unit} cannot be {verb}') from None
+
+
+def _add(first: _Result, second: _Result) -> _Result:
+    second = _same_unit(first, second, 'added')
+    return _Result(
+        first.value + second.value, first.min + second.min, first.max + second.max, first.parametric or second.parametric
+    )
+
+
+def _sub(first: _Result, second: _Result) -> _Result:
+    second = _same_unit(first, second, 'subtracted')
+    min_value = first.min - second.max if second.max != np.inf else -np.inf
+    max_value = first.max - second.min if second.min != -np.inf else np.inf
+    return _Result(first.value - second.value, min_value, max_value, first.parametric or second.parametric)
+
+
+def _mul(first: _Result, second: _Result) -> _Result:
+    combinations = []
+    for first_bound in (first.min, first.max):
+        for second_bound in (second.min, second.max):
+            if (first_bound == 0 and np.isinf(second_bound)) or (second_bound == 0 and np.isinf(first_bound)):
+                combinations.append(0)
+            else:
+                combinations.append(first_bound * second_bound)
+    result = _Result(first.value * second.value, min(combinations), max(combinations), first.parametric or second.parametric)
+    return _to_base_unit(result)
+
+
+def _truediv(first: _Result, second: _Result) -> _Result:
+    if second.value.value == 0:
+        raise ZeroDivisionError('Cannot divide by zero')
+    if second.min < 0 and second.max > 0:
+        combinations = [-np.inf, np.inf]
+    elif (second.min == 0 or second.max == 0) and first.min < 0 and first.max > 0:
+        combinations = [-np.inf, np.inf]
+    elif second.min == 0:
+        combinations = [first.min / second.max, np.inf] if first.min >= 0 else [-np.inf, first.max / second.max]
+    elif second.max == 0:
+        combinations = [-np.inf, first.min / second.min] if first.min >= 0 else [first.max / second.min, np.inf]
+    else:
+        combinations = [first.min / second.min, first.max / second.max, first.min / second.max, first.max / second.min]
+    result = _Result(first.value / second.value, min(combinations), max(combinations), first.parametric or second.parametric)
+    return _to_base_unit(result)
+
+
+def _pow(first: _Result, second: _Result) -> _Result:
+    if second.parametric:
+        raise TypeError('Exponents must not depend on parameters')
+    if second.value.unit != sc.units.dimensionless:
+        raise UnitError('Exponents must be dimensionless')
+    if second.value.variance is not None:
+        raise ValueError('Exponents must not have variance')
+    exponent = second.value.value
+    new_value = first.value**exponent
+    if np.isnan(new_value.value):
+        raise ValueError('The result of the exponentiation is not a number')
+    if exponent == 0:
+        return _Result(new_value, new_value.value, new_value.value, False)
+    if exponent < 0:
+        if first.min < 0 and first.max > 0:
+            combinations = [-np.inf, np.inf]
+        elif first.min == 0:
+            combinations = [first.max**exponent, np.inf]
+        elif first.max == 0:
+            combinations = [-np.inf, first.min**exponent]
+        else:
+            combinations = [first.min**exponent, first.max**exponent]
+    else:
+        combinations = [first.min**exponent, first.max**exponent]
+    if exponent % 2 == 0:
+        if first.min < 0 and first.max > 0:
+            combinations.append(0)
+        combinations = [abs(combination) for combination in combinations]
+    elif exponent % 1 != 0:
+        if first.min < 0:
+            combinations.append(0)
+        combinations = [combination for combination in combinations if combination >= 0]
+    return _Result(new_value, min(combinations), max(combinations), first.parametric)
+
+
+def _neg(first: _Result) -> _Result:
+    return _Result(-first.value, -first.max, -first.min, first.parametric)
+
+
+def _abs(first: _Result) -> _Result:
+    combinations = [abs(first.min), abs(first.max)]
+    if first.min < 0 and first.max > 0:
+        combinations.append(0)
+    return _Result(abs(first.value), min(combinations), max(combinations), first.parametric)
+
+
+_OPERATIONS = {
+    'add': _add,
+    'sub': _sub,
+    'mul': _mul,
+    'truediv': _truediv,
+    'pow': _pow,
+    'neg': _neg,
+    'abs': _abs,
+}
+_UNARY = ('neg', 'abs')
+_SYMBOLS = {'add': '+', 'sub': '-', 'mul': '*', 'truediv': '/', 'pow': '**'}
@@ -25,6 +25,8 @@ from easyscience.Constraints import ConstraintBase
 from easyscience.Constraints import SelfConstraint
 from easyscience.global_object.undo_redo import property_stack_deco
 from easyscience.Utils.Exceptions import CoreSetException
+from easyscience.Utils.units import scipp_factor
+from easyscience.Utils.units import to_unit
 
 from .descriptor_number import DescriptorNumber
 
@@ -143,6 +145,7 @@ class Parameter(DescriptorNumber):
             scalar = self._callback.fget()
             if scalar != self._scalar:
                 self._scalar = scalar
+                global_object.value_epoch += 1
         return self._scalar
 
     @full_value.setter
@@ -162,6 +165,7 @@ class Parameter(DescriptorNumber):
             existing_value = self._callback.fget()
             if existing_value != self._scalar.value:
                 self._scalar.value = existing_value
+                global_object.value_epoch += 1
         return self._scalar.value
 
     @value.setter
@@ -201,6 +205,7 @@ class Parameter(DescriptorNumber):
         value = self._constraint_runner(self._constraints.virtual, value)
 
         self._scalar.value = float(value)
+        global_object.value_epoch += 1
         if self._callback.fset is not None:
             self._callback.fset(self._scalar.value)
 
@@ -212,9 +217,8 @@ class Parameter(DescriptorNumber):
         :return: None
         """
         super().convert_unit(unit_str)
-        new_unit = sc.Unit(unit_str)  # unit_str is tested in super method
-        self._min = self._min.to(unit=new_unit)
-        self._max = self._max.to(unit=new_unit)
+        self._min = to_unit(self._min, unit_str)
+        self._max = to_unit(self._max, unit_str)
 
     @property
     def min(self) -> numbers.Number:
@@ -381,6 +385,7 @@ class Parameter(DescriptorNumber):
                 if global_object.debug:
                     print(f'Constraint `{constraint}` has been applied')
                 self._scalar.value = constained_value
+                global_object.value_epoch += 1
                 value = constained_value
         return value
 
@@ -433,15 +438,14 @@ class Parameter(DescriptorNumber):
             min_value = self.min + other
             max_value = self.max + other
         elif isinstance(other, DescriptorNumber):  # Parameter inherits from DescriptorNumber and is also handled here
-            other_unit = other.unit
             try:
-                other.convert_unit(self.unit)
+                factor = scipp_factor(other.unit, self.unit)
             except UnitError:
                 raise UnitError(f'Values with units {self.unit} and {other.unit} cannot be added') from None
-            new_full_value = self.full_value + other.full_value
-            min_value = self.min + other.min if isinstance(other, Parameter) else self.min + other.value
-            max_value = self.max + other.max if isinstance(other, Parameter) else self.max + other.value
-            other.convert_unit(other_unit)
+            other_value = to_unit(other.full_value, self.unit)
+            min_value = self.min + other.min * factor if isinstance(other, Parameter) else self.min + other_value.value
+            max_value = self.max + other.max * factor if isinstance(other, Parameter) else self.max + other_value.value
+            new_full_value = self.full_value + other_value
         else:
             return NotImplemented
         parameter = Parameter.from_scipp(name=self.name, full_value=new_full_value, min=min_value, max=max_value)
@@ -456,15 +460,13 @@ class Parameter(DescriptorNumber):
             min_value = self.min + other
             max_value = self.max + other
         elif isinstance(other, DescriptorNumber):  # Parameter inherits from DescriptorNumber and is also handled here
-            original_unit = self.unit
             try:
-                self.convert_unit(other.unit)
+                factor = scipp_factor(self.unit, other.unit)
             except UnitError:
                 raise UnitError(f'Values with units {other.unit} and {self.unit} cannot be added') from None
-            new_full_value = self.full_value + other.full_value
-            min_value = self.min + other.value
-            max_value = self.max + other.value
-            self.convert_unit(original_unit)
+            new_full_value = to_unit(self.full_value, other.unit) + other.full_value
+            min_value = self.min * factor + other.value
+            max_value = self.max * factor + other.value
         else:
             return NotImplemented
         parameter = Parameter.from_scipp(name=self.name, full_value=new_full_value, min=min_value, max=max_value)
@@ -479,19 +481,18 @@ class Parameter(DescriptorNumber):
             min_value = self.min - other
             max_value = self.max - other
         elif isinstance(other, DescriptorNumber):  # Parameter inherits from DescriptorNumber and is also handled here
-            other_unit = other.unit
             try:
-                other.convert_unit(self.unit)
+                factor = scipp_factor(other.unit, self.unit)
             except UnitError:
                 raise UnitError(f'Values with units {self.unit} and {other.unit} cannot be subtracted') from None
-            new_full_value = self.full_value - other.full_value
+            other_value = to_unit(other.full_value, self.unit)
+            new_full_value = self.full_value - other_value
             if isinstance(other, Parameter):
-                min_value = self.min - other.max if other.max != np.inf else -np.inf
-                max_value = self.max - other.min if other.min != -np.inf else np.inf
+                min_value = self.min - other.max * factor if other.max != np.inf else -np.inf
+                max_value = self.max - other.min * factor if other.min != -np.inf else np.inf
             else:
-                min_value = self.min - other.value
-                max_value = self.max - other.value
-            other.convert_unit(other_unit)
+                min_value = self.min - other_value.value
+                max_value = self.max - other_value.value
         else:
             return NotImplemented
         parameter = Parameter.from_scipp(name=self.name, full_value=new_full_value, min=min_value, max=max_value)
@@ -506,15 +507,13 @@ class Parameter(DescriptorNumber):
             min_value = other - self.max
             max_value = other - self.min
         elif isinstance(other, DescriptorNumber):  # Parameter inherits from DescriptorNumber and is also handled here
-            original_unit = self.unit
             try:
-                self.convert_unit(other.unit)
+                factor = scipp_factor(self.unit, other.unit)
             except UnitError:
                 raise UnitError(f'Values with units {other.unit} and {self.unit} cannot be subtracted') from None
-            new_full_value = other.full_value - self.full_value
-            min_value = other.value - self.max
-            max_value = other.value - self.min
-            self.convert_unit(original_unit)
+            new_full_value = other.full_value - to_unit(self.full_value, other.unit)
+            min_value = other.value - self.max * factor
+            max_value = other.value - self.min * factor
         else:
             return NotImplemented
         parameter = Parameter.from_scipp(name=self.name, full_value=new_full_value, min=min_value, max=max_value)
@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+#  SPDX-FileCopyrightText: 2023 EasyScience contributors  <core@easyscience.software>
+#  SPDX-License-Identifier: BSD-3-Clause
+#  © 2021-2023 Contributors to the EasyScience project <https://github.com/easyScience/EasyScience
+import inspect
+import multiprocessing
+import pickle
+import weakref
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Type
+
+import numpy as np
+
+from .Inferface import InterfaceFactoryTemplate
+from .Inferface import ItemContainer
+
+
+def out_of_process(interface_class: Type) -> Type[ProcessInterface]:
+    """
+    Make an interface class whose objects run `interface_class` in a worker process. The returned class has the name
+    of `interface_class`, so it can be given to an `InterfaceFactoryTemplate` in its place, e.g.
+
+    `InterfaceFactoryTemplate([out_of_process(CalculatorA), out_of_process(CalculatorB)])`
+
+    :param interface_class: Interface class to be run in a worker process
+    :return: Out of process interface class
+    """
+    name = InterfaceFactoryTemplate.return_name(interface_class)
+    return type(interface_class.__name__, (ProcessInterface,), {'name': name, 'interface_class': interface_class})
+
+
+class ProcessInterface:
+    """
+    Interface which runs an interface object in a forked worker process, so that a slow calculator, or one holding the
+    GIL, does not block the application and several calculators can calculate at the same time (see `submit`).
+
+    Parameter changes are collected by `set_many` and sent along with the next request, so setting parameters and
+    calculating is a single message. `x` and the calculated values are exchanged through shared memory buffers instead
+    of being pickled. The links created by the worker interface are returned as `ItemContainer` with the usual getter
+    and setter semantics.
+
+    The worker needs the fork start method, so out of process interfaces are not available on Windows.
+    """
+
+    interface_class: Type = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        :param args: positional arguments for the worker interface
+        :param kwargs: key/value pair arguments for the worker interface
+        """
+        if self.interface_class is None:
+            raise TypeError('Use `out_of_process(interface_class)` to make an out of process interface')
+        self._args = args
+        self._kwargs = kwargs
+        self._updates: Dict[str, Dict[str, Any]] = {}
+        self._pending: Optional[PendingResult] = None
+        # Shared memory for x and for the calculated values, both owned by this process
+        self._segments: Dict[str, Optional[SharedMemory]] = {'input': None, 'output': None}
+        # The worker is started with the first request, see `_start`
+        self._worker: Dict[str, Any] = {'connection': None, 'process': None, 'closed': False}
+        self._finalizer = weakref.finalize(self, _shutdown, self._worker, self._segments)
+
+    def create(self, model) -> List[ItemContainer]:
+        """
+        Create the links of `model` in the worker interface. Models which existed when the worker was started are
+        found in its copy of the objects, others are pickled.
+
+        :param model: Object to be linked
+        :return: Links to the worker interface
+        """
+        links = self._request('create', (model.unique_name, id(model), None))
+        if links is None:
+            links = self._request('create', (model.unique_name, id(model), pickle.dumps(model)))
+        return [
+            ItemContainer(link_name, name_conversion, self._get_value, self._set_value) for link_name, name_conversion in links
+        ]
+
+    def set_many(self, updates: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Collect parameter changes, `{link_name: {inner_key: value, ...}, ...}`. They are sent with the next request.
+        """
+        for link_name, values in updates.items():
+            self._updates.setdefault(link_name, {}).update(values)
+
+    def get_many(self, requests: Dict[str, List[str]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Read values from the worker interface.
+
+        :param requests: `{link_name: [inner_key, ...], ...}`
+        :return: `{link_name: {inner_key: value, ...}, ...}`
+        """
+        return self._request('get_many', requests)
+
+    def fit_func(self, x: np.ndarray, changed: Optional[Dict[str, Set[str]]] = None, **kwargs) -> np.ndarray:
+        """
+        Calculate at `x` in the worker process.
+
+        :param x: points to be calculated at
+        :param changed: parameters changed since the last call, passed on if the worker interface takes them
+        :param kwargs: key/value pair arguments for the fitting function of the worker interface
+        :return: points calculated at `x`
+        """
+        return self.submit(x, changed=changed, **kwargs).result()
+
+    def submit(self, x: np.ndarray, changed: Optional[Dict[str, Set[str]]] = None, **kwargs) -> PendingResult:
+        """
+        Start calculating at `x` and return without waiting for the result, e.g. to let several out of process
+        interfaces calculate at the same time.
+
+        :param x: points to be calculated at
+        :param changed: parameters changed since the last call, passed on if the worker interface takes them
+        :param kwargs: key/value pair arguments for the fitting function of the worker interface
+        :return: The pending calculation, `result()` waits for it
+        """
+        self._collect()
+        self._ensure_running()
+        x = np.ascontiguousarray(x)
+        segment = self._segment('input', x.nbytes)
+        np.ndarray(x.shape, dtype=x.dtype, buffer=segment.buf)[...] = x
+        self._send('fit_func', (segment.name, x.shape, x.dtype.str, changed, kwargs))
+        self._pending = PendingResult(self)
+        return self._pending
+
+    def close(self) -> None:
+        """
+        Stop the worker process and release the shared memory.
+        """
+        self._pending = None
+        self._finalizer()
+
+    def _start(self) -> None:
+        # The worker is forked when the interface is first used, usually by `create(model)`. It then has its own copy
+        # of the model, and of all other existing objects, without pickling them.
+        # The worker has to share the resource tracker, or it would remove the shared memory when it stops
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise RuntimeError('Out of process interfaces need the fork start method, which is not available on this platform')
+        resource_tracker.ensure_running()
+        context = multiprocessing.get_context('fork')
+        connection, worker_connection = context.Pipe()
+        process = context.Process(
+            target=_serve, args=(worker_connection, self.interface_class, self._args, self._kwargs), daemon=True
+        )
+        process.start()
+        worker_connection.close()
+        self._worker.update(connection=connection, process=process)
+
+    def _get_value(self, link_name: str, inner_key: str) -> Any:
+        return self.get_many({link_name: [inner_key]})[link_name][inner_key]
+
+    def _set_value(self, link_name: str, **kwargs) -> None:
+        self.set_many({link_name: kwargs})
+
+    def _segment(self, kind: str, nbytes: int) -> SharedMemory:
+        segment = self._segments[kind]
+        if segment is None or segment.size < nbytes:
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+            # Grown with some headroom, so that slightly larger arrays do not need a new segment
+            segment = SharedMemory(create=True, size=max(nbytes + nbytes // 2, 1))
+            self._segments[kind] = segment
+        return segment
+
+    def _ensure_running(self) -> None:
+        if self._worker['closed']:
+            raise RuntimeError('The interface has been closed')
+        if self._worker['process'] is None:
+            self._start()
+        elif not self._worker['process'].is_alive():
+            raise RuntimeError('The interface worker process is not running')
+
+    def _send(self, command: str, payload: Any) -> None:
+        self._ensure_running()
+        updates, self._updates = self._updates, {}
+        self._worker['connection'].send((command, updates, payload))
+
+    def _receive(self) -> Any:
+        try:
+            status, reply = self._worker['connection'].recv()
+        except EOFError:
+            raise RuntimeError('The interface worker process has stopped') from None
+        if status == 'error':
+            raise reply
+        return reply
+
+    def _request(self, command: str, payload: Any) -> Any:
+        self._collect()
+        self._send(command, payload)
+        return self._receive()
+
+    def _collect(self) -> None:
+        # Replies arrive in order, so an outstanding calculation is finished before anything else is requested
+        if self._pending is not None:
+            self._pending.result()
+
+    def _read_result(self) -> np.ndarray:
+        reply = self._receive()
+        if reply[0] == 'grow':
+            segment = self._segment('output', reply[1])
+            self._send('output', segment.name)
+            reply = self._receive()
+        _, shape, dtype = reply
+        segment = self._segments['output']
+        # Copied, the buffer is overwritten by the next calculation
+        return np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf).copy()
+
+
+class PendingResult:
+    """
+    A calculation submitted to an out of process interface.
+    """
+
+    def __init__(self, interface: ProcessInterface):
+        self._interface = interface
+        self._result: Optional[np.ndarray] = None
+        self._done = False
+
+    def result(self) -> np.ndarray:
+        """
+        Wait for the calculation and return the calculated values.
+        """
+        if not self._done:
+            self._done = True
+            if self._interface._pending is self:
+                self._interface._pending = None
+            self._result = self._interface._read_result()
+        return self._result
+
+
+def _shutdown(worker: Dict[str, Any], segments: Dict[str, Optional[SharedMemory]]) -> None:
+    worker['closed'] = True
+    connection, process = worker['connection'], worker['process']
+    if process is not None:
+        try:
+            if process.is_alive():
+                connection.send(('close', {}, None))
+        except (BrokenPipeError, OSError):
+            pass
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+        connection.close()
+    for kind, segment in segments.items():
+        if segment is not None:
+            segments[kind] = None
+            segment.close()
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _serve(connection, interface_class: Type, args: Tuple, kwargs: Dict) -> None:
+    """
+    Worker process loop. Every message is `(command, updates, payload)` and the parameter changes in `updates` are
+    applied before the command is run. Every reply is `(status, value)`.
+    """
+    interface = interface_class(*args, **kwargs)
+    worker = _Worker(interface)
+    while True:
+        try:
+            command, updates, payload = connection.recv()
+        except EOFError:
+            break
+        if command == 'close':
+            break
+        try:
+            worker.set_many(updates)
+            reply = getattr(worker, command)(payload)
+        except Exception as e:
+            try:
+                pickle.dumps(e)
+            except Exception:
+                e = RuntimeError(f'{type(e).__name__}: {e}')
+            connection.send(('error', e))
+            continue
+        connection.send(('ok', reply))
+    worker.close()
+    connection.close()
+
+
+class _Worker:
+    """
+    The interface object in the worker process and the links it created.
+    """
+
+    def __init__(self, interface: Any):
+        self.interface = interface
+        self.links: Dict[str, ItemContainer] = {}
+        # Unpickled models are kept alive for the links made to them
+        self.models: List = []
+        self.segments: Dict[str, SharedMemory] = {}
+        self.result: Optional[np.ndarray] = None
+        try:
+            self.accepts_changed = 'changed' in inspect.signature(interface.fit_func).parameters
+        except (TypeError, ValueError):
+            self.accepts_changed = False
+
+    def create(self, payload: Tuple[str, int, Optional[bytes]]) -> Optional[List[Tuple[str, dict]]]:
+        from easyscience import global_object
+
+        unique_name, identity, pickled = payload
+        if pickled is not None:
+            from easyscience.global_object.map import Map
+
+            # The copies of objects which no longer exist may hold the unique names of the pickled objects, so they
+            # are made in a map of their own
+            worker_map, global_object.map = global_object.map, Map()
+            try:
+                # Pickled by the process which started this worker
+                model = pickle.loads(pickled)  # noqa: S301
+            finally:
+                global_object.map = worker_map
+            self.models.append(model)
+        else:
+            try:
+                model = global_object.map.get_item_by_key(unique_name)
+            except ValueError:
+                model = None
+            # Unique names are reused, the forked copy of an object has the same id as the original
+            if model is None or id(model) != identity:
+                # Ask for the pickled model
+                return None
+        links = []
+        for item in self.interface.create(model):
+            self.links.setdefault(item.link_name, item)
+            links.append((item.link_name, dict(item.name_conversion)))
+        return links
+
+    def set_many(self, updates: Dict[str, Dict[str, Any]]) -> None:
+        if not updates:
+            return
+        if hasattr(self.interface, 'set_many'):
+            self.interface.set_many(updates)
+            return
+        for link_name, values in updates.items():
+            self.links[link_name].setter_fn(link_name, **values)
+
+    def get_many(self, requests: Dict[str, List[str]]) -> Dict[str, Dict[str, Any]]:
+        if hasattr(self.interface, 'get_many'):
+            return self.interface.get_many(requests)
+        return {
+            link_name: {key: self.links[link_name].getter_fn(link_name, key) for key in keys}
+            for link_name, keys in requests.items()
+        }
+
+    def fit_func(self, payload: Tuple) -> Tuple:
+        name, shape, dtype, changed, kwargs = payload
+        x = np.ndarray(shape, dtype=np.dtype(dtype), buffer=self._attach('input', name).buf)
+        if self.accepts_changed and changed is not None:
+            kwargs['changed'] = changed
+        self.result = np.ascontiguousarray(self.interface.fit_func(x, **kwargs))
+        segment = self.segments.get('output', None)
+        if segment is None or segment.size < self.result.nbytes:
+            return ('grow', self.result.nbytes)
+        return self._write_result()
+
+    def output(self, name: str) -> Tuple:
+        self._attach('output', name)
+        return self._write_result()
+
+    def _write_result(self) -> Tuple:
+        result, self.result = self.result, None
+        np.ndarray(result.shape, dtype=result.dtype, buffer=self.segments['output'].buf)[...] = result
+        return ('done', result.shape, result.dtype.str)
+
+    def _attach(self, kind: str, name: str) -> SharedMemory:
+        segment = self.segments.get(kind, None)
+        if segment is None or segment.name != name:
+            if segment is not None:
+                _close(segment)
+            segment = SharedMemory(name=name)
+            self.segments[kind] = segment
+        return segment
+
+    def close(self) -> None:
+        for segment in self.segments.values():
+            _close(segment)
+
+
+def _close(segment: SharedMemory) -> None:
+    try:
+        segment.close()
+    except BufferError:
+        # The interface still holds an array in the segment, it is released with the array
+        pass
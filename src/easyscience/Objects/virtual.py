@@ -12,15 +12,26 @@ import weakref
 from copy import deepcopy
 from typing import TYPE_CHECKING
 from typing import Iterable
+from typing import Iterator
+from typing import List
 from typing import MutableSequence
+from typing import Optional
+from typing import Union
+
+import numpy as np
 
 from easyscience import global_object
 from easyscience.Constraints import ObjConstraint
+from easyscience.fitting.minimizers.utils import current_value
 
 if TYPE_CHECKING:
     from easyscience.Objects.ObjectClasses import BV
 
 
+# The virtual class of a real class, see `_virtual_class`. Neither class is kept alive by the registry.
+_VIRTUAL_CLASSES: weakref.WeakKeyDictionary[type, weakref.ReferenceType] = weakref.WeakKeyDictionary()
+
+
 def raise_(ex):
     raise ex
 
@@ -139,24 +150,7 @@ def virtualizer(obj: BV) -> BV:
 
     # The supplied class
     klass = getattr(obj, '__old_class__', obj.__class__)
-    virtual_options = {
-        '_is_virtual': True,
-        'is_virtual': property(fget=lambda self: self._is_virtual),
-        '_derived_from': property(fget=lambda self: obj.unique_name),
-        '__non_virtual_class__': klass,
-        'realize': realizer,
-        'relalize_component': component_realizer,
-    }
-
-    import easyscience.Objects.Variable as ec_var
-
-    if klass in ec_var.__dict__.values():  # is_variable check
-        virtual_options['fixed'] = property(
-            fget=lambda self: self._fixed,
-            fset=lambda self, value: raise_(AttributeError('Virtual parameters cannot be fixed')),
-        )
-    # Generate a new class
-    cls = type('Virtual' + klass.__name__, (klass,), virtual_options)
+    cls = _virtual_class(klass)
     # Determine what to do next.
     args = []
     # If `obj` is a parameter or descriptor etc, then simple mods.
@@ -168,6 +162,7 @@ def virtualizer(obj: BV) -> BV:
         d['unique_name'] = None
         v_p = cls(**d)
         v_p._enabled = False
+        v_p._virtual_source = obj.unique_name
         constraint = ObjConstraint(v_p, '', obj)
         constraint.external = True
         obj._constraints['virtual'][v_p.unique_name] = constraint
@@ -190,4 +185,218 @@ def virtualizer(obj: BV) -> BV:
                 ]:
                     args.append(getattr(obj, key))
         v_p = cls(*args, **kwargs)
+        v_p._virtual_source = obj.unique_name
     return v_p
+
+
+def _virtual_class(klass: type) -> type:
+    """
+    The virtual class of `klass`. It is made once and reused for all objects of the class, for as long as any of them
+    exists. Note that a `BaseObj` still gets its own subclass of it per object from `addLoggedProp`, as every
+    `BaseObj` does.
+    """
+    ref = _VIRTUAL_CLASSES.get(klass, None)
+    cls = None if ref is None else ref()
+    if cls is not None:
+        return cls
+    virtual_options = {
+        '_is_virtual': True,
+        'is_virtual': property(fget=lambda self: self._is_virtual),
+        '_derived_from': property(fget=lambda self: self._virtual_source),
+        '__non_virtual_class__': klass,
+        'realize': realizer,
+        'relalize_component': component_realizer,
+    }
+
+    import easyscience.Objects.Variable as ec_var
+
+    if klass in ec_var.__dict__.values():  # is_variable check
+        virtual_options['fixed'] = property(
+            fget=lambda self: self._fixed,
+            fset=lambda self, value: raise_(AttributeError('Virtual parameters cannot be fixed')),
+        )
+    # Generate a new class
+    cls = type('Virtual' + klass.__name__, (klass,), virtual_options)
+    # The virtual class refers to `klass`, so holding it strongly would also keep `klass` alive
+    _VIRTUAL_CLASSES[klass] = weakref.ref(cls)
+    return cls
+
+
+class ParameterViews:
+    """
+    Read only views of parameters, e.g. of the coordinates of symmetry equivalent atoms. View `i` has the value
+    `scale[i] * sources[index[i]].value + offset[i]`. The values of all views are calculated at once, and only again
+    after a parameter value has changed. No class, map entry, constraint or finalizer is made per view, unlike with
+    `virtualizer`, so that thousands of views are cheap.
+
+    Changes of the sources are not pushed to the views. Instead the views read their values from the sources when
+    asked, which takes the place of the `ObjConstraint` of every virtual parameter made by `virtualizer`.
+    """
+
+    def __init__(
+        self,
+        sources: List,
+        index: Optional[Iterable[int]] = None,
+        scale: Union[float, Iterable[float]] = 1.0,
+        offset: Union[float, Iterable[float]] = 0.0,
+    ):
+        """
+        :param sources: Parameters the views are derived from
+        :param index: Source of every view, one view per source if not given
+        :param scale: Factor multiplying the source value, per view or for all views
+        :param offset: Offset added to the scaled source value, per view or for all views
+        """
+        self._sources = list(sources)
+        if index is None:
+            index = np.arange(len(self._sources))
+        index = np.asarray(index, dtype=np.intp)
+        if index.ndim != 1:
+            raise ValueError('The index has to be one dimensional')
+        if np.any(index < 0) or np.any(index >= len(self._sources)):
+            raise IndexError('The index refers to a source which does not exist')
+        self._index = index
+        self._scale = np.broadcast_to(np.asarray(scale, dtype=np.float64), index.shape).copy()
+        self._offset = np.broadcast_to(np.asarray(offset, dtype=np.float64), index.shape).copy()
+        self._values_cache = None
+
+    def __len__(self) -> int:
+        return self._index.size
+
+    def __getitem__(self, idx: int) -> ParameterView:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError('Virtual parameter index out of range')
+        return ParameterView(self, idx)
+
+    def __iter__(self) -> Iterator[ParameterView]:
+        return (ParameterView(self, idx) for idx in range(len(self)))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__} with {len(self)} views of {len(self._sources)} parameters'
+
+    @property
+    def sources(self) -> List:
+        return self._sources
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        Values of all views. The array is read only.
+        """
+        epoch = global_object.value_epoch
+        if self._values_cache is None or self._values_cache[0] != epoch:
+            source_values = np.array([current_value(source) for source in self._sources], dtype=np.float64)
+            values = self._scale * source_values[self._index] + self._offset
+            values.flags.writeable = False
+            self._values_cache = (epoch, values)
+        return self._values_cache[1]
+
+    @property
+    def errors(self) -> np.ndarray:
+        """
+        Errors of all views.
+        """
+        source_errors = np.array([source.error for source in self._sources], dtype=np.float64)
+        return np.abs(self._scale) * source_errors[self._index]
+
+    def source(self, idx: int):
+        """
+        The parameter view `idx` is derived from.
+        """
+        return self._sources[self._index[idx]]
+
+    def _bounds(self, idx: int):
+        source = self.source(idx)
+        bounds = self._scale[idx] * np.array([source.min, source.max]) + self._offset[idx]
+        if self._scale[idx] == 0:
+            bounds = np.array([self._offset[idx], self._offset[idx]])
+        return np.sort(bounds)
+
+
+class ParameterView:
+    """
+    Read only view of a parameter in `ParameterViews`. Everything is read through to the source parameter.
+    """
+
+    __slots__ = ('_parameters', '_idx')
+
+    _is_virtual = True
+
+    def __init__(self, parameters: ParameterViews, idx: int):
+        self._parameters = parameters
+        self._idx = idx
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} {self.name!r}: {self.value} {self.unit}>'
+
+    def __float__(self) -> float:
+        return self.value
+
+    @property
+    def is_virtual(self) -> bool:
+        return self._is_virtual
+
+    @property
+    def source(self):
+        return self._parameters.source(self._idx)
+
+    @property
+    def _derived_from(self) -> str:
+        return self.source.unique_name
+
+    @property
+    def name(self) -> str:
+        return self.source.name
+
+    @property
+    def unit(self):
+        return self.source.unit
+
+    @property
+    def value(self) -> float:
+        return float(self._parameters.values[self._idx])
+
+    @value.setter
+    def value(self, value) -> None:
+        raise AttributeError('Virtual parameters cannot be set')
+
+    @property
+    def raw_value(self) -> float:
+        return self.value
+
+    @property
+    def error(self) -> float:
+        return abs(self._parameters._scale[self._idx]) * self.source.error
+
+    @property
+    def min(self) -> float:
+        return float(self._parameters._bounds(self._idx)[0])
+
+    @property
+    def max(self) -> float:
+        return float(self._parameters._bounds(self._idx)[1])
+
+    @property
+    def fixed(self) -> bool:
+        return True
+
+    @fixed.setter
+    def fixed(self, value: bool) -> None:
+        raise AttributeError('Virtual parameters cannot be fixed')
+
+    @property
+    def enabled(self) -> bool:
+        return False
+
+    def realize(self):
+        """
+        A real parameter with the current value, error and bounds of the view.
+        """
+        ## TODO clean when full move to new_variable
+        from easyscience.Objects.new_variable import Parameter
+
+        source = self.source
+        if isinstance(source, Parameter):
+            return Parameter(self.name, self.value, unit=str(self.unit), variance=self.error**2, min=self.min, max=self.max)
+        return source.__class__(self.name, self.value, units=str(self.unit), error=self.error, min=self.min, max=self.max)
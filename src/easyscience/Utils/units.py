@@ -0,0 +1,98 @@
+#  SPDX-FileCopyrightText: 2023 EasyScience contributors  <core@easyscience.software>
+#  SPDX-License-Identifier: BSD-3-Clause
+#  © 2021-2023 Contributors to the EasyScience project <https://github.com/easyScience/EasyScience
+
+"""
+Cached unit parsing and conversion. Parsing a unit string and working out a conversion is much slower than applying it,
+so both are done once per unit string or pair of unit strings.
+"""
+
+from functools import lru_cache
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import pint
+import scipp as sc
+from scipp import UnitError
+from scipp import Variable
+
+from easyscience import ureg
+
+
+@lru_cache(maxsize=1024)
+def scipp_unit(unit_str: str) -> sc.Unit:
+    """
+    The scipp unit of a unit string.
+
+    :param unit_str: Unit in string form
+    :return: Parsed unit
+    """
+    try:
+        return sc.Unit(unit_str)
+    except UnitError as message:
+        raise UnitError(message) from None
+
+
+@lru_cache(maxsize=1024)
+def scipp_factor(from_unit: str, to_unit: str) -> float:
+    """
+    The factor converting values in `from_unit` to `to_unit`.
+
+    :param from_unit: Unit of the values in string form
+    :param to_unit: Unit to convert to in string form
+    :return: Conversion factor
+    """
+    return float(sc.scalar(1.0, unit=scipp_unit(from_unit)).to(unit=scipp_unit(to_unit)).value)
+
+
+def to_unit(variable: Variable, unit_str: str) -> Variable:
+    """
+    Convert a scipp variable to a unit. The variable itself is returned if it is already in the unit.
+
+    :param variable: Variable to convert
+    :param unit_str: Unit to convert to in string form
+    :return: Converted variable
+    """
+    unit = scipp_unit(unit_str)
+    if variable.unit == unit:
+        return variable
+    return variable.to(unit=unit)
+
+
+@lru_cache(maxsize=1024)
+def pint_unit(unit_str: Optional[str]) -> Union[pint.Quantity, int]:
+    """
+    The pint expression of a unit string, as given by `ureg.parse_expression`. The result is shared, so it must not be
+    changed in place.
+
+    :param unit_str: Unit in string form
+    :return: Parsed unit
+    """
+    return ureg.parse_expression(unit_str)
+
+
+@lru_cache(maxsize=1024)
+def ureg_unit(unit_str: str) -> pint.Unit:
+    """
+    The pint unit of a unit string, as given by `ureg.Unit`. Units are immutable, so the result can be shared.
+
+    :param unit_str: Unit in string form
+    :return: Parsed unit
+    """
+    return ureg.Unit(unit_str)
+
+
+@lru_cache(maxsize=1024)
+def pint_conversion(from_unit: str, to_unit: str) -> Tuple[float, float]:
+    """
+    The scale and offset converting values in `from_unit` to `to_unit`, as `scale * value + offset`. The offset is only
+    non-zero for units like `degC`.
+
+    :param from_unit: Unit of the values in string form
+    :param to_unit: Unit to convert to in string form
+    :return: Scale and offset
+    """
+    offset = ureg.Quantity(0.0, from_unit).to(to_unit).magnitude
+    scale = ureg.Quantity(1.0, from_unit).to(to_unit).magnitude - offset
+    return float(scale), float(offset)
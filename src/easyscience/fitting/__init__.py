@@ -1,8 +1,10 @@
 from .available_minimizers import AvailableMinimizers
 from .fitter import Fitter
+from .incremental import IncrementalFitter
 from .minimizers.utils import FitResults
+from .multi_start import MultiStartFitter
 
 # Causes circular import
 # from .multi_fitter import MultiFitter  # noqa: F401, E402
 
-all = [AvailableMinimizers, Fitter, FitResults]
+all = [AvailableMinimizers, Fitter, FitResults, IncrementalFitter, MultiStartFitter]
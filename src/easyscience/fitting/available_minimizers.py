@@ -55,11 +55,17 @@ class AvailableMinimizers(AvailableMinimizer, Enum):
         Bumps_simplex = 'bumps', 'amoeba', 22
         Bumps_newton = 'bumps', 'newton', 23
         Bumps_lm = 'bumps', 'lm', 24
+        Bumps_dream = 'bumps', 'dream', 25
 
     if dfo_engine_available:
         DFO = 'dfo', 'leastsq', 31
         DFO_leastsq = 'dfo', 'leastsq', 32
 
+    # Closed form solution for linear models, only needs numpy and scipy
+    Linear = 'linear', 'svd', 41
+    Linear_svd = 'linear', 'svd', 42
+    Linear_qr = 'linear', 'qr', 43
+
 
 # Temporary solution to convert string to enum
 def from_string_to_enum(minimizer_name: str) -> AvailableMinimizers:
@@ -84,11 +90,20 @@ def from_string_to_enum(minimizer_name: str) -> AvailableMinimizers:
         minmizer_enum = AvailableMinimizers.Bumps_newton
     elif minimizer_name == 'Bumps_lm':
         minmizer_enum = AvailableMinimizers.Bumps_lm
+    elif minimizer_name == 'Bumps_dream':
+        minmizer_enum = AvailableMinimizers.Bumps_dream
 
     elif minimizer_name == 'DFO':
         minmizer_enum = AvailableMinimizers.DFO
     elif minimizer_name == 'DFO_leastsq':
         minmizer_enum = AvailableMinimizers.DFO_leastsq
+
+    elif minimizer_name == 'Linear':
+        minmizer_enum = AvailableMinimizers.Linear
+    elif minimizer_name == 'Linear_svd':
+        minmizer_enum = AvailableMinimizers.Linear_svd
+    elif minimizer_name == 'Linear_qr':
+        minmizer_enum = AvailableMinimizers.Linear_qr
     else:
         raise ValueError(
             f'Invalid minimizer name: {minimizer_name}. The following minimizers are available: {[minimize.name for minimize in AvailableMinimizers]}'  # noqa: E501
@@ -0,0 +1,43 @@
+#  SPDX-FileCopyrightText: 2023 EasyScience contributors  <core@easyscience.software>
+#  SPDX-License-Identifier: BSD-3-Clause
+#  © 2021-2023 Contributors to the EasyScience project <https://github.com/easyScience/EasyScience
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Tuple
+from typing import Union
+
+FitFunctionSpec = Union[None, str, Callable]
+
+
+def encode_fit_task(fit_object, fit_function: Callable) -> Tuple[Dict[str, Any], FitFunctionSpec]:
+    """
+    Encode a fit object and its fit function so that a clone can be made in another process.
+    The fit function is commonly the fit object or one of its methods, these are rebound to the clone.
+
+    :param fit_object: The EasyScience model object, it must be serializable with `as_dict`
+    :param fit_function: The function to be optimized against
+    :return: Serialized fit object without unique names and a specification of the fit function
+    """
+    object_dict = fit_object.as_dict(skip=['unique_name'])
+    if fit_function is fit_object:
+        return object_dict, None
+    if getattr(fit_function, '__self__', None) is fit_object:
+        return object_dict, fit_function.__name__
+    return object_dict, fit_function
+
+
+def decode_fit_task(object_dict: Dict[str, Any], fit_function: FitFunctionSpec) -> Tuple[Any, Callable]:
+    """
+    Create a clone of a fit object and bind its fit function, see `encode_fit_task`.
+
+    :return: The cloned fit object and fit function
+    """
+    from easyscience.Objects.core import ComponentSerializer
+
+    clone = ComponentSerializer.from_dict(object_dict)
+    if fit_function is None:
+        fit_function = clone
+    elif isinstance(fit_function, str):
+        fit_function = getattr(clone, fit_function)
+    return clone, fit_function
@@ -14,6 +14,7 @@ from .available_minimizers import from_string_to_enum
 from .minimizers import FitResults
 from .minimizers import MinimizerBase
 from .minimizers.factory import factory
+from .minimizers.utils import EvaluationCache
 
 DEFAULT_MINIMIZER = AvailableMinimizers.LMFit_leastsq
 
@@ -29,6 +30,8 @@ class Fitter:
         self._dependent_dims: int = None
         self._tolerance: float = None
         self._max_evaluations: int = None
+        self._evaluation_cache: Optional[EvaluationCache] = None
+        self._linear_parameters: List = []
 
         self._minimizer: MinimizerBase = None  # set in _update_minimizer
         self._enum_current_minimizer: AvailableMinimizers = None  # set in _update_minimizer
@@ -49,6 +52,56 @@ class Fitter:
     def evaluate(self, pars=None) -> np.ndarray:
         return self._minimizer.evaluate(pars)
 
+    def design_matrix(self, x: np.ndarray, values: Optional[np.ndarray] = None):
+        """
+        Evaluate the fit function and its derivatives with respect to the fit parameters,
+        see `MinimizerBase.design_matrix`.
+
+        :param x: x values for which the fit function will be evaluated
+        :param values: parameter values in the order of `get_fit_parameters`, the current values if not given
+        :return: flat fit function values at `values` and the (n_points x n_pars) design matrix
+        """
+        return self._minimizer.design_matrix(x, values)
+
+    def evaluate_batch(
+        self,
+        x: np.ndarray,
+        parameter_sets: np.ndarray,
+        chunk_size: Optional[int] = None,
+        workers: int = 1,
+    ) -> np.ndarray:
+        """
+        Evaluate the fit function for many parameter vectors, see `MinimizerBase.evaluate_batch`.
+        Without a vectorized path the parameter vectors can be evaluated in chunks on a process pool,
+        each worker using a clone of the fit object. The clones do not carry the fit constraints, so with fit
+        constraints the parameter vectors are always evaluated in this process. The fit object is never altered.
+
+        :param x: x values for which the fit function will be evaluated
+        :param parameter_sets: (n_sets x n_pars) array with the columns in the order of `get_fit_parameters`
+        :param chunk_size: Number of parameter vectors per chunk
+        :param workers: Number of worker processes, 1 evaluates in this process and `None` uses all cores
+        :return: (n_sets x ...) array, the fit function result for every parameter vector
+        """
+        if workers == 1 or self._minimizer.fit_constraints() or self._minimizer._batch_call() is not None:
+            return self._minimizer.evaluate_batch(x, parameter_sets, chunk_size=chunk_size)
+
+        import os
+        from concurrent.futures import ProcessPoolExecutor
+
+        from .clone import encode_fit_task
+
+        parameter_sets = np.atleast_2d(np.asarray(parameter_sets, dtype=np.float64))
+        n_sets = parameter_sets.shape[0]
+        if workers is None:
+            workers = os.cpu_count()
+        if chunk_size is None:
+            chunk_size = max(-(-n_sets // workers), 1)
+        object_dict, fit_function = encode_fit_task(self._fit_object, self._fit_function)
+        chunks = [parameter_sets[start : start + chunk_size] for start in range(0, n_sets, chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_evaluate_chunk, *zip(*[(object_dict, fit_function, x, chunk) for chunk in chunks])))
+        return np.concatenate(results)
+
     def convert_to_pars_obj(self, pars) -> object:
         return self._minimizer.convert_to_pars_obj(pars)
 
@@ -90,8 +143,33 @@ class Fitter:
 
     def _update_minimizer(self, minimizer_enum: AvailableMinimizers) -> None:
         self._minimizer = factory(minimizer_enum=minimizer_enum, fit_object=self._fit_object, fit_function=self.fit_function)
+        self._minimizer.evaluation_cache = self._evaluation_cache
         self._enum_current_minimizer = minimizer_enum
 
+    @property
+    def evaluation_cache(self) -> Optional[EvaluationCache]:
+        """
+        Get the cache of model evaluations shared by the minimizers of this fitter.
+
+        :return: Evaluation cache or None if caching is disabled
+        """
+        return self._evaluation_cache
+
+    def enable_evaluation_cache(self, maxsize: int = 128) -> EvaluationCache:
+        """
+        Cache model evaluations at revisited parameter vectors. The cache and its statistics survive minimizer switches.
+
+        :param maxsize: Maximum number of evaluations which are kept
+        :return: The evaluation cache
+        """
+        self._evaluation_cache = EvaluationCache(maxsize)
+        self._minimizer.evaluation_cache = self._evaluation_cache
+        return self._evaluation_cache
+
+    def disable_evaluation_cache(self) -> None:
+        self._evaluation_cache = None
+        self._minimizer.evaluation_cache = None
+
     @property
     def available_minimizers(self) -> List[str]:
         """
@@ -148,6 +226,31 @@ class Fitter:
         """
         self._max_evaluations = max_evaluations
 
+    @property
+    def linear_parameters(self) -> List:
+        """
+        Get the parameters the fit function is linear in. If there are any, fits are separable least squares fits
+        where the minimizer only varies the other parameters, see `VariableProjection`.
+
+        :return: List of linear parameters
+        """
+        return list(self._linear_parameters)
+
+    @linear_parameters.setter
+    def linear_parameters(self, parameters: Optional[List]) -> None:
+        """
+        Tag fit parameters as linear, i.e. the fit function is linear in them. `None` or an empty list turns the
+        separable least squares mode off.
+
+        :param parameters: Fit parameters the fit function is linear in
+        """
+        parameters = list(parameters) if parameters is not None else []
+        fit_parameters = self._fit_object.get_fit_parameters()
+        for parameter in parameters:
+            if not any(parameter is fit_parameter for fit_parameter in fit_parameters):
+                raise ValueError(f'{parameter.name} is not a fit parameter of the fit object')
+        self._linear_parameters = parameters
+
     @property
     def fit_function(self) -> Callable:
         """
@@ -200,7 +303,7 @@ class Fitter:
                 x = real_x
             dependent = fun(x, **kwargs)
             if flatten:
-                dependent = dependent.flatten()
+                dependent = np.ravel(dependent)
             return dependent
 
         return wrapped_fit_function
@@ -240,14 +343,17 @@ class Fitter:
             constraints = self._minimizer.fit_constraints()
             self.fit_function = fit_fun_wrap
             self._minimizer.set_fit_constraint(constraints)
-            f_res = self._minimizer.fit(
-                x_fit,
-                y_new,
-                weights=weights,
-                tolerance=self._tolerance,
-                max_evaluations=self._max_evaluations,
-                **kwargs,
-            )
+            if self._linear_parameters:
+                f_res = self._fit_separable(x_fit, y_new, weights, **kwargs)
+            else:
+                f_res = self._minimizer.fit(
+                    x_fit,
+                    y_new,
+                    weights=weights,
+                    tolerance=self._tolerance,
+                    max_evaluations=self._max_evaluations,
+                    **kwargs,
+                )
 
             # Postcompute
             fit_result = self._post_compute_reshaping(f_res, x, y)
@@ -258,6 +364,45 @@ class Fitter:
 
         return inner_fit_callable
 
+    def _fit_separable(self, x: np.ndarray, y: np.ndarray, weights: Optional[np.ndarray], **kwargs) -> FitResults:
+        """
+        Separable least squares fit. The minimizer varies the nonlinear parameters only and the linear parameters are
+        solved for in every evaluation of the fit function.
+        """
+        from .separable import VariableProjection
+
+        parameters = self._fit_object.get_fit_parameters()
+        # Bumps and DFO are given the uncertainties of the measured points, the other minimizers their inverse
+        residual_weights = weights
+        if weights is not None and self._enum_current_minimizer.package in ['bumps', 'dfo']:
+            residual_weights = 1 / np.asarray(weights)
+        projection = VariableProjection(self._fit_function, self._linear_parameters, y, residual_weights)
+
+        fit_function = self._fit_function
+        constraints = self._minimizer.fit_constraints()
+        with projection.linear_fixed():
+            if len(parameters) > len(self._linear_parameters):
+                self.fit_function = projection
+                self._minimizer.set_fit_constraint(constraints)
+                try:
+                    f_res = self._minimizer.fit(
+                        x,
+                        y,
+                        weights=weights,
+                        tolerance=self._tolerance,
+                        max_evaluations=self._max_evaluations,
+                        **kwargs,
+                    )
+                finally:
+                    self.fit_function = fit_function
+                    self._minimizer.set_fit_constraint(constraints)
+            else:
+                # Nothing is left for the minimizer
+                f_res = FitResults()
+                f_res.success = True
+                f_res.minimizer_engine = VariableProjection
+        return projection.finalize(x, f_res, parameters)
+
     @staticmethod
     def _precompute_reshaping(
         x: np.ndarray,
@@ -272,9 +417,9 @@ class Fitter:
         :param kwargs: Additional key-word arguments
         :return:
         """
-        # Make sure that they are np arrays
-        x_new = np.array(x)
-        y_new = np.array(y)
+        # Make sure that they are np arrays. Avoid copies, the data may be memory-mapped
+        x_new = np.asarray(x)
+        y_new = np.asarray(y)
         # Get the shape
         x_shape = x_new.shape
         # Check if the x data is 1D
@@ -298,11 +443,11 @@ class Fitter:
             if np.all(x_shape != y_new.shape):
                 raise ValueError('The shape of the x and y data must be the same')
             # It is 1D data
-            x_new = x.flatten()
+            x_new = np.ravel(x_new)
         # The optimizer needs a 1D array, flatten the y data
-        y_new = y_new.flatten()
+        y_new = np.ravel(y_new)
         if weights is not None:
-            weights = np.array(weights).flatten()
+            weights = np.ravel(weights)
         # Make a 'dummy' x array for the fit function
         x_for_fit = np.array(range(y_new.size))
         return x_for_fit, x_new, y_new, weights, x_shape
@@ -321,3 +466,13 @@ class Fitter:
         fit_result.y_calc = np.reshape(fit_result.y_calc, y.shape)
         fit_result.y_err = np.reshape(fit_result.y_err, y.shape)
         return fit_result
+
+
+def _evaluate_chunk(object_dict: dict, fit_function, x: np.ndarray, parameter_sets: np.ndarray) -> np.ndarray:
+    """
+    Evaluate a chunk of parameter vectors on a clone of the fit object. This runs in a worker process.
+    """
+    from .clone import decode_fit_task
+
+    fit_object, fit_function = decode_fit_task(object_dict, fit_function)
+    return Fitter(fit_object, fit_function).evaluate_batch(x, parameter_sets)
@@ -0,0 +1,235 @@
+#  SPDX-FileCopyrightText: 2023 EasyScience contributors  <core@easyscience.software>
+#  SPDX-License-Identifier: BSD-3-Clause
+#  © 2021-2023 Contributors to the EasyScience project <https://github.com/easyScience/EasyScience
+from typing import Callable
+from typing import List
+from typing import Optional
+
+import numpy as np
+
+from .fitter import Fitter
+from .minimizers import FitError
+from .minimizers import FitResults
+from .minimizers.minimizer_base import MINIMIZER_PARAMETER_PREFIX
+from .minimizers.utils import current_value
+
+
+class _FrameBuffer:
+    """
+    Growable storage for the points of all appended frames. The capacity is doubled when it runs out, so appending is
+    amortised O(frame size) and the stored points are always available as contiguous views.
+    """
+
+    def __init__(self):
+        self._x = None
+        self._y = None
+        self._weights = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def x(self) -> Optional[np.ndarray]:
+        return None if self._x is None else self._x[: self._size]
+
+    @property
+    def y(self) -> Optional[np.ndarray]:
+        return None if self._y is None else self._y[: self._size]
+
+    @property
+    def weights(self) -> Optional[np.ndarray]:
+        return None if self._weights is None else self._weights[: self._size]
+
+    def append(self, x: np.ndarray, y: np.ndarray, weights: Optional[np.ndarray]) -> None:
+        if self._y is not None and (weights is None) != (self._weights is None):
+            raise ValueError('Either all frames or none of them must have weights')
+        if self._x is not None and x.shape[1:] != self._x.shape[1:]:
+            raise ValueError(f'Expected points of shape {self._x.shape[1:]}, got {x.shape[1:]}')
+        size = self._size + y.size
+        if self._y is None or size > self._y.size:
+            capacity = max(size, 2 * (0 if self._y is None else self._y.size))
+            self._x = self._grow(self._x, capacity, x)
+            self._y = self._grow(self._y, capacity, y)
+            if weights is not None:
+                self._weights = self._grow(self._weights, capacity, weights)
+        self._x[self._size : size] = x
+        self._y[self._size : size] = y
+        if weights is not None:
+            self._weights[self._size : size] = weights
+        self._size = size
+
+    def _grow(self, array: Optional[np.ndarray], capacity: int, like: np.ndarray) -> np.ndarray:
+        grown = np.empty((capacity, *like.shape[1:]), dtype=np.result_type(like, np.float64))
+        if array is not None:
+            grown[: self._size] = array[: self._size]
+        return grown
+
+
+class IncrementalFitter(Fitter):
+    """
+    Extension of Fitter for data which arrive in frames, e.g. in an online analysis. Frames are appended to a
+    persistent buffer and every refit starts from the parameter values of the previous one.
+
+    If the model is linear in all its fit parameters, the weighted normal equations JᵀWJ and JᵀWr are accumulated
+    frame by frame instead. A refit is then a (n_pars x n_pars) solve and its cost does not grow with the data.
+    """
+
+    def __init__(self, fit_object, fit_function: Callable, linear: bool = False):
+        """
+        :param fit_object: EasyScience object which will be used as a model
+        :param fit_function: Function to be fitted
+        :param linear: Is the fit function linear in all the fit parameters?
+        """
+        super().__init__(fit_object, fit_function)
+        self._linear = linear
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget all appended frames.
+        """
+        self._buffer = _FrameBuffer()
+        self._last_result: Optional[FitResults] = None
+        # Linear models: reference parameter values and the accumulated sufficient statistics
+        self._reference = None
+        self._reference_names = None
+        self._normal_matrix = None
+        self._normal_vector = None
+        self._weighted_sum_of_squares = 0.0
+
+    @property
+    def linear(self) -> bool:
+        return self._linear
+
+    @property
+    def n_points(self) -> int:
+        """
+        Number of points appended so far.
+        """
+        return len(self._buffer)
+
+    @property
+    def last_result(self) -> Optional[FitResults]:
+        """
+        Results of the last refit.
+        """
+        return self._last_result
+
+    def append(self, x: np.ndarray, y: np.ndarray, weights: Optional[np.ndarray] = None) -> None:
+        """
+        Append a frame of data points.
+
+        :param x: points of the frame, (n_points,) or (n_points x n_dims)
+        :param y: measured values of the frame
+        :param weights: Weights for the measured values, the inverse of their uncertainties for every minimizer.
+            Without weights `1/sqrt(|y|)` is used for linear models, and the minimizer default otherwise.
+        """
+        y = np.ravel(y)
+        x = np.asarray(x)
+        x = x.reshape(y.size, *x.shape[1:]) if x.ndim > 1 else np.ravel(x)
+        if x.shape[0] != y.size:
+            raise ValueError('The number of elements in x and y data must be the same')
+        if weights is not None:
+            weights = np.ravel(weights)
+            if weights.size != y.size:
+                raise ValueError('The number of elements in y and weights must be the same')
+        self._buffer.append(x, y, weights)
+        if self._linear:
+            self._accumulate(x, y, weights)
+
+    def _accumulate(self, x: np.ndarray, y: np.ndarray, weights: Optional[np.ndarray]) -> None:
+        """
+        Add the frame to the weighted normal equations, linearised around the reference parameter values.
+        """
+        if self._reference is None:
+            # The minimizer caches the fit parameters, they may have changed since it was made
+            self._update_minimizer(self._enum_current_minimizer)
+            parameters = self._parameters()
+            self._reference = np.array([current_value(parameter) for parameter in parameters])
+            self._reference_names = [parameter.unique_name for parameter in parameters]
+        self._check_parameters()
+        if weights is None:
+            weights = 1 / np.sqrt(np.abs(y))
+        reference_y, jacobian = self.design_matrix(x, self._reference)
+        weighted_jacobian = jacobian * weights[:, np.newaxis]
+        weighted_residual = (y - reference_y) * weights
+        if self._normal_matrix is None:
+            self._normal_matrix = np.zeros((jacobian.shape[1], jacobian.shape[1]))
+            self._normal_vector = np.zeros(jacobian.shape[1])
+        self._normal_matrix += weighted_jacobian.T @ weighted_jacobian
+        self._normal_vector += weighted_jacobian.T @ weighted_residual
+        self._weighted_sum_of_squares += weighted_residual @ weighted_residual
+
+    def refit(self, full_output: bool = True, **kwargs) -> FitResults:
+        """
+        Fit the model to all frames appended so far, starting from the current parameter values.
+
+        :param full_output: Should the model be evaluated at all points to fill `y_calc` of the results? For linear
+            models this is the only step which depends on the number of points.
+        :param kwargs: Additional arguments for the minimizer. Only used for non-linear models
+        :return: Fit results
+        """
+        if not len(self._buffer):
+            raise FitError('No data has been appended')
+        if self._linear:
+            result = self._refit_linear(full_output)
+        else:
+            weights = self._buffer.weights
+            if weights is not None and self._enum_current_minimizer.package in ['bumps', 'dfo']:
+                # Bumps and DFO are given the uncertainties of the measured points
+                weights = 1 / weights
+            result = self.fit(self._buffer.x, self._buffer.y, weights=weights, **kwargs)
+        self._last_result = result
+        return result
+
+    def _check_parameters(self) -> None:
+        if [parameter.unique_name for parameter in self._parameters()] != self._reference_names:
+            raise FitError('The fit parameters have changed since the first frame, the fitter has to be reset')
+
+    def _refit_linear(self, full_output: bool) -> FitResults:
+        self._check_parameters()
+        parameters = self._parameters()
+        n_points = len(self._buffer)
+        delta, *_ = np.linalg.lstsq(self._normal_matrix, self._normal_vector, rcond=None)
+        values = self._reference + delta
+        chi2 = self._weighted_sum_of_squares - 2 * delta @ self._normal_vector + delta @ self._normal_matrix @ delta
+        try:
+            covariance = np.linalg.inv(self._normal_matrix)
+        except np.linalg.LinAlgError:
+            covariance = None
+        if covariance is not None and n_points > len(parameters):
+            covariance *= max(chi2, 0.0) / (n_points - len(parameters))
+        errors = np.zeros(len(parameters)) if covariance is None else np.sqrt(np.abs(np.diag(covariance)))
+
+        names = [MINIMIZER_PARAMETER_PREFIX + parameter.unique_name for parameter in parameters]
+        result = FitResults()
+        result.success = True
+        result.minimizer_engine = self.__class__
+        result.p0 = {name: current_value(parameter) for name, parameter in zip(names, parameters)}
+        self._apply_values(parameters, values, errors)
+        result.p = {name: current_value(parameter) for name, parameter in zip(names, parameters)}
+        result.set_covariance(covariance)
+        if full_output:
+            result.x = self._buffer.x
+            result.y_obs = self._buffer.y
+            result.y_calc = np.ravel(self.evaluate_batch(self._buffer.x, np.atleast_2d(values))[0])
+            weights = self._buffer.weights
+            result.y_err = np.sqrt(np.abs(self._buffer.y)) if weights is None else 1 / weights
+        return result
+
+    def _parameters(self) -> List:
+        return self._fit_object.get_fit_parameters()
+
+    @staticmethod
+    def _apply_values(parameters: List, values: np.ndarray, errors: np.ndarray) -> None:
+        from easyscience import global_object
+
+        stack_status = global_object.stack.enabled
+        if stack_status:
+            global_object.stack.beginMacro('Incremental fitting routine')
+        for parameter, value, error in zip(parameters, values, errors):
+            parameter.value = value
+            parameter.error = error
+        if stack_status:
+            global_object.stack.endMacro()
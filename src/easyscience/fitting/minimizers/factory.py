@@ -3,6 +3,7 @@ from typing import Callable
 from .. import available_minimizers
 from ..available_minimizers import AvailableMinimizers
 from .minimizer_base import MinimizerBase
+from .minimizer_linear import Linear
 
 if available_minimizers.lmfit_engine_available:
     from .minimizer_lmfit import LMFit
@@ -22,4 +23,7 @@ def factory(minimizer_enum: AvailableMinimizers, fit_object, fit_function: Calla
     elif minimizer_enum.package == 'dfo':
         minimizer = DFO(obj=fit_object, fit_function=fit_function, minimizer_enum=minimizer_enum)
 
+    elif minimizer_enum.package == 'linear':
+        minimizer = Linear(obj=fit_object, fit_function=fit_function, minimizer_enum=minimizer_enum)
+
     return minimizer
@@ -21,10 +21,13 @@ from easyscience.Constraints import ObjConstraint
 # causes circular import when Parameter is imported
 # from easyscience.Objects.ObjectClasses import BaseObj
 from easyscience.Objects.new_variable import Parameter
+from easyscience.Objects.new_variable.descriptor_array import ParameterArrayElement
 
 from ..available_minimizers import AvailableMinimizers
+from .utils import EvaluationCache
 from .utils import FitError
 from .utils import FitResults
+from .utils import current_value
 
 MINIMIZER_PARAMETER_PREFIX = 'p'
 
@@ -53,6 +56,7 @@ class MinimizerBase(metaclass=ABCMeta):
         self._cached_model = None
         self._fit_function = None
         self._constraints = []
+        self._evaluation_cache: Optional[EvaluationCache] = None
 
     @property
     def all_constraints(self) -> List[ObjConstraint]:
@@ -66,6 +70,40 @@ class MinimizerBase(metaclass=ABCMeta):
     def name(self) -> str:
         return self._minimizer_enum.name
 
+    @property
+    def evaluation_cache(self) -> Optional[EvaluationCache]:
+        """
+        Cache of model evaluations used by the wrapped fit function, `None` if caching is disabled.
+        """
+        return self._evaluation_cache
+
+    @evaluation_cache.setter
+    def evaluation_cache(self, cache: Optional[EvaluationCache]) -> None:
+        if cache is not None and not isinstance(cache, EvaluationCache):
+            raise TypeError('cache must be an EvaluationCache or None')
+        self._evaluation_cache = cache
+
+    def enable_evaluation_cache(self, maxsize: int = 128) -> EvaluationCache:
+        """
+        Cache model evaluations so that parameter vectors which are revisited during a fit are not recalculated.
+
+        :param maxsize: Maximum number of evaluations which are kept
+        :return: The evaluation cache
+        """
+        self._evaluation_cache = EvaluationCache(maxsize)
+        return self._evaluation_cache
+
+    def disable_evaluation_cache(self) -> None:
+        self._evaluation_cache = None
+
+    def _clear_evaluation_cache(self) -> None:
+        """
+        Discard the cached evaluations, which only stay valid while the fit object does not change outside the fit
+        parameters.
+        """
+        if self._evaluation_cache is not None:
+            self._evaluation_cache.clear()
+
     def fit_constraints(self) -> List[ObjConstraint]:
         return self._constraints
 
@@ -130,11 +168,141 @@ class MinimizerBase(metaclass=ABCMeta):
         if self._fit_function is None:
             # This will also generate self._cached_pars
             self._fit_function = self._generate_fit_function()
+        else:
+            # The fixed parameters or the calculator may have changed since the last call
+            self._clear_evaluation_cache()
 
         minimizer_parameters = self._prepare_parameters(minimizer_parameters)
 
         return self._fit_function(x, **minimizer_parameters, **kwargs)
 
+    def evaluate_batch(self, x: np.ndarray, parameter_sets: np.ndarray, chunk_size: Optional[int] = None) -> np.ndarray:
+        """
+        Evaluate the fit function for many parameter vectors at once. If the fit function is the fit object, it
+        declares a vectorized `batch_call(x, parameter_sets)` and there are no fit constraints, that is used. Otherwise
+        the parameter vectors are evaluated one by one. The parameters of the fit object are restored afterwards and no
+        undo entries are made.
+
+        :param x: x values for which the fit function will be evaluated
+        :type x: np.ndarray
+        :param parameter_sets: (n_sets x n_pars) array with the columns in the order of `get_fit_parameters`
+        :type parameter_sets: np.ndarray
+        :param chunk_size: Maximum number of parameter vectors passed to `batch_call` at once
+        :return: (n_sets x ...) array, the fit function result for every parameter vector
+        :rtype: np.ndarray
+        """
+        if self._fit_function is None:
+            # This will also generate self._cached_pars
+            self._fit_function = self._generate_fit_function()
+        else:
+            # The fixed parameters or the calculator may have changed since the last call
+            self._clear_evaluation_cache()
+        parameter_sets = np.atleast_2d(np.asarray(parameter_sets, dtype=np.float64))
+        if parameter_sets.ndim != 2 or parameter_sets.shape[1] != len(self._cached_pars):
+            raise ValueError(f'parameter_sets must have shape (n_sets, {len(self._cached_pars)})')
+        n_sets = parameter_sets.shape[0]
+        if chunk_size is None:
+            chunk_size = max(n_sets, 1)
+
+        from easyscience import global_object
+
+        stack_status = global_object.stack.enabled
+        batch_call = self._batch_call()
+        if batch_call is not None:
+            global_object.stack.enabled = False
+            try:
+                chunks = [batch_call(x, parameter_sets[start : start + chunk_size]) for start in range(0, n_sets, chunk_size)]
+            finally:
+                global_object.stack.enabled = stack_status
+            return np.concatenate(chunks)
+
+        global_object.stack.enabled = False
+        original_values = self._prepare_parameters({})
+        names = list(original_values.keys())
+        results = None
+        try:
+            for index, values in enumerate(parameter_sets):
+                y = np.asarray(self._fit_function(x, **dict(zip(names, values))))
+                if results is None:
+                    results = np.empty((n_sets, *y.shape), dtype=y.dtype)
+                results[index] = y
+        finally:
+            self._restore_parameters(original_values)
+            global_object.stack.enabled = stack_status
+        return results
+
+    def _batch_call(self) -> Optional[Callable]:
+        """
+        The vectorized evaluation declared by the fit object, if the fit function is the fit object itself. It is not
+        used with fit constraints, which have to be applied to every parameter vector in turn.
+        """
+        batch_call = getattr(self._object, 'batch_call', None)
+        if batch_call is None or self.fit_constraints():
+            return None
+        func = self._original_fit_function
+        if func is self._object or (getattr(func, '__self__', None) is self._object and func.__name__ == '__call__'):
+            return batch_call
+        return None
+
+    def design_matrix(self, x: np.ndarray, values: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate the fit function and its derivatives with respect to the fit parameters, by stepping every parameter
+        in turn within its bounds. For a model which is linear in its parameters the derivatives are exact and form
+        the design matrix, so that `f(p) = f(values) + J (p - values)`. The parameters are not altered.
+
+        :param x: x values for which the fit function will be evaluated
+        :type x: np.ndarray
+        :param values: parameter values in the order of `get_fit_parameters`, the current values if not given
+        :type values: np.ndarray
+        :return: flat fit function values at `values` and the (n_points x n_pars) design matrix
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        if self._fit_function is None:
+            # This will also generate self._cached_pars
+            self._fit_function = self._generate_fit_function()
+        else:
+            # The fixed parameters or the calculator may have changed since the last call
+            self._clear_evaluation_cache()
+        parameters = list(self._cached_pars.values())
+        if values is None:
+            values = list(self._prepare_parameters({}).values())
+        values = np.asarray(values, dtype=np.float64)
+        steps = self._design_steps(parameters, values)
+        results = self.evaluate_batch(x, np.vstack([values, values + np.diag(steps)]))
+        results = results.reshape(len(parameters) + 1, -1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            jacobian = np.where(steps != 0, (results[1:] - results[0]).T / steps, 0.0)
+        return results[0], jacobian
+
+    @staticmethod
+    def _design_steps(parameters: List, values: np.ndarray) -> np.ndarray:
+        """
+        A step of about the size of every value, in the direction which keeps the parameter within its bounds.
+        """
+        steps = np.maximum(np.abs(values), 1.0)
+        for index, (parameter, value) in enumerate(zip(parameters, values)):
+            step = steps[index]
+            if value + step <= parameter.max:
+                continue
+            if value - step >= parameter.min:
+                steps[index] = -step
+            elif parameter.max - value >= value - parameter.min:
+                steps[index] = parameter.max - value
+            else:
+                steps[index] = parameter.min - value
+        return steps
+
+    def _restore_parameters(self, values: dict[str, float]) -> None:
+        """
+        Set the fit parameters back to the values from `_prepare_parameters` and re-apply the fit constraints.
+        """
+        for name, parameter in self._cached_pars.items():
+            value = values[MINIMIZER_PARAMETER_PREFIX + str(name)]
+            if current_value(parameter) != value:
+                parameter.value = value
+        for constraint in self.fit_constraints():
+            constraint()
+
     def _get_method_kwargs(self, passed_method: Optional[str] = None) -> dict[str, str]:
         if passed_method is not None:
             if passed_method not in self.supported_methods():
@@ -217,6 +385,10 @@ class MinimizerBase(metaclass=ABCMeta):
             key = parameter.unique_name
             self._cached_pars[key] = parameter
             self._cached_pars_vals[key] = (parameter.value, parameter.error)
+        # Cached evaluations belong to the previous wrapper
+        self._clear_evaluation_cache()
+        # Parameter changes for a batched calculator interface are pushed in one call before each evaluation
+        flush_bindings = self._bindings_flush()
 
         # Make a new fit function
         def _fit_function(x: np.ndarray, **kwargs):
@@ -232,11 +404,18 @@ class MinimizerBase(metaclass=ABCMeta):
             # Update the `Parameter` values and the callback if needed
             # TODO THIS IS NOT THREAD SAFE :-(
 
+            # The elements of a ParameterArray are written in one go per array
+            array_values = {}
             for name, value in kwargs.items():
                 par_name = name[1:]
                 if par_name in self._cached_pars.keys():
+                    parameter = self._cached_pars[par_name]
+                    if isinstance(parameter, ParameterArrayElement):
+                        indices, values = array_values.setdefault(id(parameter._array), (parameter._array, [], []))[1:]
+                        indices.append(parameter._index)
+                        values.append(value)
                     # TODO clean when full move to new_variable
-                    if isinstance(self._cached_pars[par_name], Parameter):
+                    elif isinstance(self._cached_pars[par_name], Parameter):
                         # This will take into account constraints
                         if self._cached_pars[par_name].value != value:
                             self._cached_pars[par_name].value = value
@@ -246,16 +425,43 @@ class MinimizerBase(metaclass=ABCMeta):
                             self._cached_pars[par_name].value = value
 
                     # Since we are calling the parameter fset will be called.
+            for array, indices, values in array_values.values():
+                array.set_flat_values(indices, values)
             # TODO Pre processing here
             for constraint in self.fit_constraints():
                 constraint()
-            return_data = func(x)
+
+            cache = self._evaluation_cache
+            if cache is None:
+                flush_bindings()
+                return func(x)
+            values = []
+            for par_name, parameter in self._cached_pars.items():
+                value = kwargs.get(MINIMIZER_PARAMETER_PREFIX + par_name, None)
+                if value is None:
+                    value = current_value(parameter)
+                values.append(value)
+            key = cache.make_key(x, values)
+            return_data = cache.get(key, x)
+            if return_data is None:
+                flush_bindings()
+                return_data = func(x)
+                cache.put(key, x, return_data)
             # TODO Loading or manipulating data here
             return return_data
 
         _fit_function.__signature__ = self._create_signature(self._cached_pars)
         return _fit_function
 
+    def _bindings_flush(self) -> Callable:
+        """
+        The `flush` of the fit object's interface, or a no-op if the interface does not batch parameter changes.
+        """
+        interface = getattr(self._object, 'interface', None)
+        if not getattr(interface, 'batched', False):
+            return lambda: None
+        return interface.flush
+
     @staticmethod
     def _create_signature(parameters: Dict[int, Parameter]) -> Signature:
         """
@@ -284,16 +490,34 @@ class MinimizerBase(metaclass=ABCMeta):
             )
         return Signature(wrapped_parameters)
 
+    @staticmethod
+    def _covariance_from_jacobian(jacobian: np.ndarray, residuals: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Parameter covariance from the Jacobian of the weighted residuals at the solution, scaled by the reduced chi2.
+        Only (n_pars x n_pars) matrices are formed, so the memory use is O(n_points * n_pars).
+
+        :param jacobian: (n_points x n_pars) Jacobian of the weighted residuals
+        :param residuals: weighted residuals at the solution
+        :return: (n_pars x n_pars) covariance matrix or None if the Jacobian is singular
+        """
+        n_points, n_pars = jacobian.shape
+        try:
+            covariance = np.linalg.inv(np.dot(jacobian.T, jacobian))
+        except np.linalg.LinAlgError:
+            return None
+        if n_points > n_pars:
+            covariance *= np.dot(residuals, residuals) / (n_points - n_pars)
+        return covariance
+
     @staticmethod
     def _error_from_jacobian(jacobian: np.ndarray, residuals: np.ndarray, confidence: float = 0.95) -> np.ndarray:
         from scipy import stats
 
         JtJi = np.linalg.inv(np.dot(jacobian.T, jacobian))
+        # J^T diag(r^2) J without building the (n_points x n_points) diagonal matrix
+        JtR2J = np.dot((jacobian * (residuals**2)[:, np.newaxis]).T, jacobian)
         # 1.96 is a 95% confidence value
-        error_matrix = np.dot(
-            JtJi,
-            np.dot(jacobian.T, np.dot(np.diag(residuals**2), np.dot(jacobian, JtJi))),
-        )
+        error_matrix = np.dot(JtJi, np.dot(JtR2J, JtJi))
 
         z = 1 - ((1 - confidence) / 2)
         z = stats.norm.pdf(z)
@@ -3,13 +3,16 @@
 #  © 2021-2023 Contributors to the EasyScience project <https://github.com/easyScience/EasyScience
 
 import copy
+import multiprocessing
+import warnings
 from typing import Callable
 from typing import List
 from typing import Optional
 
 import numpy as np
 from bumps.fitters import FIT_AVAILABLE_IDS
-from bumps.fitters import fit as bumps_fit
+from bumps.fitters import FITTERS
+from bumps.fitters import FitDriver
 from bumps.names import Curve
 from bumps.names import FitProblem
 from bumps.parameter import Parameter as BumpsParameter
@@ -23,12 +26,79 @@ from .minimizer_base import MINIMIZER_PARAMETER_PREFIX
 from .minimizer_base import MinimizerBase
 from .utils import FitError
 from .utils import FitResults
+from .utils import PosteriorSamples
 
 FIT_AVAILABLE_IDS_FILTERED = copy.copy(FIT_AVAILABLE_IDS)
 # Considered experimental
 FIT_AVAILABLE_IDS_FILTERED.remove('pt')
 
 
+def bumps_fit(problem: FitProblem, method: str = 'amoeba', verbose: bool = False, **options):
+    """
+    Run a bumps fitter in the same way as `bumps.fitters.fit`, but keep the covariance matrix the fit driver
+    computes for the standard errors, rather than recalculating it afterwards.
+
+    :param problem: bumps fit problem
+    :param method: bumps fitter id
+    :param verbose: Should the progress and the final chisq and errors be printed?
+    :param options: options for the fit driver and fitter
+    :return: result with the best parameters `x`, their errors `dx` and the unscaled covariance `cov`
+    """
+    from scipy.optimize import OptimizeResult
+
+    fitclass = next((fitter for fitter in FITTERS if fitter.id == method), None)
+    if fitclass is None:
+        raise ValueError(f'Unknown method {method}, not one of {FIT_AVAILABLE_IDS}')
+    # The default monitors of the fit driver print the progress
+    monitors = None if verbose else []
+    driver = FitDriver(fitclass=fitclass, problem=problem, monitors=monitors, **options)
+    driver.clip()
+    x, fx = driver.fit()
+    problem.setp(x)
+    if verbose:
+        print('final chisq', problem.chisq_str())
+        driver.show_err()
+    result = OptimizeResult(x=x, dx=driver.stderr(), fun=fx, success=True, status=0, message='successful termination')
+    if hasattr(driver.fitter, 'state'):
+        # The sampled state gives the covariance directly, numerical derivatives would only cost evaluations
+        result.state = driver.fitter.state
+    else:
+        result.cov = driver.cov()
+    return result
+
+
+# Fit problem of a population worker process, set when the worker is forked
+_WORKER_PROBLEM = None
+
+
+def _init_worker(problem: FitProblem) -> None:
+    global _WORKER_PROBLEM
+    _WORKER_PROBLEM = problem
+
+
+def _worker_nllf(point: np.ndarray) -> float:
+    return _WORKER_PROBLEM.nllf(point)
+
+
+class _PoolMapper:
+    """
+    Bumps mapper which evaluates a population on a pool of forked processes.
+    Forking hands every worker its own copy of the fit problem (and so of the EasyScience model) without pickling it,
+    which is not possible for the wrapped fit function.
+    """
+
+    def __init__(self, problem: FitProblem, workers: Optional[int] = None):
+        context = multiprocessing.get_context('fork')
+        self._pool = context.Pool(workers, _init_worker, (problem,))
+
+    def __call__(self, points: np.ndarray) -> List[float]:
+        return self._pool.map(_worker_nllf, points)
+
+    def close(self) -> None:
+        self._pool.terminate()
+        self._pool.join()
+
+
 class Bumps(MinimizerBase):
     """
     This is a wrapper to Bumps: https://bumps.readthedocs.io/
@@ -63,7 +133,7 @@ class Bumps(MinimizerBase):
     @staticmethod
     def supported_methods() -> List[str]:
         # only a small subset
-        methods = ['scipy.leastsq', 'amoeba', 'newton', 'lm']
+        methods = ['scipy.leastsq', 'amoeba', 'newton', 'lm', 'dream']
         return methods
 
     def fit(
@@ -145,6 +215,66 @@ class Bumps(MinimizerBase):
             raise FitError(e)
         return results
 
+    def sample(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        samples: int = 10000,
+        burn: int = 100,
+        population: int = 10,
+        thin: int = 1,
+        workers: Optional[int] = None,
+        samples_path: Optional[str] = None,
+        minimizer_kwargs: Optional[dict] = None,
+        **kwargs,
+    ) -> FitResults:
+        """
+        Sample the posterior distribution of the parameters with DREAM. The parameters are set to the best draw
+        and their errors to half the 68% interval of the draws.
+
+        :param x: points to be calculated at
+        :type x: np.ndarray
+        :param y: measured points
+        :type y: np.ndarray
+        :param weights: Weights for supplied measured points
+        :type weights: np.ndarray
+        :param samples: Number of draws
+        :param burn: Number of burn-in generations
+        :param population: Population size per parameter
+        :param thin: Keep every nth generation
+        :param workers: Number of processes evaluating the population. `None` uses all cores, 1 evaluates in this process
+        :param samples_path: Optional `.npy` file the draws are written to and memory-mapped from after sampling.
+            DREAM keeps its chains in memory while it samples, so this does not bound the memory used.
+        :param minimizer_kwargs: Additional arguments for the DREAM fitter
+        :param kwargs: Additional arguments for the fitting function.
+        :return: Fit results with the draws in `posterior`
+        :rtype: FitResults
+        """
+        if weights is None:
+            weights = np.sqrt(np.abs(y))
+        if minimizer_kwargs is None:
+            minimizer_kwargs = {}
+        minimizer_kwargs.update({'samples': samples, 'burn': burn, 'pop': population, 'thin': thin})
+
+        model = self._make_model()(x, y, weights)
+        mapper = None
+        if workers != 1:
+            if 'fork' in multiprocessing.get_all_start_methods():
+                mapper = _PoolMapper(FitProblem(model), workers)
+                minimizer_kwargs['mapper'] = mapper
+            else:
+                warnings.warn('Parallel population evaluation needs the fork start method, sampling serially', stacklevel=2)
+        try:
+            results = self.fit(x, y, weights=weights, model=model, method='dream', minimizer_kwargs=minimizer_kwargs, **kwargs)
+        finally:
+            if mapper is not None:
+                mapper.close()
+
+        draw = results.engine_result.state.draw()
+        results.posterior = PosteriorSamples(draw.labels, draw.points, draw.logp, path=samples_path)
+        return results
+
     def convert_to_pars_obj(self, par_list: Optional[List] = None) -> List[BumpsParameter]:
         """
         Create a container with the `Parameters` converted from the base object.
@@ -192,6 +322,7 @@ class Bumps(MinimizerBase):
         :rtype: Callable
         """
         fit_func = self._generate_fit_function()
+        self._fit_function = fit_func
 
         def _outer(obj):
             def _make_func(x, y, weights):
@@ -234,6 +365,24 @@ class Bumps(MinimizerBase):
         if stack_status:
             global_object.stack.endMacro()
 
+    @staticmethod
+    def _covariance_from_result(fit_results, reduced_chi: float) -> Optional[np.ndarray]:
+        """
+        Covariance of the parameters, from the draws of a sampler or from the Jacobian the fit driver already
+        evaluated for the errors. The latter is scaled by the reduced chi2 to match the other minimizers.
+
+        :param fit_results: result of `bumps_fit`
+        :param reduced_chi: reduced chi2 of the fit
+        :return: covariance matrix in the order of the problem parameters or None
+        """
+        state = fit_results.get('state')
+        if state is not None:
+            return np.atleast_2d(np.cov(state.draw().points, rowvar=False))
+        covariance = fit_results.get('cov')
+        if covariance is None:
+            return None
+        return covariance * reduced_chi
+
     def _gen_fit_results(self, fit_results, **kwargs) -> FitResults:
         """
         Convert fit results into the unified `FitResults` format
@@ -265,6 +414,7 @@ class Bumps(MinimizerBase):
         results.y_obs = self._cached_model.y
         results.y_calc = self.evaluate(results.x, minimizer_parameters=results.p)
         results.y_err = self._cached_model.dy
+        results.set_covariance(self._covariance_from_result(fit_results, results.reduced_chi))
         # results.residual = results.y_obs - results.y_calc
         # results.goodness_of_fit = np.sum(results.residual**2)
         results.minimizer_engine = self.__class__
@@ -142,6 +142,7 @@ class DFO(MinimizerBase):
         :rtype: Callable
         """
         fit_func = self._generate_fit_function()
+        self._fit_function = fit_func
 
         def _outer(obj: DFO):
             def _make_func(x, y, weights):
@@ -229,6 +230,7 @@ class DFO(MinimizerBase):
         results.y_obs = self._cached_model.y
         results.y_calc = self.evaluate(results.x, minimizer_parameters=results.p)
         results.y_err = weights
+        results.set_covariance(self._covariance_from_jacobian(fit_results.jacobian, fit_results.resid))
         # results.residual = results.y_obs - results.y_calc
         # results.goodness_of_fit = fit_results.f
 
@@ -0,0 +1,263 @@
+#  SPDX-FileCopyrightText: 2023 EasyScience contributors  <core@easyscience.software>
+#  SPDX-License-Identifier: BSD-3-Clause
+#  © 2021-2023 Contributors to the EasyScience project <https://github.com/easyScience/EasyScience
+
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+
+# causes circular import when Parameter is imported
+# from easyscience.Objects.ObjectClasses import BaseObj
+from easyscience.Objects.new_variable import Parameter
+
+from ..available_minimizers import AvailableMinimizers
+from .minimizer_base import MINIMIZER_PARAMETER_PREFIX
+from .minimizer_base import MinimizerBase
+from .utils import FitError
+from .utils import FitResults
+from .utils import current_value
+
+# Largest deviation from linearity, relative to the model values, for a model which does not declare itself linear
+LINEARITY_TOLERANCE = 1e-8
+
+
+class Linear(MinimizerBase):
+    """
+    Closed form weighted least squares for models which are linear in their fit parameters, e.g. `Polynomial` and
+    `Line`. The design matrix is built once from `len(parameters) + 1` model evaluations and the normal equations are
+    solved directly with an SVD or a QR decomposition, so no iterations are needed.
+
+    A model declares its linearity with a truthy `linear` attribute, in which case the fit function has to be the
+    model itself. Otherwise the linearity is checked numerically with one additional evaluation.
+    """
+
+    package = 'linear'
+
+    def __init__(
+        self,
+        obj,  #: BaseObj,
+        fit_function: Callable,
+        minimizer_enum: Optional[AvailableMinimizers] = None,
+    ):  # todo after constraint changes, add type hint: obj: BaseObj  # noqa: E501
+        """
+        Initialize the fitting engine with a `BaseObj` and an arbitrary fitting function.
+
+        :param obj: Object containing elements of the `Parameter` class
+        :type obj: BaseObj
+        :param fit_function: function that when called returns y values. 'x' must be the first
+                            and only positional argument. Additional values can be supplied by
+                            keyword/value pairs
+        :type fit_function: Callable
+        """
+        super().__init__(obj=obj, fit_function=fit_function, minimizer_enum=minimizer_enum)
+        self._p_0 = {}
+
+    @staticmethod
+    def supported_methods() -> List[str]:
+        return ['svd', 'qr']
+
+    @staticmethod
+    def all_methods() -> List[str]:
+        return ['svd', 'qr']
+
+    def fit(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        model: Optional[Callable] = None,
+        parameters: Optional[List[Parameter]] = None,
+        method: Optional[str] = None,
+        tolerance: Optional[float] = None,
+        max_evaluations: Optional[int] = None,
+        **kwargs,
+    ) -> FitResults:
+        """
+        Perform a linear least squares fit. Parameters outside of their bounds after the unconstrained solve are
+        handled with a bounded linear least squares solve.
+
+        :param x: points to be calculated at
+        :type x: np.ndarray
+        :param y: measured points
+        :type y: np.ndarray
+        :param weights: Weights for supplied measured points
+        :type weights: np.ndarray
+        :param model: Not used, the design matrix is the model
+        :param parameters: Not used, all fit parameters are fitted
+        :param method: Method for the solve, `svd` or `qr`
+        :type method: str
+        :param tolerance: Largest relative deviation from linearity for models which do not declare it
+        :param max_evaluations: Not used, a linear fit needs `len(parameters) + 2` evaluations at most
+        :return: Fit results
+        :rtype: FitResults
+        """
+        method = self._get_method_kwargs(method).get('method', 'svd')
+        if tolerance is None:
+            tolerance = LINEARITY_TOLERANCE
+        y = np.asarray(y)
+        if weights is None:
+            weights = 1 / np.sqrt(np.abs(y))
+        weights = np.ravel(weights)
+
+        # Why do we do this? Because a fitting template has to have global_object instantiated outside pre-runtime
+        from easyscience import global_object
+
+        stack_status = global_object.stack.enabled
+        global_object.stack.enabled = False
+
+        try:
+            values, reference_y, design = self._linearise(x, tolerance)
+            self._p_0 = {f'p{key}': value for key, value in zip(self._cached_pars.keys(), values)}
+            weighted_design = design * weights[:, np.newaxis]
+            weighted_residual = (np.ravel(y) - reference_y) * weights
+            delta, success = self._solve(weighted_design, weighted_residual, values, method)
+            residuals = weighted_residual - weighted_design @ delta
+            covariance = self._covariance_from_jacobian(weighted_design, residuals)
+            self._set_parameter_fit_result(values + delta, covariance, stack_status)
+        except Exception as e:
+            for key in self._cached_pars.keys():
+                self._cached_pars[key].value = self._cached_pars_vals[key][0]
+            global_object.stack.enabled = stack_status
+            raise FitError(e)
+
+        results = FitResults()
+        results.success = success
+        results.p = {MINIMIZER_PARAMETER_PREFIX + key: current_value(par) for key, par in self._cached_pars.items()}
+        results.p0 = self._p_0
+        results.x = x
+        results.y_obs = y
+        # The model is linear, so this is the model at the solution without evaluating it again
+        results.y_calc = np.reshape(reference_y + design @ delta, y.shape)
+        results.y_err = 1 / weights
+        results.set_covariance(covariance)
+        results.minimizer_engine = self.__class__
+        results.fit_args = None
+        return results
+
+    def convert_to_pars_obj(self, par_list: Optional[list] = None):
+        """
+        Required by interface but not needed for linear least squares
+        """
+        pass
+
+    @staticmethod
+    def convert_to_par_object(obj) -> None:
+        """
+        Required by interface but not needed for linear least squares
+        """
+        pass
+
+    def declares_linear(self) -> bool:
+        """
+        Does the fit object declare that its fit function is linear in the fit parameters?
+        """
+        func = self._original_fit_function
+        # The Fitter wraps the fit function to reshape its input and output, which keeps it linear
+        func = getattr(func, '__wrapped__', func)
+        if func is not self._object and not (getattr(func, '__self__', None) is self._object and func.__name__ == '__call__'):
+            return False
+        return bool(getattr(self._object, 'linear', False))
+
+    def _linearise(self, x: np.ndarray, tolerance: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build the design matrix at the current parameter values and make sure the model is linear.
+
+        :return: current parameter values, model values at them and the (n_points x n_pars) design matrix
+        """
+        self._fit_function = self._generate_fit_function()
+        if not self._cached_pars:
+            raise FitError('There are no fit parameters')
+        values = np.array(list(self._prepare_parameters({}).values()), dtype=np.float64)
+        reference_y, design = self.design_matrix(x, values)
+        if not np.all(np.isfinite(design)) or not np.all(np.isfinite(reference_y)):
+            raise FitError('The fit function is not finite at the current parameter values')
+        if not self.declares_linear():
+            # A model which is linear in every parameter is exactly predicted half way to the design points
+            steps = self._design_steps(list(self._cached_pars.values()), values) / 2
+            probe = np.ravel(self.evaluate_batch(x, values + steps))
+            scale = max(np.max(np.abs(reference_y), initial=0.0), np.max(np.abs(probe), initial=0.0))
+            if np.max(np.abs(probe - reference_y - design @ steps), initial=0.0) > tolerance * scale:
+                raise FitError('The fit function is not linear in the fit parameters')
+        return values, reference_y, design
+
+    def _solve(self, design: np.ndarray, residual: np.ndarray, values: np.ndarray, method: str) -> Tuple[np.ndarray, bool]:
+        lower = np.array([par.min for par in self._cached_pars.values()], dtype=np.float64)
+        upper = np.array([par.max for par in self._cached_pars.values()], dtype=np.float64)
+        return solve_linear_least_squares(design, residual, values, lower, upper, method)
+
+    def _set_parameter_fit_result(self, values: np.ndarray, covariance: Optional[np.ndarray], stack_status: bool) -> None:
+        """
+        Update parameters to their final values and assign a std error to them.
+
+        :param values: fitted parameter values
+        :param covariance: parameter covariance, the errors are zero if it is not available
+        :param stack_status: Was the undo stack enabled before the fit?
+        """
+        from easyscience import global_object
+
+        pars = self._cached_pars
+        if stack_status:
+            for name in pars.keys():
+                pars[name].value = self._cached_pars_vals[name][0]
+                pars[name].error = self._cached_pars_vals[name][1]
+            global_object.stack.enabled = True
+            global_object.stack.beginMacro('Fitting routine')
+
+        errors = np.zeros(len(pars)) if covariance is None else np.sqrt(np.abs(np.diag(covariance)))
+        for par, value, error in zip(pars.values(), values, errors):
+            par.value = value
+            par.error = error
+
+        if stack_status:
+            global_object.stack.endMacro()
+
+
+def solve_linear_least_squares(
+    design: np.ndarray,
+    residual: np.ndarray,
+    values: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    method: str = 'svd',
+) -> Tuple[np.ndarray, bool]:
+    """
+    Solve the weighted linear least squares problem `design @ delta ~ residual` for the change of the parameters. The
+    columns are normalised first, as the columns of e.g. a polynomial design matrix differ by orders of magnitude. If
+    the solution leaves the bounds, the bounded problem is solved instead.
+
+    :param design: (n_points x n_pars) weighted design matrix
+    :param residual: weighted residuals at `values`
+    :param values: current parameter values, within the bounds
+    :param lower: lower parameter bounds
+    :param upper: upper parameter bounds
+    :param method: `svd` or `qr`
+    :return: parameter change and whether the solve succeeded
+    """
+    norms = np.linalg.norm(design, axis=0)
+    norms[norms == 0] = 1.0
+    scaled = design / norms
+    if method == 'qr':
+        from scipy.linalg import solve_triangular
+
+        q, r = np.linalg.qr(scaled)
+        diagonal = np.abs(np.diag(r))
+        if np.any(diagonal <= np.finfo(np.float64).eps * max(scaled.shape) * np.max(diagonal, initial=0.0)):
+            raise FitError('The design matrix is rank deficient, use the svd method')
+        delta = solve_triangular(r, q.T @ residual)
+    else:
+        delta = np.linalg.lstsq(scaled, residual, rcond=None)[0]
+    delta /= norms
+
+    new_values = values + delta
+    if np.all((new_values >= lower) & (new_values <= upper)):
+        return delta, True
+
+    from scipy.optimize import lsq_linear
+
+    # The current values are within the bounds, so the bounds on the change always contain zero
+    bounds = ((lower - values) * norms, (upper - values) * norms)
+    result = lsq_linear(scaled, residual, bounds=bounds)
+    return result.x / norms, bool(result.success)
@@ -259,6 +259,29 @@ class LMFit(MinimizerBase):  # noqa: S101
         if stack_status:
             global_object.stack.endMacro()
 
+    @staticmethod
+    def _covariance_from_result(fit_results: ModelResult) -> Optional[np.ndarray]:
+        """
+        Covariance lmfit computed from its final Jacobian, scaled by the reduced chi2 and expanded to all parameters.
+        Parameters which did not vary get NaN rows and columns.
+
+        :param fit_results: Fit object which contains info on the fit
+        :return: covariance matrix in the order of the fit parameters or None
+        """
+        covariance = fit_results.covar
+        if covariance is None:
+            return None
+        if not fit_results.scale_covar:
+            covariance = covariance * fit_results.redchi
+        names = list(fit_results.params.keys())
+        var_names = list(fit_results.var_names)
+        if var_names == names:
+            return covariance
+        positions = [names.index(name) for name in var_names]
+        expanded = np.full((len(names), len(names)), np.nan)
+        expanded[np.ix_(positions, positions)] = covariance
+        return expanded
+
     def _gen_fit_results(self, fit_results: ModelResult, **kwargs) -> FitResults:
         """
         Convert fit results into the unified `FitResults` format.
@@ -286,6 +309,8 @@ class LMFit(MinimizerBase):  # noqa: S101
         results.minimizer_engine = self.__class__
         results.fit_args = None
 
+        results.set_covariance(self._covariance_from_result(fit_results))
+
         results.engine_result = fit_results
         # results.check_sanity()
         return results
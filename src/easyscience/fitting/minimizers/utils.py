@@ -1,5 +1,28 @@
+from collections import OrderedDict
+from collections import namedtuple
+from typing import Hashable
+from typing import List
+from typing import Optional
+
 import numpy as np
 
+from easyscience.Objects.new_variable import Parameter
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def current_value(parameter) -> float:
+    """
+    The value of a parameter of either variable module.
+
+    :param parameter: `Parameter` or legacy `Parameter`
+    :return: Value of the parameter
+    """
+    ## TODO clean when full move to new_variable
+    if isinstance(parameter, Parameter):
+        return parameter.value
+    return parameter.raw_value
+
 
 class FitResults:
     """
@@ -19,6 +42,9 @@ class FitResults:
         'y_err',
         'engine_result',
         'total_results',
+        'posterior',
+        'covariance',
+        'correlation',
     ]
 
     def __init__(self):
@@ -34,6 +60,10 @@ class FitResults:
         self.y_err = np.ndarray([])
         self.engine_result = None
         self.total_results = None
+        self.posterior = None
+        # Rows and columns follow the order of `p`
+        self.covariance = None
+        self.correlation = None
 
     @property
     def n_pars(self):
@@ -49,7 +79,70 @@ class FitResults:
 
     @property
     def reduced_chi(self):
-        return self.chi2 / (len(self.x) - self.n_pars)
+        return self.chi2 / (np.size(self.y_obs) - self.n_pars)
+
+    def set_covariance(self, covariance: Optional[np.ndarray]) -> None:
+        """
+        Store the parameter covariance matrix and the correlation matrix derived from it.
+
+        :param covariance: (n_pars x n_pars) covariance matrix in the order of `p`, or None if it is not available
+        """
+        self.covariance = covariance
+        self.correlation = None if covariance is None else correlation_from_covariance(covariance)
+
+
+def correlation_from_covariance(covariance: np.ndarray) -> np.ndarray:
+    """
+    Normalise a covariance matrix to a correlation matrix. Parameters without variance get NaN correlations.
+
+    :param covariance: (n_pars x n_pars) covariance matrix
+    :return: (n_pars x n_pars) correlation matrix
+    """
+    std = np.sqrt(np.diag(covariance))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlation = covariance / np.outer(std, std)
+    return correlation
+
+class PosteriorSamples:
+    """
+    Draws from the posterior distribution of a sampling minimizer, stored as one row per draw.
+    The points can be written to a `.npy` file and memory-mapped from it, e.g. to keep them after the session. This
+    happens once sampling has finished, the sampler itself holds its chains in memory while it runs.
+    """
+
+    __slots__ = ['names', 'points', 'logp']
+
+    def __init__(self, names: List[str], points: np.ndarray, logp: np.ndarray, path: Optional[str] = None):
+        """
+        :param names: minimizer names of the sampled parameters, one per column of `points`
+        :param points: (n_draws x n_pars) array of draws
+        :param logp: log-likelihood of each draw
+        :param path: optional `.npy` file the points are written to and memory-mapped from
+        """
+        if path is not None:
+            stored = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=points.shape)
+            stored[:] = points
+            stored.flush()
+            points = stored
+        self.names = list(names)
+        self.points = points
+        self.logp = np.asarray(logp, dtype=np.float64)
+
+    @property
+    def n_samples(self) -> int:
+        return self.points.shape[0]
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.points.mean(axis=0)
+
+    @property
+    def std(self) -> np.ndarray:
+        return self.points.std(axis=0)
+
+    def percentile(self, q) -> np.ndarray:
+        return np.percentile(self.points, q, axis=0)
+
 
 class FitError(Exception):
     def __init__(self, e: Exception = None):
@@ -60,3 +153,81 @@ class FitError(Exception):
         if self.e is not None:
             s = f'{self.e}\n'
         return s + 'Something has gone wrong with the fit'
+
+
+class EvaluationCache:
+    """
+    Bounded least-recently-used cache for model evaluations.
+    Entries are keyed on the parameter vector together with the identity of the `x` array they were calculated at.
+    A reference to `x` is kept with every entry, so an id which gets re-used by a new array can never produce a hit.
+    Anything else the model depends on, such as fixed parameters or the calculator, is not part of the key, so the
+    cache must be cleared whenever that may have changed. Results are copied in and out, so changing a returned array
+    does not change the cache.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        if maxsize < 1:
+            raise ValueError('The size of the evaluation cache must be at least 1')
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @staticmethod
+    def make_key(x: np.ndarray, values) -> Hashable:
+        """
+        Generate the cache key for an evaluation.
+
+        :param x: points the model is evaluated at
+        :param values: parameter values in a fixed order
+        :return: hashable key
+        """
+        return id(x), np.asarray(values, dtype=np.float64).tobytes()
+
+    def get(self, key: Hashable, x: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Look up an evaluation, updating the hit/miss statistics.
+
+        :param key: key generated by `make_key`
+        :param x: points the model is evaluated at
+        :return: cached result or None if there is no entry
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not x:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1].copy()
+
+    def put(self, key: Hashable, x: np.ndarray, result: np.ndarray) -> None:
+        """
+        Store an evaluation, discarding the least recently used entry if the cache is full.
+
+        :param key: key generated by `make_key`
+        :param x: points the model was evaluated at
+        :param result: calculated values
+        """
+        self._entries[key] = (x, np.array(result, copy=True))
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove all entries. The hit/miss statistics are kept.
+        """
+        self._entries.clear()
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Cache statistics in the same form as `functools.lru_cache`.
+        """
+        return CacheInfo(self.hits, self.misses, self._maxsize, len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -17,6 +17,9 @@ class MultiFitter(Fitter):
     """
     Extension of Fitter to enable multiple dataset/fit function fitting. We can fit these types of data simultaneously:
     - Multiple models on multiple datasets.
+
+    Fit functions which are the `fit_func` of an interface running out of process (see `out_of_process`) are
+    calculated at the same time.
     """
 
     def __init__(
@@ -41,24 +44,51 @@ class MultiFitter(Fitter):
         """
         # Extract of a list of callable functions
         wrapped_fns = []
+        submit_fns = []
         for this_x, this_fun in zip(real_x, self._fit_functions):
             self._fit_function = this_fun
             wrapped_fns.append(Fitter._fit_function_wrapper(self, this_x, flatten=flatten))
+            submit_fns.append(self._submit_function(this_fun, this_x))
 
         def wrapped_fun(x, **kwargs):
             # Generate an empty Y based on x
             y = np.zeros_like(x)
+            # Calculations which can run in the background, e.g. of out of process interfaces, are all started first
+            pending = [None if submit is None else submit(**kwargs) for submit in submit_fns]
             i = 0
             # Iterate through wrapped functions, passing the WRONG x, the correct
             # x was injected in the step above.
             for idx, dim in enumerate(self._dependent_dims):
                 ep = i + np.prod(dim)
-                y[i:ep] = wrapped_fns[idx](x, **kwargs)
+                if pending[idx] is None:
+                    y[i:ep] = wrapped_fns[idx](x, **kwargs)
+                else:
+                    dependent = pending[idx].result()
+                    y[i:ep] = dependent.flatten() if flatten else dependent
                 i = ep
             return y
 
         return wrapped_fun
 
+    @staticmethod
+    def _submit_function(fit_function: Callable, x) -> Optional[Callable]:
+        """
+        A function starting the calculation of `fit_function` at `x` without waiting for it, if `fit_function` is the
+        `fit_func` of an interface factory. It returns the pending calculation, or None if the current interface
+        cannot calculate in the background.
+        :param fit_function: Fit function of a dataset
+        :param x: Independent values of the dataset
+        :return: Submitting function or None
+        """
+        submit = getattr(fit_function, 'submit', None)
+        if submit is None:
+            return None
+
+        def submit_fit_function(**kwargs):
+            return submit(x, **kwargs)
+
+        return submit_fit_function
+
     @staticmethod
     def _precompute_reshaping(
         x: List[np.ndarray],
@@ -127,6 +157,8 @@ class MultiFitter(Fitter):
             current_results.y_calc = np.reshape(fit_result_obj.y_calc[sp:ep], current_results.y_obs.shape)
             current_results.y_err = np.reshape(fit_result_obj.y_err[sp:ep], current_results.y_obs.shape)
             current_results.engine_result = fit_result_obj.engine_result
+            current_results.covariance = fit_result_obj.covariance
+            current_results.correlation = fit_result_obj.correlation
 
             # Attach an additional field for the un-modified results
             current_results.total_results = fit_result_obj
@@ -0,0 +1,199 @@
+#  SPDX-FileCopyrightText: 2023 EasyScience contributors  <core@easyscience.software>
+#  SPDX-License-Identifier: BSD-3-Clause
+#  © 2021-2023 Contributors to the EasyScience project <https://github.com/easyScience/EasyScience
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+
+from .available_minimizers import AvailableMinimizers
+from .clone import FitFunctionSpec
+from .clone import decode_fit_task
+from .clone import encode_fit_task
+from .fitter import Fitter
+from .minimizers import FitError
+from .minimizers import FitResults
+from .minimizers.minimizer_base import MINIMIZER_PARAMETER_PREFIX
+from .minimizers.utils import current_value
+
+SAMPLERS = ['lhs', 'sobol', 'uniform']
+
+
+class MultiStartFitter(Fitter):
+    """
+    Extension of Fitter which runs the current minimizer from many starting points spread over the parameter bounds
+    and keeps the distinct converged solutions. Every start is fitted on a clone of the fit object, so the starts can
+    be run in parallel on a process pool. The fit object must therefore be serializable with `as_dict`/`from_dict`.
+    """
+
+    def fit_multi_start(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        n_starts: int = 10,
+        sampler: str = 'lhs',
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
+        include_initial: bool = True,
+        unique_tolerance: float = 1e-4,
+        vectorized: bool = False,
+        **kwargs,
+    ) -> List[FitResults]:
+        """
+        Fit the model from `n_starts` starting points and return the distinct successful results ranked by chi2.
+        The best solution is written back to the parameters of the fit object.
+
+        :param x: points to be calculated at
+        :param y: measured points
+        :param weights: Weights for supplied measured points
+        :param n_starts: Number of starting points
+        :param sampler: How starting points are drawn from the bounds, one of `SAMPLERS`
+        :param seed: Seed for the sampler
+        :param workers: Number of worker processes. `None` uses all cores, 1 runs the starts in this process
+        :param include_initial: Should the current parameter values be used as the first starting point?
+        :param unique_tolerance: Solutions closer than this, relative to the bound widths, are considered identical
+        :param vectorized: Is the fit function vectorized? See `Fitter.fit`
+        :param kwargs: Additional arguments for the minimizer
+        :return: Distinct fit results, best first
+        """
+        if n_starts < 1:
+            raise ValueError('At least one starting point is needed')
+        if self._minimizer.fit_constraints():
+            raise ValueError('Fit constraints are not supported by the multi-start fitter')
+        parameters = self._fit_object.get_fit_parameters()
+        lower, upper = self._bounds(parameters)
+        starts = self._sample_starts(lower, upper, n_starts, sampler, seed)
+        if include_initial:
+            starts[0] = [current_value(parameter) for parameter in parameters]
+
+        fit_settings = {
+            'minimizer_enum': self._enum_current_minimizer,
+            'tolerance': self._tolerance,
+            'max_evaluations': self._max_evaluations,
+            'vectorized': vectorized,
+            'kwargs': kwargs,
+        }
+        object_dict, fit_function = encode_fit_task(self._fit_object, self._fit_function)
+        tasks = [(object_dict, fit_function, start, x, y, weights, fit_settings) for start in starts]
+
+        if workers == 1:
+            outcomes = [_fit_single_start(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                outcomes = list(executor.map(_fit_single_start, *zip(*tasks)))
+
+        names = [MINIMIZER_PARAMETER_PREFIX + parameter.unique_name for parameter in parameters]
+        candidates = [
+            (self._rename_result(result, clone_names, names), errors)
+            for result, clone_names, errors in outcomes
+            if result is not None
+        ]
+        ranked = self._unique_results([result for result, _ in candidates], names, upper - lower, unique_tolerance)
+        if ranked:
+            best_errors = next(errors for result, errors in candidates if result is ranked[0])
+            self._apply_result(ranked[0], parameters, names, best_errors)
+        return ranked
+
+    @staticmethod
+    def _bounds(parameters: List) -> Tuple[np.ndarray, np.ndarray]:
+        lower = np.array([parameter.min for parameter in parameters], dtype=float)
+        upper = np.array([parameter.max for parameter in parameters], dtype=float)
+        finite = np.isfinite(lower) & np.isfinite(upper)
+        if not np.all(finite):
+            unbound = [parameter.name for parameter, is_finite in zip(parameters, finite) if not is_finite]
+            raise ValueError(f'Multi-start fitting needs finite bounds, the following parameters are unbound: {unbound}')
+        return lower, upper
+
+    @staticmethod
+    def _sample_starts(lower: np.ndarray, upper: np.ndarray, n_starts: int, sampler: str, seed: Optional[int]) -> np.ndarray:
+        """
+        Draw starting points within the bounds.
+
+        :return: (n_starts x n_pars) array of starting points
+        """
+        from scipy.stats import qmc
+
+        if sampler == 'lhs':
+            unit = qmc.LatinHypercube(d=lower.size, seed=seed).random(n_starts)
+        elif sampler == 'sobol':
+            unit = qmc.Sobol(d=lower.size, seed=seed).random(n_starts)
+        elif sampler == 'uniform':
+            unit = np.random.default_rng(seed).random((n_starts, lower.size))
+        else:
+            raise ValueError(f'Invalid sampler: {sampler}. The following samplers are available: {SAMPLERS}')
+        return qmc.scale(unit, lower, upper) if lower.size else unit
+
+    @staticmethod
+    def _rename_result(result: FitResults, clone_names: List[str], names: List[str]) -> FitResults:
+        mapping = dict(zip(clone_names, names))
+        result.p = {mapping.get(key, key): value for key, value in result.p.items()}
+        result.p0 = {mapping.get(key, key): value for key, value in result.p0.items()}
+        return result
+
+    @staticmethod
+    def _unique_results(results: List[FitResults], names: List[str], scale: np.ndarray, tolerance: float) -> List[FitResults]:
+        """
+        Rank successful results by chi2 and drop the ones which converged to an already found solution.
+        """
+        scale = np.where(scale > 0, scale, 1.0)
+        ranked = sorted((result for result in results if result.success), key=lambda result: result.chi2)
+        unique = []
+        unique_vectors = []
+        for result in ranked:
+            vector = np.array([result.p[name] for name in names], dtype=float)
+            if all(np.max(np.abs(vector - other) / scale, initial=0.0) > tolerance for other in unique_vectors):
+                unique.append(result)
+                unique_vectors.append(vector)
+        return unique
+
+    @staticmethod
+    def _apply_result(result: FitResults, parameters: List, names: List[str], errors: List[float]) -> None:
+        from easyscience import global_object
+
+        stack_status = global_object.stack.enabled
+        if stack_status:
+            global_object.stack.beginMacro('Multi-start fitting routine')
+        for parameter, name, error in zip(parameters, names, errors):
+            parameter.value = result.p[name]
+            parameter.error = error
+        if stack_status:
+            global_object.stack.endMacro()
+
+
+def _fit_single_start(
+    object_dict: Dict[str, Any],
+    fit_function: FitFunctionSpec,
+    start: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    weights: Optional[np.ndarray],
+    fit_settings: Dict[str, Any],
+) -> Tuple[Optional[FitResults], List[str], List[float]]:
+    """
+    Fit a clone of the fit object from a single starting point. This runs in a worker process.
+
+    :return: Fit results (None if the fit failed), the clone's minimizer parameter names and the parameter errors
+    """
+    clone, fit_function = decode_fit_task(object_dict, fit_function)
+    parameters = clone.get_fit_parameters()
+    for parameter, value in zip(parameters, start):
+        parameter.value = value
+    clone_names = [MINIMIZER_PARAMETER_PREFIX + parameter.unique_name for parameter in parameters]
+
+    minimizer_enum: AvailableMinimizers = fit_settings['minimizer_enum']
+    fitter = Fitter(clone, fit_function)
+    fitter.switch_minimizer(minimizer_enum)
+    fitter.tolerance = fit_settings['tolerance']
+    fitter.max_evaluations = fit_settings['max_evaluations']
+    try:
+        result = fitter.fit(x, y, weights=weights, vectorized=fit_settings['vectorized'], **fit_settings['kwargs'])
+    except FitError:
+        return None, clone_names, []
+    # Engine results hold references to closures which can not be sent back from a worker
+    result.engine_result = None
+    return result, clone_names, [parameter.error for parameter in parameters]
@@ -0,0 +1,153 @@
+#  SPDX-FileCopyrightText: 2023 EasyScience contributors  <core@easyscience.software>
+#  SPDX-License-Identifier: BSD-3-Clause
+#  © 2021-2023 Contributors to the EasyScience project <https://github.com/easyScience/EasyScience
+from contextlib import contextmanager
+from typing import Callable
+from typing import List
+from typing import Optional
+
+import numpy as np
+
+from .minimizers import FitResults
+from .minimizers.minimizer_base import MINIMIZER_PARAMETER_PREFIX
+from .minimizers.minimizer_base import MinimizerBase
+from .minimizers.minimizer_linear import solve_linear_least_squares
+from .minimizers.utils import current_value
+
+
+class VariableProjection:
+    """
+    Fit function for separable least squares. The model has to be linear in the `linear_parameters`, e.g. the peak
+    amplitudes and background coefficients of a spectrum. Every call solves for the linear parameters at the current
+    values of the others and returns the model at that solution, so that the minimizer only has to vary the nonlinear
+    parameters. The linear parameters are fixed while the minimizer runs.
+    """
+
+    def __init__(self, fit_function: Callable, linear_parameters: List, y: np.ndarray, weights: Optional[np.ndarray]):
+        """
+        :param fit_function: Function to be fitted, linear in the linear parameters
+        :param linear_parameters: Parameters solved for in every call
+        :param y: measured points
+        :param weights: Weights multiplying the residuals, `1/sqrt(|y|)` if not given
+        """
+        self._fit_function = fit_function
+        self._parameters = list(linear_parameters)
+        self._y = np.ravel(y)
+        self._weights = 1 / np.sqrt(np.abs(self._y)) if weights is None else np.ravel(weights)
+        self._lower = np.array([parameter.min for parameter in self._parameters], dtype=np.float64)
+        self._upper = np.array([parameter.max for parameter in self._parameters], dtype=np.float64)
+        self._initial = self._values()
+        self.n_evaluations = 0
+
+    def __call__(self, x: np.ndarray, **kwargs) -> np.ndarray:
+        values = self._values()
+        steps = MinimizerBase._design_steps(self._parameters, values)
+        reference_y = self._evaluate(x, **kwargs)
+        design = np.empty((reference_y.size, len(self._parameters)))
+        for index, (parameter, value, step) in enumerate(zip(self._parameters, values, steps)):
+            parameter.value = value + step
+            design[:, index] = (self._evaluate(x, **kwargs) - reference_y) / step if step != 0 else 0.0
+            parameter.value = value
+
+        weighted_design = design * self._weights[:, np.newaxis]
+        weighted_residual = (self._y - reference_y) * self._weights
+        delta, _ = solve_linear_least_squares(weighted_design, weighted_residual, values, self._lower, self._upper)
+        for parameter, value in zip(self._parameters, values + delta):
+            parameter.value = value
+        return reference_y + design @ delta
+
+    @property
+    def linear_parameters(self) -> List:
+        return self._parameters
+
+    @contextmanager
+    def linear_fixed(self):
+        """
+        Fix the linear parameters, so that they are not seen by the minimizer. No undo entries are made.
+        """
+        from easyscience import global_object
+
+        stack_status = global_object.stack.enabled
+        global_object.stack.enabled = False
+        fixed = [parameter.fixed for parameter in self._parameters]
+        for parameter in self._parameters:
+            parameter.fixed = True
+        global_object.stack.enabled = stack_status
+        try:
+            yield
+        finally:
+            global_object.stack.enabled = False
+            for parameter, was_fixed in zip(self._parameters, fixed):
+                parameter.fixed = was_fixed
+            global_object.stack.enabled = stack_status
+
+    def finalize(self, x: np.ndarray, result: FitResults, parameters: List) -> FitResults:
+        """
+        Solve for the linear parameters at the fitted nonlinear parameters and complete the fit results with them.
+        The covariance and the errors of all parameters are recalculated from the Jacobian of the full model.
+
+        :param x: points the model was fitted at
+        :param result: Fit results for the nonlinear parameters
+        :param parameters: All fit parameters, linear and nonlinear
+        :return: Fit results for all parameters
+        """
+        from easyscience import global_object
+
+        stack_status = global_object.stack.enabled
+        global_object.stack.enabled = False
+        try:
+            y_calc = self(x)
+            values = np.array([current_value(parameter) for parameter in parameters])
+            jacobian = self._jacobian(x, parameters, values, y_calc)
+        finally:
+            global_object.stack.enabled = stack_status
+        residuals = (self._y - y_calc) * self._weights
+        covariance = MinimizerBase._covariance_from_jacobian(jacobian * self._weights[:, np.newaxis], residuals)
+        errors = np.zeros(len(parameters)) if covariance is None else np.sqrt(np.abs(np.diag(covariance)))
+
+        if stack_status:
+            global_object.stack.beginMacro('Separable fitting routine')
+        for parameter, value, error in zip(parameters, values, errors):
+            if any(parameter is linear for linear in self._parameters):
+                parameter.value = value
+            parameter.error = error
+        if stack_status:
+            global_object.stack.endMacro()
+
+        names = [MINIMIZER_PARAMETER_PREFIX + parameter.unique_name for parameter in parameters]
+        p0 = {MINIMIZER_PARAMETER_PREFIX + p.unique_name: value for p, value in zip(self._parameters, self._initial)}
+        if result.p0 is not None:
+            p0.update(result.p0)
+        result.p0 = {name: p0[name] for name in names}
+        result.p = dict(zip(names, values))
+        result.x = x
+        result.y_obs = self._y
+        result.y_calc = y_calc
+        result.y_err = 1 / self._weights
+        result.set_covariance(covariance)
+        return result
+
+    def _jacobian(self, x: np.ndarray, parameters: List, values: np.ndarray, y_calc: np.ndarray) -> np.ndarray:
+        """
+        Forward difference Jacobian of the full model. The linear parameters are stepped by a large step, as the model
+        is exactly linear in them.
+        """
+        steps = MinimizerBase._design_steps(parameters, values)
+        linear = np.array([any(parameter is other for other in self._parameters) for parameter in parameters])
+        small = np.sqrt(np.finfo(np.float64).eps) * np.maximum(np.abs(values), 1.0)
+        steps = np.where(linear, steps, np.sign(steps) * np.minimum(np.abs(steps), small))
+        jacobian = np.zeros((y_calc.size, len(parameters)))
+        for index, (parameter, value, step) in enumerate(zip(parameters, values, steps)):
+            if step == 0:
+                continue
+            parameter.value = value + step
+            jacobian[:, index] = (self._evaluate(x) - y_calc) / step
+            parameter.value = value
+        return jacobian
+
+    def _evaluate(self, x: np.ndarray, **kwargs) -> np.ndarray:
+        self.n_evaluations += 1
+        return np.ravel(self._fit_function(x, **kwargs))
+
+    def _values(self) -> np.ndarray:
+        return np.array([current_value(parameter) for parameter in self._parameters], dtype=np.float64)
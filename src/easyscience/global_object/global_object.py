@@ -35,6 +35,11 @@ class GlobalObject:
         self.script: ScriptManager = ScriptManager()
         # Map. This is the conduit database between all global object species
         self.map: Map = self.__map
+        # Value epoch. Incremented whenever the value of a Descriptor or Parameter changes, so that cached values
+        # (e.g. `BaseCollection.value_array`) can be validated with a single comparison.
+        self.value_epoch: int = 0
+        # Name epoch. Incremented whenever the name of an object changes, e.g. to validate name lookups.
+        self.name_epoch: int = 0
 
     def instantiate_stack(self):
         """
@@ -8,6 +8,7 @@ __version__ = '0.1.0'
 import gc
 import sys
 import weakref
+from typing import Iterable
 from typing import List
 from typing import Optional
 
@@ -141,6 +142,12 @@ class Map:
         else:
             raise AttributeError('Start object not in map.')
 
+    def add_edges(self, start_obj: object, end_objs: Iterable[object]):
+        if start_obj.unique_name in self.__type_dict.keys():
+            self.__type_dict[start_obj.unique_name].extend(end_obj.unique_name for end_obj in end_objs)
+        else:
+            raise AttributeError('Start object not in map.')
+
     def get_edges(self, start_obj) -> List[str]:
         if start_obj.unique_name in self.__type_dict.keys():
             return list(self.__type_dict[start_obj.unique_name])
@@ -74,6 +74,9 @@ class NotarizedDict(UserDict):
     """
 
     def __init__(self, **kwargs):
+        # Incremented whenever keys are added, removed or reordered, so that indices built on the key order can be
+        # validated with a single comparison.
+        self._version = 0
         super().__init__(**kwargs)
         self._global_object = global_object
         self._stack_enabled = False
@@ -85,11 +88,14 @@ class NotarizedDict(UserDict):
 
     @dict_stack_deco
     def __setitem__(self, key, value):
+        if key not in self.data:
+            self._version += 1
         super(NotarizedDict, self).__setitem__(key, value)
 
     @dict_stack_deco
     def __delitem__(self, key):
         super(NotarizedDict, self).__delitem__(key)
+        self._version += 1
 
     def __repr__(self):
         return f'{self._classname()}({self.data})'
@@ -97,6 +103,7 @@ class NotarizedDict(UserDict):
     @dict_stack_deco
     def reorder(self, **kwargs):
         self.data = kwargs.copy()
+        self._version += 1
 
 
 class CommandHolder:
@@ -393,10 +400,12 @@ class DictStack(UndoCommand):
         if self._creation:
             # Now we delete
             self._parent.data.__delitem__(self._key)
+            self._parent._version += 1
         else:
             # Now we create/change value
             if self._index is None:
                 self._parent.data.__setitem__(self._key, self._old_value)
+                self._parent._version += 1
             else:
                 # This deals with placing an item in a place
                 keys = list(self._parent.keys())
@@ -411,6 +420,7 @@ class DictStack(UndoCommand):
             self._parent.data.__delitem__(self._key)
         else:
             self._parent.data.__setitem__(self._key, self._new_value)
+        self._parent._version += 1
 
 
 class DictStackReCreate(UndoCommand):
@@ -423,9 +433,11 @@ class DictStackReCreate(UndoCommand):
 
     def undo(self) -> NoReturn:
         self._parent.data = self._old_value
+        self._parent._version += 1
 
     def redo(self) -> NoReturn:
         self._parent.data = self._new_value
+        self._parent._version += 1
 
 
 def property_stack_deco(arg: Union[str, Callable], begin_macro: bool = False) -> Callable:
@@ -29,6 +29,49 @@ def designate_calc_fn(func):
     return wrapper
 
 
+def horner(coefficients: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    Evaluate polynomials with Horner's scheme using in-place array operations. The coefficients are ordered highest
+    power first, as for `np.polyval`.
+
+    :param coefficients: (n_coefficients,) array or (n_sets x n_coefficients) array for many polynomials at once
+    :param x: points to evaluate at
+    :return: values at `x`, with a leading n_sets dimension for 2D coefficients
+    """
+    coefficients = np.asarray(coefficients, dtype=np.float64)
+    x = np.asarray(x)
+    batched = coefficients.ndim == 2
+    if not batched:
+        coefficients = coefficients[np.newaxis]
+    shape = (-1,) + (1,) * x.ndim
+    result = np.zeros((coefficients.shape[0], *x.shape), dtype=np.result_type(x, coefficients))
+    if coefficients.shape[1]:
+        result += coefficients[:, 0].reshape(shape)
+    for index in range(1, coefficients.shape[1]):
+        result *= x
+        result += coefficients[:, index].reshape(shape)
+    return result if batched else result[0]
+
+
+def _batch_values(values: np.ndarray, parameters: Iterable, fit_parameters: list, parameter_sets: np.ndarray) -> np.ndarray:
+    """
+    Repeat the current values for every parameter set and replace the values of the fit parameters.
+
+    :param values: current values of `parameters`
+    :param parameters: all parameters of the model, in the order of `values`
+    :param fit_parameters: the fit parameters, in the order of the columns of `parameter_sets`
+    :param parameter_sets: (n_sets x n_fit_parameters) array of fit parameter values
+    :return: (n_sets x n_parameters) array of values
+    """
+    fit_ids = [id(parameter) for parameter in fit_parameters]
+    columns = [fit_ids.index(id(parameter)) if id(parameter) in fit_ids else -1 for parameter in parameters]
+    batch = np.repeat(np.asarray(values, dtype=np.float64)[np.newaxis], len(parameter_sets), axis=0)
+    for index, column in enumerate(columns):
+        if column >= 0:
+            batch[:, index] = parameter_sets[:, column]
+    return batch
+
+
 class Polynomial(BaseObj):
     """
     A polynomial model.
@@ -42,6 +85,8 @@ class Polynomial(BaseObj):
     """
 
     coefficients: ClassVar[BaseCollection]
+    # The model is linear in its coefficients, see `AvailableMinimizers.Linear`
+    linear = True
 
     def __init__(
         self,
@@ -64,7 +109,20 @@ class Polynomial(BaseObj):
                 raise TypeError('coefficients must be a list or a BaseCollection')
 
     def __call__(self, x: np.ndarray, *args, **kwargs) -> np.ndarray:
-        return np.polyval([c.raw_value for c in self.coefficients], x)
+        return horner(self.coefficients.value_array, x)
+
+    def batch_call(self, x: np.ndarray, parameter_sets: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the polynomial for many sets of fit parameter values at once, see `MinimizerBase.evaluate_batch`.
+
+        :param x: points to evaluate at
+        :param parameter_sets: (n_sets x n_pars) array with the columns in the order of `get_fit_parameters`
+        :return: (n_sets x ...) array of values
+        """
+        coefficients = _batch_values(
+            self.coefficients.value_array, self.coefficients.data, self.get_fit_parameters(), parameter_sets
+        )
+        return horner(coefficients, x)
 
     def __repr__(self):
         s = []
@@ -82,6 +140,8 @@ class Polynomial(BaseObj):
 class Line(BaseObj):
     m: ClassVar[Parameter]
     c: ClassVar[Parameter]
+    # The model is linear in m and c, see `AvailableMinimizers.Linear`
+    linear = True
 
     def __init__(
         self,
@@ -98,5 +158,17 @@ class Line(BaseObj):
     def __call__(self, x: np.ndarray, *args, **kwargs) -> np.ndarray:
         return self.m.raw_value * x + self.c.raw_value
 
+    def batch_call(self, x: np.ndarray, parameter_sets: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the line for many sets of fit parameter values at once, see `MinimizerBase.evaluate_batch`.
+
+        :param x: points to evaluate at
+        :param parameter_sets: (n_sets x n_pars) array with the columns in the order of `get_fit_parameters`
+        :return: (n_sets x ...) array of values
+        """
+        parameters = [self.m, self.c]
+        values = [parameter.raw_value for parameter in parameters]
+        return horner(_batch_values(values, parameters, self.get_fit_parameters(), parameter_sets), x)
+
     def __repr__(self):
         return '{}({}, {})'.format(self.__class__.__name__, self.m, self.c)
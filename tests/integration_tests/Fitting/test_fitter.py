@@ -333,3 +333,38 @@ def test_2D_non_vectorized(fit_engine, with_errors):
     assert result.residual == pytest.approx(
         mm(XY.reshape(-1, 2)) - y_calc_ref, abs=1e-2
     )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_evaluate_batch(workers):
+    from easyscience.models.polynomial import Line
+
+    line = Line(2.0, 1.0)
+    fitter = Fitter(line, line)
+    x = np.linspace(0, 1, 5)
+    parameter_sets = np.array([[1.0, 0.0], [2.0, 1.0], [3.0, 3.0]])
+
+    result = fitter.evaluate_batch(x, parameter_sets, workers=workers)
+
+    assert result.shape == (3, 5)
+    for row, (m, c) in zip(result, parameter_sets):
+        assert row == pytest.approx(m * x + c)
+    assert line.m.raw_value == 2.0
+    assert line.c.raw_value == 1.0
+
+
+def test_evaluate_batch_fit_constraints():
+    from easyscience.models.polynomial import Line
+
+    line = Line(2.0, 1.0)
+    fitter = Fitter(line, line)
+    fitter.add_fit_constraint(ObjConstraint(line.c, "2*", line.m))
+    x = np.linspace(0, 1, 5)
+    parameter_sets = np.array([[1.0], [2.0], [3.0]])
+
+    result = fitter.evaluate_batch(x, parameter_sets, workers=2)
+
+    assert result.shape == (3, 5)
+    for row, (m,) in zip(result, parameter_sets):
+        assert row == pytest.approx(m * x + 2 * m)
+    assert line.m.raw_value == 2.0
@@ -0,0 +1,417 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+import xarray as xr
+
+import easyscience.Datasets.xarray  # noqa: F401
+from easyscience.Datasets.fit_plan import FitPlan
+from easyscience.fitting import FitResults
+
+needs_fork = pytest.mark.skipif(
+    'fork' not in multiprocessing.get_all_start_methods(), reason='The processes scheduler forks its workers'
+)
+SCHEDULERS = ['threads', pytest.param('processes', marks=needs_fork)]
+
+
+@pytest.fixture
+def data_array():
+    x = np.linspace(0, 1, 4)
+    y = np.linspace(0, 2, 3)
+    values = x[:, np.newaxis] + 10 * y[np.newaxis, :]
+    return xr.DataArray(values, dims=['x', 'y'], coords={'x': x, 'y': y}, name='I')
+
+
+def test_points_follow_stacked_order(data_array):
+    # When
+    plan = FitPlan(data_array, lambda x: x[:, 0] + 10 * x[:, 1])
+
+    # Then
+    stacked = data_array.stack(all_x=['x', 'y'])
+
+    # Expect
+    assert plan.points.shape == (12, 2)
+    assert np.array_equal(plan.points[:, 0], stacked.x.values)
+    assert np.array_equal(plan.points[:, 1], stacked.y.values)
+    assert np.array_equal(plan.observations, stacked.values)
+    assert np.allclose(plan.evaluate(), stacked.values)
+
+
+def test_points_1d():
+    # When
+    data = xr.DataArray(np.arange(5.0), dims=['t'], coords={'t': np.linspace(0, 1, 5)})
+
+    # Then
+    plan = FitPlan(data, lambda x: 2 * x)
+
+    # Expect
+    assert plan.points.shape == (5,)
+    assert np.allclose(plan.evaluate(), 2 * np.linspace(0, 1, 5))
+
+
+def test_evaluate_vectorized(data_array):
+    # When
+    received = []
+
+    def func(x):
+        received.append(x.shape)
+        return x[..., 0] + 10 * x[..., 1]
+
+    # Then
+    plan = FitPlan(data_array, func, vectorize=True)
+    result = plan.evaluate()
+
+    # Expect
+    assert received == [(4, 3, 2)]
+    assert np.shares_memory(plan.inputs, plan.points)
+    assert np.allclose(result, data_array.values.ravel())
+
+
+def test_evaluate_postcompute_and_kwargs(data_array):
+    # When
+    plan = FitPlan(
+        data_array,
+        lambda x, scale: scale * x[:, 0],
+        postcompute_func=lambda result: result + 1,
+        fn_kwargs={'scale': 2.0},
+    )
+
+    # Then
+    result = plan.evaluate()
+
+    # Expect
+    assert np.allclose(result, 2.0 * plan.points[:, 0] + 1)
+
+
+def test_flatten_transposed_data_array(data_array):
+    # When
+    plan = FitPlan(data_array, lambda x: x[:, 0])
+
+    # Then
+    flat = plan.flatten(data_array.transpose('y', 'x'))
+
+    # Expect
+    assert np.array_equal(flat, data_array.values.ravel())
+    with pytest.raises(ValueError):
+        plan.flatten(np.ones(3))
+
+
+def test_unpack_results(data_array):
+    # When
+    plan = FitPlan(data_array, lambda x: x[:, 0])
+    results = FitResults()
+    results.y_obs = plan.observations
+    results.y_calc = plan.observations + 1
+    results.y_err = np.ones(plan.size)
+
+    # Then
+    results = plan.unpack_results(results)
+
+    # Expect
+    assert results.y_calc.dims == ('x', 'y')
+    assert np.allclose(results.residual.values, -1)
+    assert np.array_equal(results.x_matrices['y_broadcast'].values[0], data_array.y.values)
+
+
+def test_accessor_fit():
+    # When
+    from easyscience.fitting import Fitter
+    from easyscience.models.polynomial import Line
+
+    x = np.linspace(0, 10, 20)
+    data = xr.DataArray(3.0 * x + 2.0, dims=['x'], coords={'x': x})
+    line = Line(1.0, 0.0)
+    fitter = Fitter(line, line)
+
+    # Then
+    result = data.EasyScience.fit(fitter)
+
+    # Expect
+    assert result.success
+    assert line.m.raw_value == pytest.approx(3.0)
+    assert line.c.raw_value == pytest.approx(2.0)
+    assert result.y_calc.dims == ('x',)
+    assert fitter.fit_function == line
+
+
+@pytest.mark.parametrize('chunks', [1, 3, (2, 3), (2, -1), 10])
+def test_chunk_bounds(data_array, chunks):
+    # When
+    plan = FitPlan(data_array, lambda x: x[:, 0] + 10 * x[:, 1], chunks=chunks)
+
+    # Then
+    result = plan.evaluate()
+
+    # Expect
+    rows = chunks[0] if isinstance(chunks, tuple) else chunks
+    assert plan.n_chunks == -(-4 // rows)
+    assert np.allclose(result, data_array.values.ravel())
+    plan.close()
+
+
+def test_chunks_invalid(data_array):
+    # Expect
+    with pytest.raises(ValueError):
+        FitPlan(data_array, lambda x: x, chunks=(2, 1))
+    with pytest.raises(ValueError):
+        FitPlan(data_array, lambda x: x, chunks=0)
+    with pytest.raises(ValueError):
+        FitPlan(data_array, lambda x: x, chunks=2, scheduler='cluster')
+    with pytest.raises(ValueError):
+        FitPlan(data_array, lambda x: x, chunks=2, scheduler='processes')
+
+
+def test_chunks_vectorized(data_array):
+    # When
+    received = []
+
+    def func(x):
+        received.append(x.shape)
+        return x[..., 0] + 10 * x[..., 1]
+
+    plan = FitPlan(data_array, func, vectorize=True, chunks=3, workers=1)
+
+    # Then
+    result = plan.evaluate()
+
+    # Expect
+    assert received == [(3, 3, 2), (1, 3, 2)]
+    assert np.allclose(result, data_array.values.ravel())
+    plan.close()
+
+
+def test_chunks_output_reused(data_array):
+    # When
+    plan = FitPlan(data_array, lambda x: x[:, 0], chunks=2)
+
+    # Then
+    first = plan.evaluate()
+    second = plan.evaluate()
+
+    # Expect
+    assert np.shares_memory(first, second)
+    plan.close()
+
+
+@needs_fork
+def test_chunks_processes():
+    # When
+    from easyscience.models.polynomial import Line
+
+    data = xr.DataArray(np.zeros(10), dims=['x'], coords={'x': np.arange(10.0)})
+    line = Line(2.0, 1.0)
+    plan = FitPlan(data, line, chunks=4, scheduler='processes', workers=2, parameters=line.get_fit_parameters())
+
+    # Then
+    first = plan.evaluate().copy()
+    line.m.value = 3.0
+    second = plan.evaluate()
+    plan.close()
+
+    # Expect
+    assert np.allclose(first, 2.0 * np.arange(10.0) + 1.0)
+    assert np.allclose(second, 3.0 * np.arange(10.0) + 1.0)
+
+
+def test_chunks_processes_without_fork(data_array, monkeypatch):
+    # When
+    monkeypatch.setattr(multiprocessing, 'get_all_start_methods', lambda: ['spawn'])
+
+    # Then
+    with pytest.warns(UserWarning, match='fork'):
+        plan = FitPlan(data_array, lambda x: x[:, 0], chunks=2, scheduler='processes', parameters=[])
+
+    # Expect
+    assert plan.scheduler == 'threads'
+    assert np.allclose(plan.evaluate(), plan.points[:, 0])
+    plan.close()
+
+
+@pytest.mark.parametrize('scheduler', SCHEDULERS)
+def test_accessor_fit_chunked(scheduler):
+    # When
+    from easyscience.fitting import Fitter
+    from easyscience.models.polynomial import Line
+
+    x = np.linspace(0, 10, 20)
+    data = xr.DataArray(3.0 * x + 2.0, dims=['x'], coords={'x': x})
+    line = Line(1.0, 0.0)
+    fitter = Fitter(line, line)
+
+    # Then
+    result = data.EasyScience.fit(fitter, dask='parallelized', dask_chunks=5, scheduler=scheduler, workers=2)
+
+    # Expect
+    assert result.success
+    assert line.m.raw_value == pytest.approx(3.0)
+    assert line.c.raw_value == pytest.approx(2.0)
+
+
+@pytest.mark.parametrize('scheduler', SCHEDULERS)
+def test_accessor_fit_chunked_constraint(scheduler):
+    # When
+    from easyscience.Constraints import ObjConstraint
+    from easyscience.fitting import Fitter
+    from easyscience.models.polynomial import Line
+
+    x = np.linspace(0, 10, 20)
+    data = xr.DataArray(3.0 * x + 4.0, dims=['x'], coords={'x': x})
+    line = Line(1.0, 0.0)
+    fitter = Fitter(line, line)
+    fitter.add_fit_constraint(ObjConstraint(line.c, '2*', line.m))
+    # The in-process fit applies the constraint on every evaluation
+    reference = Line(1.0, 0.0)
+    reference_fitter = Fitter(reference, reference)
+    reference_fitter.add_fit_constraint(ObjConstraint(reference.c, '2*', reference.m))
+    reference_fitter.fit(x, data.values)
+
+    # Then
+    result = data.EasyScience.fit(fitter, dask='parallelized', dask_chunks=5, scheduler=scheduler, workers=2)
+
+    # Expect
+    assert result.success
+    assert line.m.raw_value == pytest.approx(reference.m.raw_value, rel=1e-4)
+    assert line.c.raw_value == pytest.approx(reference.c.raw_value, rel=1e-4)
+    assert len(fitter.fit_constraints()) == 1
+
+
+def test_read_memmap_is_view(tmp_path):
+    # When
+    values = np.memmap(tmp_path / 'data.dat', dtype='float64', mode='w+', shape=(4, 3))
+    values[:] = np.arange(12.0).reshape(4, 3)
+    data = xr.DataArray(values, dims=['x', 'y'])
+
+    # Then
+    plan = FitPlan(data, lambda x: x[:, 0])
+
+    # Expect
+    assert np.shares_memory(plan.observations, values)
+
+
+def test_read_blocks(data_array, monkeypatch):
+    # When
+    import easyscience.Datasets.fit_plan
+
+    monkeypatch.setattr(easyscience.Datasets.fit_plan, 'READ_BLOCK_SIZE', 5)
+    plan = FitPlan(data_array, lambda x: x[:, 0])
+    blocks = []
+
+    def func(block):
+        blocks.append(block.shape)
+        return 2 * block
+
+    # Then
+    result = plan.read(data_array.transpose('y', 'x'), func)
+
+    # Expect
+    assert blocks == [(1, 3), (1, 3), (1, 3), (1, 3)]
+    assert np.allclose(result, 2 * data_array.values.ravel())
+
+
+@pytest.mark.parametrize('chunks', [None, 2])
+def test_evaluate_into_out(data_array, chunks):
+    # When
+    plan = FitPlan(data_array, lambda x: x[:, 0] + 10 * x[:, 1], chunks=chunks)
+    buffer = np.zeros(plan.size + 2)
+
+    # Then
+    result = plan.evaluate(out=buffer[1:-1])
+
+    # Expect
+    assert np.shares_memory(result, buffer)
+    assert np.allclose(buffer[1:-1], data_array.values.ravel())
+    assert buffer[0] == 0 and buffer[-1] == 0
+    plan.close()
+
+
+@pytest.mark.parametrize('chunks', [None, 1, 3])
+def test_mask_invalid(data_array, chunks):
+    # When
+    data_array = data_array.copy()
+    data_array[1, 1] = np.nan
+    evaluated = []
+
+    def func(x):
+        evaluated.append(len(x))
+        return x[:, 0] + 10 * x[:, 1]
+
+    plan = FitPlan(data_array, func, chunks=chunks, workers=1)
+    weights = np.ones(12)
+    weights[0] = np.nan
+
+    # Then
+    weights = plan.mask_invalid(weights)
+    result = plan.evaluate()
+
+    # Expect
+    assert plan.n_points == 10
+    assert np.array_equal(plan.valid, [1, 2, 3, 5, 6, 7, 8, 9, 10, 11])
+    assert weights.size == 10
+    assert sum(evaluated) == 10
+    assert np.allclose(result, plan.observations)
+    expanded = plan.to_data_array(result)
+    assert np.isnan(expanded.values[0, 0]) and np.isnan(expanded.values[1, 1])
+    plan.close()
+
+
+@pytest.mark.parametrize('weight', [0.0, np.inf])
+def test_mask_invalid_weights_raise(data_array, weight):
+    # When
+    plan = FitPlan(data_array, lambda x: x[:, 0])
+    weights = np.ones(12)
+    weights[0] = weight
+
+    # Expect
+    with pytest.raises(ValueError):
+        plan.mask_invalid(weights)
+
+
+def test_mask_invalid_vectorized(data_array):
+    # When
+    data_array = data_array.copy()
+    data_array[0, 2] = np.nan
+    plan = FitPlan(data_array, lambda x: x[..., 0] + 10 * x[..., 1], vectorize=True)
+
+    # Then
+    assert plan.mask_invalid() is None
+    result = plan.evaluate()
+
+    # Expect
+    assert result.size == 11
+    assert plan.fit_points.shape == (11, 2)
+    assert np.allclose(result, plan.observations)
+
+
+def test_mask_invalid_postcompute(data_array):
+    # When
+    data_array = data_array.copy()
+    data_array[0, 0] = np.nan
+    received = []
+
+    def postcompute(result):
+        received.append(result.shape)
+        return result
+
+    plan = FitPlan(data_array, lambda x: x[:, 0] + 10 * x[:, 1], postcompute_func=postcompute)
+
+    # Then
+    plan.mask_invalid()
+    result = plan.evaluate()
+
+    # Expect
+    assert received == [(4, 3)]
+    assert np.allclose(result, plan.observations)
+
+
+def test_mask_invalid_all_valid(data_array):
+    # When
+    plan = FitPlan(data_array, lambda x: x[:, 0])
+    weights = np.ones(12)
+
+    # Then
+    result = plan.mask_invalid(weights)
+
+    # Expect
+    assert result is weights
+    assert plan.valid is None
+    assert plan.fit_points is plan.points
@@ -0,0 +1,229 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+import easyscience.Datasets.xarray  # noqa: F401
+from easyscience.fitting import Fitter
+from easyscience.models.polynomial import Line
+
+
+@pytest.fixture
+def dataset():
+    ds = xr.Dataset()
+    ds.easyscience.add_coordinate('x', np.linspace(0, 10, 20), unit='s')
+    return ds
+
+
+def test_add_memmap_variable(dataset, tmp_path):
+    # When
+    filename = tmp_path / 'data.dat'
+    (3.0 * dataset.x.values + 2.0).tofile(filename)
+
+    # Then
+    dataset.easyscience.add_memmap_variable('y', 'x', str(filename), auto_sigma=True)
+
+    # Expect
+    assert isinstance(dataset['y'].variable._data, np.memmap)
+    assert np.allclose(dataset['y'].values, 3.0 * dataset.x.values + 2.0)
+    assert 's_y' not in dataset
+
+
+def test_add_memmap_variable_unknown_coordinate(dataset, tmp_path):
+    # Expect
+    with pytest.raises(ValueError):
+        dataset.easyscience.add_memmap_variable('y', 'q', str(tmp_path / 'data.dat'))
+
+
+def test_load_variables(dataset, tmp_path):
+    # When
+    filename = tmp_path / 'data.nc'
+    source = xr.Dataset(coords={'x': dataset.x.values, 'z': np.arange(3.0)})
+    source['y'] = ('x', 3.0 * dataset.x.values + 2.0, {'units': 'm'})
+    source['w'] = (('x', 'z'), np.ones((20, 3)))
+    source.to_netcdf(filename, engine='scipy')
+
+    # Then
+    dataset.easyscience.load_variables(str(filename), engine='scipy', auto_sigma=True)
+
+    # Expect
+    assert set(dataset.data_vars) == {'y', 'w'}
+    assert 'z' in dataset.coords
+    assert str(dataset.attrs['units']['y']) == 'meter'
+    assert np.allclose(dataset['y'].values, 3.0 * dataset.x.values + 2.0)
+
+
+def test_load_variables_close(dataset, tmp_path, monkeypatch):
+    # When
+    filename = tmp_path / 'data.nc'
+    xr.Dataset({'y': ('x', 3.0 * dataset.x.values)}, coords={'x': dataset.x.values}).to_netcdf(filename, engine='scipy')
+    sources = []
+    open_dataset = xr.open_dataset
+
+    def spy(*args, **kwargs):
+        sources.append(open_dataset(*args, **kwargs))
+        return sources[-1]
+
+    monkeypatch.setattr(xr, 'open_dataset', spy)
+    dataset.easyscience.load_variables(str(filename), engine='scipy')
+
+    # Then
+    dataset.easyscience.close()
+
+    # Expect
+    assert len(sources) == 1
+    assert sources[0]._close is None
+
+
+def test_fit_lazy_sigma(dataset, tmp_path):
+    # When
+    filename = tmp_path / 'data.dat'
+    (3.0 * dataset.x.values + 2.0).tofile(filename)
+    dataset.easyscience.add_memmap_variable('y', 'x', str(filename), variable_sigma=lambda y: np.sqrt(y))
+    line = Line(1.0, 0.0)
+    fitter = Fitter(line, line)
+
+    # Then
+    result = dataset.easyscience.fit(fitter, ['y'])
+
+    # Expect
+    assert result.success
+    assert line.m.raw_value == pytest.approx(3.0)
+    assert line.c.raw_value == pytest.approx(2.0)
+    assert np.allclose(result.y_err.values, np.sqrt(3.0 * dataset.x.values + 2.0))
+
+
+def test_fit_multiple(dataset):
+    # When
+    dataset.easyscience.add_coordinate('z', np.arange(3.0))
+    dataset.easyscience.add_variable('a', ['x'], 3.0 * dataset.x.values + 2.0)
+    values = np.repeat((3.0 * dataset.x.values + 2.0)[:, np.newaxis], 3, axis=1)
+    dataset.easyscience.add_variable('b', ['x', 'z'], values)
+    line = Line(1.0, 0.0)
+    fitter = Fitter(line, lambda x: line(x[:, 0]) if x.ndim > 1 else line(x))
+
+    # Then
+    results = dataset.easyscience.fit(fitter, ['a', 'b'])
+
+    # Expect
+    assert line.m.raw_value == pytest.approx(3.0)
+    assert line.c.raw_value == pytest.approx(2.0)
+    assert [result.y_calc.dims for result in results] == [('x',), ('x', 'z')]
+    assert np.allclose(results[1].y_calc.values, values)
+    assert np.allclose(results[1].residual.values, 0, atol=1e-6)
+
+
+def test_fit_nan_sigma(dataset):
+    # When
+    values = 3.0 * dataset.x.values + 2.0
+    sigma = np.ones_like(values)
+    sigma[3] = np.nan
+    values[5] = np.nan
+    dataset.easyscience.add_variable('y', ['x'], values, variable_sigma=sigma)
+    line = Line(1.0, 0.0)
+    fitter = Fitter(line, line)
+
+    # Then
+    result = dataset.easyscience.fit(fitter, ['y'])
+
+    # Expect
+    assert line.m.raw_value == pytest.approx(3.0)
+    assert line.c.raw_value == pytest.approx(2.0)
+    assert np.isnan(result.y_calc.values[3]) and np.isnan(result.y_calc.values[5])
+    assert np.isnan(dataset['s_y'].values[3])
+
+
+def test_fit_zero_sigma(dataset):
+    # When
+    values = 3.0 * dataset.x.values + 2.0
+    sigma = np.ones_like(values)
+    sigma[3] = 0.0
+    dataset.easyscience.add_variable('y', ['x'], values, variable_sigma=sigma)
+    line = Line(1.0, 0.0)
+    fitter = Fitter(line, line)
+
+    # Expect
+    with pytest.raises(ValueError):
+        dataset.easyscience.fit(fitter, ['y'])
+
+
+def test_fit_multiple_masked(dataset):
+    # When
+    values = 3.0 * dataset.x.values + 2.0
+    values[0] = np.nan
+    dataset.easyscience.add_variable('a', ['x'], values, auto_sigma=True)
+    dataset.easyscience.add_variable('b', ['x'], 3.0 * dataset.x.values + 2.0, auto_sigma=True, lazy_sigma=True)
+    line = Line(1.0, 0.0)
+    fitter = Fitter(line, line)
+
+    # Then
+    results = dataset.easyscience.fit(fitter, ['a', 'b'])
+
+    # Expect
+    assert line.m.raw_value == pytest.approx(3.0)
+    assert np.isnan(results[0].y_calc.values[0])
+    assert np.allclose(results[1].y_err.values, np.sqrt(3.0 * dataset.x.values + 2.0))
+
+
+def test_append_frames(dataset):
+    # When
+    dataset.easyscience.add_coordinate('t', np.arange(2.0))
+    frames = np.arange(40.0).reshape(20, 2)
+    dataset.easyscience.add_variable('y', ['x', 't'], frames)
+    calls = []
+
+    def sigma_func(values):
+        calls.append(values.shape)
+        return np.sqrt(values)
+
+    dataset.easyscience.sigma_generator('y', sigma_func)
+    dataset.easyscience.add_derived_variable('y2', 'y', lambda values: 2 * values)
+
+    # Then
+    new_frames = np.arange(60.0).reshape(20, 3) + 40
+    dataset.easyscience.append_frames('t', [2.0, 3.0, 4.0], {'y': new_frames})
+
+    # Expect
+    assert calls == [(20, 2), (20, 3)]
+    assert np.array_equal(dataset.t.values, np.arange(5.0))
+    assert np.array_equal(dataset['y'].values, np.concatenate([frames, new_frames], axis=1))
+    assert np.allclose(dataset['s_y'].values, np.sqrt(dataset['y'].values))
+    assert np.allclose(dataset['y2'].values, 2 * dataset['y'].values)
+
+
+def test_append_frames_grows_in_place(dataset):
+    # When
+    dataset.easyscience.add_coordinate('t', np.arange(1.0))
+    dataset.easyscience.add_variable('y', ['t', 'x'], np.zeros((1, 20)))
+    dataset.easyscience.append_frames('t', [1.0], {'y': np.ones((1, 20))})
+    buffer = dataset['y'].variable._data.base
+
+    # Then
+    dataset.easyscience.append_frames('t', [2.0], {'y': np.full((1, 20), 2.0)})
+    in_place = dataset['y'].variable._data.base is buffer
+    dataset['y'] = dataset['y'].copy()
+    dataset.easyscience.append_frames('t', [3.0], {'y': np.full((1, 20), 3.0)})
+
+    # Expect
+    assert in_place
+    assert dataset['y'].variable._data.base is not buffer
+    assert np.array_equal(dataset['y'].values, np.repeat(np.arange(4.0)[:, None], 20, axis=1))
+    assert np.array_equal(dataset.t.values, np.arange(4.0))
+
+
+def test_append_frames_missing(dataset):
+    # When
+    dataset.easyscience.add_coordinate('t', np.arange(2.0))
+    dataset.easyscience.add_variable('y', ['t'], np.ones(2))
+    dataset.easyscience.sigma_attach('y', np.ones(2))
+
+    # Expect
+    with pytest.raises(ValueError):
+        dataset.easyscience.append_frames('t', [2.0], {'y': np.ones(1)})
+
+
+def test_units_are_shared(dataset):
+    # When
+    dataset.easyscience.add_variable('a', ['x'], np.ones(20), unit='s')
+
+    # Expect
+    assert dataset.attrs['units']['a'] is dataset.attrs['units']['x']
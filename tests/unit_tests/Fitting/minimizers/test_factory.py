@@ -18,7 +18,7 @@ class TestFactory:
         assert minimizer._method == minimizer_method
         assert minimizer.package == 'lmfit'
 
-    @pytest.mark.parametrize('minimizer_method,minimizer_enum', [('amoeba', AvailableMinimizers.Bumps), ('amoeba', AvailableMinimizers.Bumps_simplex), ('newton', AvailableMinimizers.Bumps_newton), ('lm', AvailableMinimizers.Bumps_lm)])
+    @pytest.mark.parametrize('minimizer_method,minimizer_enum', [('amoeba', AvailableMinimizers.Bumps), ('amoeba', AvailableMinimizers.Bumps_simplex), ('newton', AvailableMinimizers.Bumps_newton), ('lm', AvailableMinimizers.Bumps_lm), ('dream', AvailableMinimizers.Bumps_dream)])
     def test_factory_bumps_fit(self, minimizer_method, minimizer_enum):
         minimizer = self.pull_minminizer(minimizer_enum)
         assert minimizer._method == minimizer_method
@@ -30,13 +30,19 @@ class TestFactory:
         assert minimizer._method == minimizer_method
         assert minimizer.package == 'dfo'
 
+    @pytest.mark.parametrize('minimizer_method,minimizer_enum', [('svd', AvailableMinimizers.Linear), ('svd', AvailableMinimizers.Linear_svd), ('qr', AvailableMinimizers.Linear_qr)])
+    def test_factory_linear_fit(self, minimizer_method, minimizer_enum):
+        minimizer = self.pull_minminizer(minimizer_enum)
+        assert minimizer._method == minimizer_method
+        assert minimizer.package == 'linear'
+
 
 @pytest.mark.parametrize('minimizer_name,expected', [('LMFit', AvailableMinimizers.LMFit), ('LMFit_leastsq', AvailableMinimizers.LMFit_leastsq), ('LMFit_powell', AvailableMinimizers.LMFit_powell), ('LMFit_cobyla', AvailableMinimizers.LMFit_cobyla), ('LMFit_differential_evolution', AvailableMinimizers.LMFit_differential_evolution), ('LMFit_scipy_least_squares', AvailableMinimizers.LMFit_scipy_least_squares) ])
 def test_from_string_to_enum_lmfit(minimizer_name, expected):
     assert from_string_to_enum(minimizer_name) == expected
 
 
-@pytest.mark.parametrize('minimizer_name,expected', [('Bumps', AvailableMinimizers.Bumps), ('Bumps_simplex', AvailableMinimizers.Bumps_simplex), ('Bumps_newton', AvailableMinimizers.Bumps_newton), ('Bumps_lm', AvailableMinimizers.Bumps_lm)])
+@pytest.mark.parametrize('minimizer_name,expected', [('Bumps', AvailableMinimizers.Bumps), ('Bumps_simplex', AvailableMinimizers.Bumps_simplex), ('Bumps_newton', AvailableMinimizers.Bumps_newton), ('Bumps_lm', AvailableMinimizers.Bumps_lm), ('Bumps_dream', AvailableMinimizers.Bumps_dream)])
 def test_from_string_to_enum_bumps(minimizer_name, expected):
     assert from_string_to_enum(minimizer_name) == expected
 
@@ -46,6 +52,11 @@ def test_from_string_to_enum_dfo(minimizer_name, expected):
     assert from_string_to_enum(minimizer_name) == expected
 
 
+@pytest.mark.parametrize('minimizer_name,expected', [('Linear', AvailableMinimizers.Linear), ('Linear_svd', AvailableMinimizers.Linear_svd), ('Linear_qr', AvailableMinimizers.Linear_qr)])
+def test_from_string_to_enum_linear(minimizer_name, expected):
+    assert from_string_to_enum(minimizer_name) == expected
+
+
 def test_available_minimizers():
     assert AvailableMinimizers.LMFit
     assert AvailableMinimizers.LMFit_leastsq
@@ -57,6 +68,10 @@ def test_available_minimizers():
     assert AvailableMinimizers.Bumps_simplex
     assert AvailableMinimizers.Bumps_newton
     assert AvailableMinimizers.Bumps_lm
+    assert AvailableMinimizers.Bumps_dream
     assert AvailableMinimizers.DFO
     assert AvailableMinimizers.DFO_leastsq
-    assert len(AvailableMinimizers) == 12
\ No newline at end of file
+    assert AvailableMinimizers.Linear
+    assert AvailableMinimizers.Linear_svd
+    assert AvailableMinimizers.Linear_qr
+    assert len(AvailableMinimizers) == 16
\ No newline at end of file
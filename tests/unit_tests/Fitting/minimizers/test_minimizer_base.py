@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 
 from unittest.mock import MagicMock
 
@@ -7,7 +8,10 @@ from inspect import Signature
 from inspect import _empty
 
 from easyscience.fitting.minimizers.minimizer_base import MinimizerBase
+from easyscience.fitting.minimizers.utils import EvaluationCache
 from easyscience.fitting.minimizers.utils import FitError
+from easyscience.fitting.minimizers.utils import FitResults
+from easyscience.fitting.minimizers.utils import correlation_from_covariance
 from easyscience.Objects.new_variable import Parameter
 
 class TestMinimizerBase():
@@ -47,6 +51,7 @@ class TestMinimizerBase():
         assert minimizer._cached_model == None
         assert minimizer._fit_function == None
         assert minimizer._constraints == []
+        assert minimizer._evaluation_cache == None
     
     def test_enum(self, minimizer: MinimizerBase):
         assert minimizer.enum == self._mock_minimizer_enum
@@ -209,3 +214,340 @@ class TestMinimizerBase():
         with pytest.raises(FitError):
             result = minimizer._get_method_kwargs('not_supported_method')
 
+
+    def test_enable_disable_evaluation_cache(self, minimizer: MinimizerBase) -> None:
+        # When Then
+        cache = minimizer.enable_evaluation_cache(10)
+
+        # Expect
+        assert minimizer.evaluation_cache is cache
+        assert cache.maxsize == 10
+        minimizer.disable_evaluation_cache()
+        assert minimizer.evaluation_cache is None
+
+    def test_evaluation_cache_exception(self, minimizer: MinimizerBase) -> None:
+        # When Then Expect
+        with pytest.raises(TypeError):
+            minimizer.evaluation_cache = 'not a cache'
+
+    def test_generate_fit_function_cached(self, minimizer: MinimizerBase) -> None:
+        # When
+        minimizer._original_fit_function = MagicMock(return_value='fit_function_result')
+        minimizer.fit_constraints = MagicMock(return_value=[])
+        minimizer._object = MagicMock()
+        mock_parm_1 = MagicMock(Parameter)
+        mock_parm_1.unique_name = 'mock_parm_1'
+        mock_parm_1.value = 1.0
+        mock_parm_1.error = 0.1
+        minimizer._object.get_fit_parameters = MagicMock(return_value=[mock_parm_1])
+        cache = minimizer.enable_evaluation_cache(2)
+        x = [10.0]
+
+        # Then
+        fit_function = minimizer._generate_fit_function()
+        fit_function(x, pmock_parm_1=2.0)
+        fit_function(x, pmock_parm_1=2.0)
+        fit_function([10.0], pmock_parm_1=2.0)
+
+        # Expect
+        assert minimizer._original_fit_function.call_count == 2
+        assert cache.cache_info() == (1, 2, 2, 2)
+
+    def test_generate_fit_function_clears_cache(self, minimizer: MinimizerBase) -> None:
+        # When
+        minimizer._object = MagicMock()
+        minimizer._object.get_fit_parameters = MagicMock(return_value=[])
+        cache = minimizer.enable_evaluation_cache()
+        cache.put('key', 'x', 'result')
+
+        # Then
+        minimizer._generate_fit_function()
+
+        # Expect
+        assert len(cache) == 0
+
+    def test_evaluate_cached_fixed_parameter_changed(self, minimizer: MinimizerBase) -> None:
+        # When
+        free = Parameter(name='free', value=1.0)
+        fixed = Parameter(name='fixed', value=2.0, fixed=True)
+        minimizer._original_fit_function = lambda x: free.value * x + fixed.value
+        minimizer._object = MagicMock()
+        minimizer._object.get_fit_parameters = MagicMock(return_value=[free])
+        minimizer.enable_evaluation_cache()
+        x = np.array([1.0, 2.0])
+        first = minimizer.evaluate(x)
+
+        # Then
+        first[0] = 100.0
+        fixed.value = 3.0
+        second = minimizer.evaluate(x)
+
+        # Expect
+        assert np.array_equal(second, [4.0, 5.0])
+
+    def test_covariance_from_jacobian(self, minimizer: MinimizerBase) -> None:
+        # When
+        jacobian = np.array([[1.0, 0.0], [0.0, 2.0], [1.0, 1.0], [0.0, 1.0]])
+        residuals = np.array([1.0, -1.0, 1.0, -1.0])
+
+        # Then
+        covariance = minimizer._covariance_from_jacobian(jacobian, residuals)
+
+        # Expect
+        expected = np.linalg.inv(jacobian.T @ jacobian) * 4 / 2
+        assert np.allclose(covariance, expected)
+
+    def test_covariance_from_jacobian_singular(self, minimizer: MinimizerBase) -> None:
+        # When Then Expect
+        assert minimizer._covariance_from_jacobian(np.zeros((3, 2)), np.ones(3)) is None
+
+    def test_error_from_jacobian(self, minimizer: MinimizerBase) -> None:
+        # When
+        from scipy import stats
+
+        jacobian = np.array([[1.0, 0.0], [0.0, 2.0], [1.0, 1.0]])
+        residuals = np.array([0.5, -1.0, 2.0])
+
+        # Then
+        error_matrix = minimizer._error_from_jacobian(jacobian, residuals)
+
+        # Expect
+        JtJi = np.linalg.inv(jacobian.T @ jacobian)
+        expected = JtJi @ jacobian.T @ np.diag(residuals**2) @ jacobian @ JtJi
+        assert np.allclose(error_matrix, stats.norm.pdf(0.975) * np.sqrt(expected))
+
+    def test_evaluate_batch(self, minimizer: MinimizerBase) -> None:
+        # When
+        minimizer._fit_function = MagicMock(side_effect=lambda x, pa, pb: np.array([pa, pb]))
+        minimizer._cached_pars = {'a': MagicMock(), 'b': MagicMock()}
+        minimizer._prepare_parameters = MagicMock(return_value={'pa': 1.0, 'pb': 2.0})
+        minimizer._restore_parameters = MagicMock()
+
+        # Then
+        result = minimizer.evaluate_batch('x', np.array([[3.0, 4.0], [5.0, 6.0]]))
+
+        # Expect
+        assert np.all(result == [[3.0, 4.0], [5.0, 6.0]])
+        minimizer._restore_parameters.assert_called_once_with({'pa': 1.0, 'pb': 2.0})
+
+    def test_evaluate_batch_restores_on_exception(self, minimizer: MinimizerBase) -> None:
+        # When
+        minimizer._fit_function = MagicMock(side_effect=RuntimeError)
+        minimizer._cached_pars = {'a': MagicMock()}
+        minimizer._prepare_parameters = MagicMock(return_value={'pa': 1.0})
+        minimizer._restore_parameters = MagicMock()
+
+        # Then
+        with pytest.raises(RuntimeError):
+            minimizer.evaluate_batch('x', np.array([[3.0]]))
+
+        # Expect
+        minimizer._restore_parameters.assert_called_once_with({'pa': 1.0})
+
+    def test_evaluate_batch_vectorized(self, minimizer: MinimizerBase) -> None:
+        # When
+        minimizer._fit_function = MagicMock()
+        minimizer._cached_pars = {'a': MagicMock()}
+        mock_object = MagicMock()
+        mock_object.batch_call = MagicMock(side_effect=lambda x, sets: sets * 2)
+        minimizer._object = mock_object
+        minimizer._original_fit_function = mock_object
+
+        # Then
+        result = minimizer.evaluate_batch('x', np.array([[1.0], [2.0], [3.0]]), chunk_size=2)
+
+        # Expect
+        assert np.all(result == [[2.0], [4.0], [6.0]])
+        assert mock_object.batch_call.call_count == 2
+        minimizer._fit_function.assert_not_called()
+
+    def test_evaluate_batch_exception(self, minimizer: MinimizerBase) -> None:
+        # When
+        minimizer._fit_function = MagicMock()
+        minimizer._cached_pars = {'a': MagicMock()}
+
+        # Then Expect
+        with pytest.raises(ValueError):
+            minimizer.evaluate_batch('x', np.array([[1.0, 2.0]]))
+
+    def test_batch_call_other_fit_function(self, minimizer: MinimizerBase) -> None:
+        # When
+        minimizer._object = MagicMock()
+        minimizer._original_fit_function = MagicMock()
+
+        # Then Expect
+        assert minimizer._batch_call() is None
+
+    def test_batch_call_fit_constraints(self, minimizer: MinimizerBase) -> None:
+        # When
+        mock_object = MagicMock()
+        minimizer._object = mock_object
+        minimizer._original_fit_function = mock_object
+
+        # Then
+        minimizer.add_fit_constraint(MagicMock())
+
+        # Expect
+        assert minimizer._batch_call() is None
+
+    def test_restore_parameters(self, minimizer: MinimizerBase) -> None:
+        # When
+        mock_parm_1 = MagicMock(Parameter)
+        mock_parm_1.value = 1.0
+        mock_parm_2 = MagicMock(Parameter)
+        mock_parm_2.value = 5.0
+        minimizer._cached_pars = {'a': mock_parm_1, 'b': mock_parm_2}
+        mock_constraint = MagicMock()
+        minimizer.fit_constraints = MagicMock(return_value=[mock_constraint])
+
+        # Then
+        minimizer._restore_parameters({'pa': 1.0, 'pb': 2.0})
+
+        # Expect
+        assert mock_parm_1.value == 1.0
+        assert mock_parm_2.value == 2.0
+        mock_constraint.assert_called_once_with()
+
+
+class TestFitResults():
+    def test_chi2(self):
+        # When
+        results = FitResults()
+        results.p = {'pa': 1.0}
+        results.y_obs = np.array([[1.0, 2.0], [3.0, 4.0]])
+        results.y_calc = np.array([[1.0, 1.0], [3.0, 6.0]])
+        results.y_err = np.array([[1.0, 1.0], [1.0, 2.0]])
+
+        # Then Expect
+        assert results.chi2 == 2.0
+        assert results.reduced_chi == 2.0 / 3
+
+    def test_set_covariance(self):
+        # When
+        results = FitResults()
+
+        # Then
+        results.set_covariance(np.array([[4.0, 1.0], [1.0, 1.0]]))
+
+        # Expect
+        assert np.allclose(results.correlation, [[1.0, 0.5], [0.5, 1.0]])
+        results.set_covariance(None)
+        assert results.correlation is None
+
+    def test_correlation_from_covariance_zero_variance(self):
+        # When Then
+        correlation = correlation_from_covariance(np.array([[1.0, 0.0], [0.0, 0.0]]))
+
+        # Expect
+        assert correlation[0, 0] == 1.0
+        assert np.isnan(correlation[1, 1])
+
+
+class TestEvaluationCache():
+    def test_init_exception(self):
+        # When Then Expect
+        with pytest.raises(ValueError):
+            EvaluationCache(0)
+
+    def test_get_put(self):
+        # When
+        cache = EvaluationCache(2)
+        x = [1.0]
+        key = cache.make_key(x, [1.0, 2.0])
+
+        # Then
+        miss = cache.get(key, x)
+        cache.put(key, x, 'result')
+        hit = cache.get(key, x)
+
+        # Expect
+        assert miss is None
+        assert hit == 'result'
+        assert cache.cache_info() == (1, 1, 2, 1)
+
+    def test_get_returns_copy(self):
+        # When
+        cache = EvaluationCache(2)
+        x = [1.0]
+        key = cache.make_key(x, [1.0])
+        result = np.array([1.0, 2.0])
+        cache.put(key, x, result)
+
+        # Then
+        result[0] = 10.0
+        cache.get(key, x)[1] = 20.0
+
+        # Expect
+        assert np.array_equal(cache.get(key, x), [1.0, 2.0])
+
+    def test_get_other_x_same_id(self):
+        # When
+        cache = EvaluationCache(2)
+        x = [1.0]
+        key = cache.make_key(x, [1.0])
+        cache.put(key, x, 'result')
+
+        # Then Expect
+        assert cache.get(key, [1.0]) is None
+
+    def test_lru_eviction(self):
+        # When
+        cache = EvaluationCache(2)
+        x = [1.0]
+        keys = [cache.make_key(x, [value]) for value in range(3)]
+        cache.put(keys[0], x, 0)
+        cache.put(keys[1], x, 1)
+        cache.get(keys[0], x)
+
+        # Then
+        cache.put(keys[2], x, 2)
+
+        # Expect
+        assert cache.get(keys[1], x) is None
+        assert cache.get(keys[0], x) == 0
+        assert cache.get(keys[2], x) == 2
+        assert len(cache) == 2
+
+    def test_clear_keeps_statistics(self):
+        # When
+        cache = EvaluationCache()
+        x = [1.0]
+        key = cache.make_key(x, [1.0])
+        cache.put(key, x, 'result')
+        cache.get(key, x)
+
+        # Then
+        cache.clear()
+
+        # Expect
+        assert len(cache) == 0
+        assert cache.hits == 1
+
+
+def test_design_matrix_linear_model():
+    # When
+    from easyscience.fitting import Fitter
+    from easyscience.models.polynomial import Polynomial
+
+    polynomial = Polynomial(coefficients=[1.0, 2.0, 3.0])
+    polynomial.coefficients[0].max = 1.5
+    x = np.linspace(0, 1, 5)
+
+    # Then
+    values, jacobian = Fitter(polynomial, polynomial).design_matrix(x)
+
+    # Expect
+    assert np.allclose(values, np.polyval([1.0, 2.0, 3.0], x))
+    assert np.allclose(jacobian, np.column_stack([x**2, x, np.ones_like(x)]))
+    assert [c.raw_value for c in polynomial.coefficients] == [1.0, 2.0, 3.0]
+
+
+def test_design_steps_within_bounds():
+    # When
+    parameters = [MagicMock(min=-np.inf, max=np.inf), MagicMock(min=0.0, max=2.5), MagicMock(min=0.5, max=2.0)]
+
+    # Then
+    steps = MinimizerBase._design_steps(parameters, np.array([3.0, 2.0, 1.2]))
+
+    # Expect
+    assert np.array_equal(steps, [3.0, -2.0, 0.8])
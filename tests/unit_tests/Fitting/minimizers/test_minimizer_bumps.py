@@ -7,6 +7,8 @@ import easyscience.fitting.minimizers.minimizer_bumps
 
 from easyscience.fitting.minimizers.minimizer_bumps import Bumps
 from easyscience.fitting.minimizers.utils import FitError
+from easyscience.fitting.minimizers.utils import FitResults
+from easyscience.fitting.minimizers.utils import PosteriorSamples
 
 
 class TestBumpsFit():
@@ -37,7 +39,7 @@ class TestBumpsFit():
 
     def test_supported_methods(self, minimizer: Bumps) -> None:
         # When Then Expect
-        assert set(minimizer.supported_methods()) == set(['scipy.leastsq','newton', 'lm', 'amoeba'])
+        assert set(minimizer.supported_methods()) == set(['scipy.leastsq','newton', 'lm', 'amoeba', 'dream'])
 
     def test_fit(self, minimizer: Bumps, monkeypatch) -> None:
         # When
@@ -74,6 +76,57 @@ class TestBumpsFit():
         mock_FitProblem.assert_called_once_with(mock_model)
  
 
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_sample(self, minimizer: Bumps, workers, monkeypatch) -> None:
+        # When
+        mock_mapper = MagicMock()
+        mock_mapper_class = MagicMock(return_value=mock_mapper)
+        monkeypatch.setattr(easyscience.fitting.minimizers.minimizer_bumps, "_PoolMapper", mock_mapper_class)
+        mock_FitProblem = MagicMock(return_value='fit_problem')
+        monkeypatch.setattr(easyscience.fitting.minimizers.minimizer_bumps, "FitProblem", mock_FitProblem)
+
+        mock_model = MagicMock()
+        minimizer._make_model = MagicMock(return_value=MagicMock(return_value=mock_model))
+        fit_results = FitResults()
+        fit_results.engine_result = MagicMock()
+        draw = fit_results.engine_result.state.draw.return_value
+        draw.labels = ['pa', 'pb']
+        draw.points = np.array([[1.0, 2.0], [3.0, 4.0]])
+        draw.logp = np.array([-1.0, -2.0])
+        minimizer.fit = MagicMock(return_value=fit_results)
+
+        # Then
+        result = minimizer.sample(x=1.0, y=4.0, samples=100, burn=10, workers=workers)
+
+        # Expect
+        assert result.posterior.names == ['pa', 'pb']
+        assert np.all(result.posterior.mean == [2.0, 3.0])
+        minimizer_kwargs = minimizer.fit.call_args.kwargs['minimizer_kwargs']
+        assert minimizer.fit.call_args.kwargs['method'] == 'dream'
+        assert minimizer.fit.call_args.kwargs['model'] == mock_model
+        assert minimizer_kwargs['samples'] == 100
+        assert minimizer_kwargs['burn'] == 10
+        if workers == 1:
+            assert 'mapper' not in minimizer_kwargs
+            mock_mapper_class.assert_not_called()
+        else:
+            assert minimizer_kwargs['mapper'] == mock_mapper
+            mock_mapper_class.assert_called_once_with('fit_problem', 2)
+            mock_mapper.close.assert_called_once_with()
+
+    def test_posterior_samples_memmap(self, tmp_path) -> None:
+        # When
+        points = np.arange(6.0).reshape(3, 2)
+
+        # Then
+        posterior = PosteriorSamples(['pa', 'pb'], points, [-1.0, -2.0, -3.0], path=str(tmp_path / 'samples.npy'))
+
+        # Expect
+        assert isinstance(posterior.points, np.memmap)
+        assert posterior.n_samples == 3
+        assert np.all(np.load(tmp_path / 'samples.npy') == points)
+        assert np.all(posterior.std == points.std(axis=0))
+
     def test_make_model(self, minimizer: Bumps, monkeypatch) -> None:
         # When
         mock_fit_function = MagicMock(return_value=np.array([11, 22]))
@@ -125,12 +178,15 @@ class TestBumpsFit():
 
     def test_gen_fit_results(self, minimizer: Bumps, monkeypatch):
         # When
+        from scipy.optimize import OptimizeResult
+
         mock_domain_fit_results = MagicMock()
+        mock_domain_fit_results.reduced_chi = 2.0
         mock_FitResults = MagicMock(return_value=mock_domain_fit_results)
         monkeypatch.setattr(easyscience.fitting.minimizers.minimizer_bumps, "FitResults", mock_FitResults)
 
-        mock_fit_result = MagicMock()
-        mock_fit_result.success = True
+        # As returned by `bumps_fit` for a fitter without a sampled state
+        mock_fit_result = OptimizeResult(success=True, cov=np.array([[1.0, 0.5], [0.5, 2.0]]))
 
         mock_cached_model = MagicMock()
         mock_cached_model.x = 'x'
@@ -163,4 +219,52 @@ class TestBumpsFit():
         assert domain_fit_results.y_err == 'dy'
         assert str(domain_fit_results.minimizer_engine) == "<class 'easyscience.fitting.minimizers.minimizer_bumps.Bumps'>"
         assert domain_fit_results.fit_args is None
+        assert domain_fit_results.engine_result is mock_fit_result
+        assert np.allclose(domain_fit_results.set_covariance.call_args.args[0], [[2.0, 1.0], [1.0, 4.0]])
         minimizer.evaluate.assert_called_once_with('x', minimizer_parameters={'ppar_1': 'par_raw_value_1', 'ppar_2': 'par_raw_value_2'})
+
+    def test_covariance_from_result(self, minimizer: Bumps) -> None:
+        # When
+        from scipy.optimize import OptimizeResult
+
+        fit_result = OptimizeResult(cov=np.array([[1.0, 0.5], [0.5, 2.0]]))
+
+        # Then
+        covariance = minimizer._covariance_from_result(fit_result, 2.0)
+
+        # Expect
+        assert np.allclose(covariance, [[2.0, 1.0], [1.0, 4.0]])
+        assert minimizer._covariance_from_result(OptimizeResult(), 2.0) is None
+
+    def test_covariance_from_result_state(self, minimizer: Bumps) -> None:
+        # When
+        from scipy.optimize import OptimizeResult
+
+        points = np.array([[1.0, 2.0], [2.0, 1.0], [3.0, 3.0]])
+        state = MagicMock()
+        state.draw.return_value.points = points
+
+        # Then
+        covariance = minimizer._covariance_from_result(OptimizeResult(state=state), 2.0)
+
+        # Expect
+        assert np.allclose(covariance, np.cov(points, rowvar=False))
+
+    @pytest.mark.parametrize("verbose", [False, True])
+    def test_bumps_fit_verbose(self, verbose, capsys) -> None:
+        # When
+        from bumps.names import Curve
+        from bumps.names import FitProblem
+
+        from easyscience.fitting.minimizers.minimizer_bumps import bumps_fit
+
+        x = np.linspace(0, 1, 10)
+        curve = Curve(lambda x, m: m * x, x, 2.0 * x, np.ones(10), m=1.0)
+        curve.m.range(0, 5)
+
+        # Then
+        result = bumps_fit(FitProblem(curve), method='lm', verbose=verbose)
+
+        # Expect
+        assert result.x == pytest.approx([2.0])
+        assert ('final chisq' in capsys.readouterr().out) is verbose
@@ -153,6 +153,9 @@ class TestDFOFit():
 
         mock_fit_result = MagicMock()
         mock_fit_result.flag = False
+        mock_fit_result.jacobian = 'jacobian'
+        mock_fit_result.resid = 'resid'
+        minimizer._covariance_from_jacobian = MagicMock(return_value='covariance')
 
         mock_cached_model = MagicMock()
         mock_cached_model.x = 'x'
@@ -184,6 +187,8 @@ class TestDFOFit():
         assert str(domain_fit_results.minimizer_engine) == "<class 'easyscience.fitting.minimizers.minimizer_dfo.DFO'>"
         assert domain_fit_results.fit_args is None
         minimizer.evaluate.assert_called_once_with('x', minimizer_parameters={'ppar_1': 'par_raw_value_1', 'ppar_2': 'par_raw_value_2'})
+        minimizer._covariance_from_jacobian.assert_called_once_with('jacobian', 'resid')
+        domain_fit_results.set_covariance.assert_called_once_with('covariance')
 
     def test_dfo_fit(self, minimizer: DFO, monkeypatch):
         # When
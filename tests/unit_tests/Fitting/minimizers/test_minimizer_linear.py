@@ -0,0 +1,143 @@
+import pytest
+
+from unittest.mock import MagicMock
+import numpy as np
+
+from easyscience.fitting import AvailableMinimizers
+from easyscience.fitting import Fitter
+from easyscience.fitting.minimizers.minimizer_linear import Linear
+from easyscience.fitting.minimizers.utils import FitError
+from easyscience.models.polynomial import Line
+from easyscience.models.polynomial import Polynomial
+
+
+class TestLinearFit():
+    @pytest.fixture
+    def minimizer(self) -> Linear:
+        minimizer = Linear(
+            obj='obj',
+            fit_function='fit_function',
+            minimizer_enum=MagicMock(package='linear', method='svd')
+        )
+        return minimizer
+
+    def test_init(self, minimizer: Linear) -> None:
+        assert minimizer._p_0 == {}
+        assert minimizer.package == 'linear'
+
+    def test_init_exception(self) -> None:
+        with pytest.raises(FitError):
+            Linear(
+                obj='obj',
+                fit_function='fit_function',
+                minimizer_enum=MagicMock(package='linear', method='leastsq')
+            )
+
+    def test_supported_methods(self, minimizer: Linear) -> None:
+        # When Then Expect
+        assert minimizer.supported_methods() == ['svd', 'qr']
+
+    @pytest.mark.parametrize('minimizer_enum', [AvailableMinimizers.Linear_svd, AvailableMinimizers.Linear_qr])
+    def test_fit_polynomial(self, minimizer_enum) -> None:
+        # When
+        x = np.linspace(-2, 2, 50)
+        y = np.polyval([0.5, -1.0, 2.0], x) + 0.01 * np.sin(7 * x)
+        weights = np.full_like(x, 10.0)
+        polynomial = Polynomial(coefficients=[1.0, 1.0, 1.0])
+        fitter = Fitter(polynomial, polynomial)
+        fitter.switch_minimizer(minimizer_enum)
+
+        # Then
+        result = fitter.fit(x, y, weights=weights)
+
+        # Expect
+        expected, covariance = np.polyfit(x, y, 2, w=weights, cov='unscaled')
+        design = np.column_stack([x**2, x, np.ones_like(x)]) * weights[:, np.newaxis]
+        residual = (y - np.polyval(expected, x)) * weights
+        covariance = np.linalg.inv(design.T @ design) * (residual @ residual) / (x.size - 3)
+        assert result.success
+        assert [c.raw_value for c in polynomial.coefficients] == pytest.approx(expected)
+        assert [c.error for c in polynomial.coefficients] == pytest.approx(np.sqrt(np.diag(covariance)))
+        assert result.covariance == pytest.approx(covariance)
+        assert result.y_calc == pytest.approx(np.polyval(expected, x))
+        assert result.chi2 == pytest.approx(residual @ residual)
+
+    def test_fit_line_matches_lmfit(self) -> None:
+        # When
+        x = np.linspace(1, 10, 20)
+        y = 3.0 * x + 2.0 + np.cos(x)
+        line = Line(1.0, 0.0)
+        fitter = Fitter(line, line)
+        reference = fitter.fit(x, y)
+        m, c = line.m.raw_value, line.c.raw_value
+        line.m.value, line.c.value = 1.0, 0.0
+
+        # Then
+        fitter.switch_minimizer(AvailableMinimizers.Linear)
+        result = fitter.fit(x, y)
+
+        # Expect
+        assert line.m.raw_value == pytest.approx(m)
+        assert line.c.raw_value == pytest.approx(c)
+        assert result.chi2 == pytest.approx(reference.chi2)
+        assert result.p0 == {f'p{line.m.unique_name}': 1.0, f'p{line.c.unique_name}': 0.0}
+
+    def test_fit_bounds(self) -> None:
+        # When
+        x = np.linspace(1, 10, 20)
+        line = Line(1.0, 0.0)
+        line.c.max = 1.0
+        fitter = Fitter(line, line)
+        fitter.switch_minimizer(AvailableMinimizers.Linear)
+
+        # Then
+        fitter.fit(x, 3.0 * x + 2.0, weights=np.ones_like(x))
+
+        # Expect
+        assert line.c.raw_value == pytest.approx(1.0)
+        assert line.m.raw_value == pytest.approx(3.0 + 1.0 * (x.mean() / (x**2).mean()), rel=1e-3)
+
+    def test_fit_checks_linearity(self) -> None:
+        # When
+        x = np.linspace(1, 10, 20)
+        line = Line(2.0, 1.0)
+
+        def func(x):
+            return line(x)
+
+        fitter = Fitter(line, func)
+        fitter.switch_minimizer(AvailableMinimizers.Linear)
+
+        # Then
+        fitter.fit(x, 3.0 * x + 2.0)
+
+        # Expect
+        assert fitter.minimizer.declares_linear() is False
+        assert line.m.raw_value == pytest.approx(3.0)
+        assert line.c.raw_value == pytest.approx(2.0)
+
+    def test_fit_nonlinear_exception(self) -> None:
+        # When
+        x = np.linspace(1, 10, 20)
+        line = Line(2.0, 1.0)
+
+        def func(x):
+            return line.m.raw_value**2 * x + line.c.raw_value
+
+        fitter = Fitter(line, func)
+        fitter.switch_minimizer(AvailableMinimizers.Linear)
+
+        # Then Expect
+        with pytest.raises(FitError):
+            fitter.fit(x, 3.0 * x + 2.0)
+        assert line.m.raw_value == 2.0
+        assert line.c.raw_value == 1.0
+
+    def test_declares_linear(self) -> None:
+        # When
+        line = Line()
+
+        # Then Expect
+        assert Linear(line, line, AvailableMinimizers.Linear).declares_linear()
+        assert Linear(line, line.__call__, AvailableMinimizers.Linear).declares_linear()
+        assert not Linear(line, lambda x: line(x), AvailableMinimizers.Linear).declares_linear()
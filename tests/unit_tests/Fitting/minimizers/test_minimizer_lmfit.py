@@ -1,6 +1,7 @@
 import pytest
 
 from unittest.mock import MagicMock
+import numpy as np
 
 import easyscience.fitting.minimizers.minimizer_lmfit
 from easyscience.fitting.minimizers.minimizer_lmfit import LMFit
@@ -306,3 +307,27 @@ class TestLMFit():
         assert str(domain_fit_results.minimizer_engine) == "<class 'easyscience.fitting.minimizers.minimizer_lmfit.LMFit'>"
         assert domain_fit_results.fit_args is None
 
+
+    def test_covariance_from_result(self, minimizer: LMFit) -> None:
+        # When
+        mock_fit_result = MagicMock()
+        mock_fit_result.covar = np.array([[1.0, 0.5], [0.5, 2.0]])
+        mock_fit_result.scale_covar = False
+        mock_fit_result.redchi = 2.0
+        mock_fit_result.params = {'pa': 1, 'pb': 2, 'pc': 3}
+        mock_fit_result.var_names = ['pa', 'pc']
+
+        # Then
+        covariance = minimizer._covariance_from_result(mock_fit_result)
+
+        # Expect
+        assert np.allclose(covariance[np.ix_([0, 2], [0, 2])], [[2.0, 1.0], [1.0, 4.0]])
+        assert np.all(np.isnan(covariance[1]))
+
+    def test_covariance_from_result_none(self, minimizer: LMFit) -> None:
+        # When
+        mock_fit_result = MagicMock()
+        mock_fit_result.covar = None
+
+        # Then Expect
+        assert minimizer._covariance_from_result(mock_fit_result) is None
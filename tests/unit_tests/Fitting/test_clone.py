@@ -0,0 +1,48 @@
+from easyscience.fitting.clone import decode_fit_task
+from easyscience.fitting.clone import encode_fit_task
+from easyscience.models.polynomial import Line
+
+
+def func(x):
+    return x
+
+
+def test_encode_decode_fit_object():
+    # When
+    line = Line(2.0, 1.0)
+
+    # Then
+    clone, fit_function = decode_fit_task(*encode_fit_task(line, line))
+
+    # Expect
+    assert clone is not line
+    assert fit_function is clone
+    assert clone.m.raw_value == 2.0
+    assert clone.m.unique_name != line.m.unique_name
+
+
+def test_encode_decode_bound_method():
+    # When
+    line = Line(2.0, 1.0)
+
+    # Then
+    object_dict, spec = encode_fit_task(line, line.__call__)
+    clone, fit_function = decode_fit_task(object_dict, spec)
+
+    # Expect
+    assert spec == '__call__'
+    assert fit_function.__self__ is clone
+    assert fit_function(1.0) == 3.0
+
+
+def test_encode_decode_function():
+    # When
+    line = Line(2.0, 1.0)
+
+    # Then
+    object_dict, spec = encode_fit_task(line, func)
+    _, fit_function = decode_fit_task(object_dict, spec)
+
+    # Expect
+    assert spec is func
+    assert fit_function is func
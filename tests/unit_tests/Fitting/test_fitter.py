@@ -149,7 +149,8 @@ class TestFitter():
         mock_fit_function = MagicMock()
 
         mock_string_to_enum = MagicMock(return_value=10)
-        mock_factory = MagicMock(return_value='minimizer')
+        mock_minimizer = MagicMock()
+        mock_factory = MagicMock(return_value=mock_minimizer)
         monkeypatch.setattr(easyscience.fitting.fitter, 'from_string_to_enum', mock_string_to_enum)
         monkeypatch.setattr(easyscience.fitting.fitter, 'factory', mock_factory)
         fitter = Fitter(mock_fit_object, mock_fit_function)
@@ -159,7 +160,35 @@ class TestFitter():
 
         # Expect
         assert fitter._enum_current_minimizer == 'great-minimizer'
-        assert fitter._minimizer == 'minimizer'
+        assert fitter._minimizer == mock_minimizer
+        assert mock_minimizer.evaluation_cache is None
+
+    def test_evaluate_batch(self, fitter: Fitter):
+        # When
+        mock_minimizer = MagicMock()
+        mock_minimizer.evaluate_batch = MagicMock(return_value='result')
+        fitter._minimizer = mock_minimizer
+
+        # Then
+        result = fitter.evaluate_batch('x', 'parameter_sets', chunk_size=10)
+
+        # Expect
+        assert result == 'result'
+        mock_minimizer.evaluate_batch.assert_called_once_with('x', 'parameter_sets', chunk_size=10)
+
+    def test_enable_disable_evaluation_cache(self, fitter: Fitter):
+        # When
+        fitter._minimizer = MagicMock()
+
+        # Then
+        cache = fitter.enable_evaluation_cache(5)
+
+        # Expect
+        assert fitter.evaluation_cache is cache
+        assert fitter._minimizer.evaluation_cache is cache
+        fitter.disable_evaluation_cache()
+        assert fitter.evaluation_cache is None
+        assert fitter._minimizer.evaluation_cache is None
 
     def test_available_minimizers(self, fitter: Fitter):
         # When
@@ -168,8 +197,9 @@ class TestFitter():
         # Then Expect
         assert minimizers == [
             'LMFit', 'LMFit_leastsq', 'LMFit_powell', 'LMFit_cobyla', 'LMFit_differential_evolution', 'LMFit_scipy_least_squares',
-            'Bumps', 'Bumps_simplex', 'Bumps_newton', 'Bumps_lm',
-            'DFO', 'DFO_leastsq'
+            'Bumps', 'Bumps_simplex', 'Bumps_newton', 'Bumps_lm', 'Bumps_dream',
+            'DFO', 'DFO_leastsq',
+            'Linear', 'Linear_svd', 'Linear_qr'
         ]
 
     def test_minimizer(self, fitter: Fitter):
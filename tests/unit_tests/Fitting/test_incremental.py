@@ -0,0 +1,162 @@
+import pytest
+import numpy as np
+
+from easyscience.fitting import Fitter
+from easyscience.fitting.available_minimizers import AvailableMinimizers
+from easyscience.fitting.incremental import IncrementalFitter
+from easyscience.fitting.incremental import _FrameBuffer
+from easyscience.fitting.minimizers import FitError
+from easyscience.models.polynomial import Line
+from easyscience.models.polynomial import Polynomial
+
+
+class TestFrameBuffer():
+    def test_append_grows(self):
+        # When
+        buffer = _FrameBuffer()
+
+        # Then
+        for index in range(5):
+            buffer.append(np.full((3, 2), index), np.full(3, index), None)
+
+        # Expect
+        assert len(buffer) == 15
+        assert buffer.x.shape == (15, 2)
+        assert np.array_equal(buffer.y, np.repeat(np.arange(5.0), 3))
+        assert buffer.weights is None
+
+    def test_append_exceptions(self):
+        # When
+        buffer = _FrameBuffer()
+        buffer.append(np.ones(2), np.ones(2), None)
+
+        # Then Expect
+        with pytest.raises(ValueError):
+            buffer.append(np.ones(2), np.ones(2), np.ones(2))
+        with pytest.raises(ValueError):
+            buffer.append(np.ones((2, 2)), np.ones(2), None)
+
+
+class TestIncrementalFitter():
+    @staticmethod
+    def frames(n_frames, rng):
+        for _ in range(n_frames):
+            x = rng.uniform(0, 10, 50)
+            yield x, np.polyval([1.0, -2.0, 3.0], x) + 50 + rng.normal(0, 0.1, x.size)
+
+    def test_linear_matches_full_fit(self):
+        # When
+        rng = np.random.default_rng(1)
+        polynomial = Polynomial(coefficients=[0.5, 0.2, 1.0])
+        fitter = IncrementalFitter(polynomial, polynomial, linear=True)
+        reference = Polynomial(coefficients=[0.5, 0.2, 1.0])
+        xs, ys = [], []
+
+        # Then
+        for x, y in self.frames(4, rng):
+            fitter.append(x, y, weights=np.full(x.size, 10.0))
+            result = fitter.refit()
+            xs.append(x)
+            ys.append(y)
+        full = Fitter(reference, reference).fit(np.concatenate(xs), np.concatenate(ys), weights=np.full(200, 10.0))
+
+        # Expect
+        assert fitter.n_points == 200
+        assert fitter.last_result is result
+        assert result.success
+        for coefficient, expected in zip(polynomial.coefficients, reference.coefficients):
+            assert coefficient.raw_value == pytest.approx(expected.raw_value, rel=1e-6)
+            assert coefficient.error == pytest.approx(expected.error, rel=1e-4)
+        assert result.chi2 == pytest.approx(full.chi2, rel=1e-6)
+        assert result.covariance.shape == (3, 3)
+
+    def test_linear_without_full_output(self):
+        # When
+        rng = np.random.default_rng(2)
+        line = Line(1.0, 0.0)
+        fitter = IncrementalFitter(line, line, linear=True)
+        x = rng.uniform(0, 10, 100)
+        fitter.append(x, 3.0 * x + 2.0)
+
+        # Then
+        result = fitter.refit(full_output=False)
+
+        # Expect
+        assert line.m.raw_value == pytest.approx(3.0)
+        assert line.c.raw_value == pytest.approx(2.0)
+        assert result.covariance.shape == (2, 2)
+
+    def test_linear_parameters_changed(self):
+        # When
+        line = Line(1.0, 0.0)
+        fitter = IncrementalFitter(line, line, linear=True)
+        fitter.append(np.arange(3.0), np.arange(3.0) + 1)
+        line.c.fixed = True
+
+        # Then Expect
+        with pytest.raises(FitError):
+            fitter.refit()
+        fitter.reset()
+        fitter.append(np.arange(1.0, 4.0), 2.0 * np.arange(1.0, 4.0))
+        fitter.refit()
+        assert line.m.raw_value == pytest.approx(2.0)
+
+    def test_nonlinear_refit(self):
+        # When
+        line = Line(1.0, 0.0)
+        fitter = IncrementalFitter(line, line)
+        for start in range(3):
+            x = np.linspace(start, start + 1, 10)
+            fitter.append(x, 3.0 * x + 2.0, weights=np.ones(10))
+
+        # Then
+        result = fitter.refit()
+
+        # Expect
+        assert result.success
+        assert result.y_calc.size == 30
+        assert line.m.raw_value == pytest.approx(3.0)
+        assert line.c.raw_value == pytest.approx(2.0)
+
+    @pytest.mark.parametrize("minimizer", [AvailableMinimizers.LMFit, AvailableMinimizers.Bumps, AvailableMinimizers.DFO])
+    def test_nonlinear_weights_match_linear(self, minimizer):
+        # When
+        rng = np.random.default_rng(3)
+        line = Line(1.0, 0.0)
+        fitter = IncrementalFitter(line, line)
+        fitter.switch_minimizer(minimizer)
+        reference = Line(1.0, 0.0)
+        linear = IncrementalFitter(reference, reference, linear=True)
+        for weight in [1.0, 10.0, 100.0]:
+            x = rng.uniform(0, 10, 20)
+            y = 3.0 * x + 2.0 + rng.normal(0, 1 / weight, x.size)
+            fitter.append(x, y, weights=np.full(x.size, weight))
+            linear.append(x, y, weights=np.full(x.size, weight))
+
+        # Then
+        fitter.refit()
+        linear.refit()
+
+        # Expect
+        assert line.m.raw_value == pytest.approx(reference.m.raw_value, rel=1e-4)
+        assert line.c.raw_value == pytest.approx(reference.c.raw_value, rel=1e-4)
+
+    def test_refit_without_data(self):
+        # When
+        line = Line(1.0, 0.0)
+        fitter = IncrementalFitter(line, line)
+
+        # Then Expect
+        with pytest.raises(FitError):
+            fitter.refit()
+
+    def test_append_exception(self):
+        # When
+        line = Line(1.0, 0.0)
+        fitter = IncrementalFitter(line, line)
+
+        # Then Expect
+        with pytest.raises(ValueError):
+            fitter.append(np.ones(3), np.ones(2))
+        with pytest.raises(ValueError):
+            fitter.append(np.ones(3), np.ones(3), weights=np.ones(2))
@@ -0,0 +1,86 @@
+from unittest.mock import MagicMock
+
+import pytest
+import numpy as np
+
+from easyscience.fitting.multi_start import MultiStartFitter
+from easyscience.fitting.minimizers.utils import FitResults
+from easyscience.models.polynomial import Line
+
+
+class TestMultiStartFitter():
+    @pytest.fixture
+    def line(self):
+        line = Line(0.5, 0.1)
+        for parameter in [line.m, line.c]:
+            parameter.min = -5
+            parameter.max = 5
+        return line
+
+    @pytest.mark.parametrize('sampler', ['lhs', 'sobol', 'uniform'])
+    def test_sample_starts(self, sampler):
+        # When
+        lower = np.array([0.0, -10.0])
+        upper = np.array([1.0, 10.0])
+
+        # Then
+        starts = MultiStartFitter._sample_starts(lower, upper, 8, sampler, seed=1)
+
+        # Expect
+        assert starts.shape == (8, 2)
+        assert np.all(starts >= lower)
+        assert np.all(starts <= upper)
+
+    def test_sample_starts_exception(self):
+        # When Then Expect
+        with pytest.raises(ValueError):
+            MultiStartFitter._sample_starts(np.zeros(1), np.ones(1), 2, 'not_a_sampler', seed=None)
+
+    def test_bounds_exception(self):
+        # When
+        line = Line(1.0, 2.0)
+
+        # Then Expect
+        with pytest.raises(ValueError):
+            MultiStartFitter._bounds(line.get_fit_parameters())
+
+    def test_unique_results(self):
+        # When
+        results = []
+        for value, chi2, success in [(1.0, 3.0, True), (1.00001, 1.0, True), (2.0, 2.0, True), (3.0, 0.5, False)]:
+            result = MagicMock(FitResults)
+            result.p = {'pa': value}
+            result.chi2 = chi2
+            result.success = success
+            results.append(result)
+
+        # Then
+        unique = MultiStartFitter._unique_results(results, ['pa'], np.array([10.0]), 1e-4)
+
+        # Expect
+        assert unique == [results[1], results[2]]
+
+    def test_fit_multi_start(self, line):
+        # When
+        x = np.linspace(0, 10, 50)
+        y = 3 * x + 2
+        fitter = MultiStartFitter(line, line)
+
+        # Then
+        results = fitter.fit_multi_start(x, y, n_starts=4, seed=1, workers=1)
+
+        # Expect
+        assert len(results) == 1
+        assert results[0].success
+        assert set(results[0].p.keys()) == {'p' + line.m.unique_name, 'p' + line.c.unique_name}
+        assert line.m.raw_value == pytest.approx(3.0)
+        assert line.c.raw_value == pytest.approx(2.0)
+
+    def test_fit_multi_start_constraints_exception(self, line):
+        # When
+        fitter = MultiStartFitter(line, line)
+        fitter.add_fit_constraint(MagicMock())
+
+        # Then Expect
+        with pytest.raises(ValueError):
+            fitter.fit_multi_start(np.ones(3), np.ones(3))
@@ -0,0 +1,133 @@
+import pytest
+
+import numpy as np
+
+from easyscience import global_object
+from easyscience.fitting import AvailableMinimizers
+from easyscience.fitting import Fitter
+from easyscience.fitting.separable import VariableProjection
+from easyscience.models.polynomial import Line
+from easyscience.Objects.new_variable import Parameter
+from easyscience.Objects.ObjectClasses import BaseObj
+
+
+class PeakOnBackground(BaseObj):
+    amplitude: Parameter
+    center: Parameter
+    width: Parameter
+    background: Parameter
+
+    def __init__(self, amplitude: float, center: float, width: float, background: float):
+        super().__init__(
+            'peak',
+            amplitude=Parameter('amplitude', amplitude),
+            center=Parameter('center', center),
+            width=Parameter('width', width, min=0.01),
+            background=Parameter('background', background),
+        )
+
+    def __call__(self, x):
+        peak = np.exp(-0.5 * ((x - self.center.value) / self.width.value) ** 2)
+        return self.amplitude.value * peak + self.background.value
+
+
+@pytest.fixture
+def data():
+    x = np.linspace(-5, 5, 200)
+    y = PeakOnBackground(10.0, 0.5, 0.8, 2.0)(x) + 0.05 * np.sin(13 * x)
+    return x, y, np.full_like(x, 20.0)
+
+
+class TestVariableProjection:
+    @pytest.mark.parametrize('minimizer_enum', [AvailableMinimizers.LMFit, AvailableMinimizers.DFO])
+    def test_fit_matches_full_fit(self, data, minimizer_enum):
+        # When
+        x, y, weights = data
+        reference = PeakOnBackground(5.0, 0.0, 1.0, 0.0)
+        reference_fitter = Fitter(reference, reference)
+        reference_fitter.switch_minimizer(minimizer_enum)
+        reference_weights = 1 / weights if minimizer_enum.package == 'dfo' else weights
+        reference_result = reference_fitter.fit(x, y, weights=reference_weights)
+
+        model = PeakOnBackground(5.0, 0.0, 1.0, 0.0)
+        fitter = Fitter(model, model)
+        fitter.switch_minimizer(minimizer_enum)
+        fitter.linear_parameters = [model.amplitude, model.background]
+
+        # Then
+        result = fitter.fit(x, y, weights=reference_weights)
+
+        # Expect
+        assert result.success
+        for name in ['amplitude', 'center', 'width', 'background']:
+            assert getattr(model, name).value == pytest.approx(getattr(reference, name).value, rel=1e-4)
+            if minimizer_enum.package == 'lm':
+                # DFO reports confidence interval based errors
+                assert getattr(model, name).error == pytest.approx(getattr(reference, name).error, rel=1e-2)
+        assert result.chi2 == pytest.approx(reference_result.chi2, rel=1e-4)
+        assert list(result.p.keys()) == ['p' + p.unique_name for p in model.get_fit_parameters()]
+        assert result.p0['p' + model.amplitude.unique_name] == 5.0
+        assert result.covariance.shape == (4, 4)
+        assert not model.amplitude.fixed and not model.background.fixed
+
+    def test_fit_only_linear(self):
+        # When
+        x = np.linspace(1, 10, 20)
+        line = Line(1.0, 0.0)
+        fitter = Fitter(line, line)
+        fitter.linear_parameters = [line.m, line.c]
+
+        # Then
+        result = fitter.fit(x, 3.0 * x + 2.0)
+
+        # Expect
+        assert result.success
+        assert result.minimizer_engine is VariableProjection
+        assert line.m.raw_value == pytest.approx(3.0)
+        assert line.c.raw_value == pytest.approx(2.0)
+
+    def test_call_solves_linear_parameters(self, data):
+        # When
+        x, y, weights = data
+        model = PeakOnBackground(1.0, 0.5, 0.8, 0.0)
+        projection = VariableProjection(model, [model.amplitude, model.background], y, weights)
+
+        # Then
+        y_calc = projection(x)
+
+        # Expect
+        assert model.amplitude.value == pytest.approx(10.0, rel=1e-3)
+        assert model.background.value == pytest.approx(2.0, rel=1e-3)
+        assert y_calc == pytest.approx(model(x))
+        assert projection.n_evaluations == 3
+
+    def test_linear_fixed_no_undo(self, data):
+        # When
+        global_object.stack.enabled = True
+        global_object.stack.clear()
+        model = PeakOnBackground(1.0, 0.5, 0.8, 0.0)
+        projection = VariableProjection(model, [model.amplitude], data[1], None)
+
+        # Then
+        with projection.linear_fixed():
+            parameters = model.get_fit_parameters()
+
+        # Expect
+        assert model.amplitude not in parameters and len(parameters) == 3
+        assert not model.amplitude.fixed
+        assert not global_object.stack.canUndo()
+        global_object.stack.enabled = False
+
+    def test_linear_parameters_exception(self):
+        # When
+        line = Line(1.0, 0.0)
+        line.c.fixed = True
+        fitter = Fitter(line, line)
+
+        # Then Expect
+        with pytest.raises(ValueError):
+            fitter.linear_parameters = [line.c]
+        fitter.linear_parameters = [line.m]
+        assert fitter.linear_parameters == [line.m]
+        fitter.linear_parameters = None
+        assert fitter.linear_parameters == []
@@ -0,0 +1,293 @@
+import pytest
+import numpy as np
+
+from scipp import UnitError
+
+from easyscience.fitting import Fitter
+from easyscience.fitting.available_minimizers import AvailableMinimizers
+from easyscience.Objects.new_variable.descriptor_array import ArrayElement
+from easyscience.Objects.new_variable.descriptor_array import DescriptorArray
+from easyscience.Objects.new_variable.descriptor_array import ParameterArray
+from easyscience.Objects.new_variable.descriptor_array import ParameterArrayElement
+from easyscience.Objects.ObjectClasses import BaseObj
+from easyscience import global_object
+
+
+class Polynomial(BaseObj):
+    def __init__(self, coefficients: ParameterArray):
+        super().__init__("polynomial", coefficients=coefficients)
+
+    def __call__(self, x):
+        return np.polynomial.polynomial.polyval(x, self.coefficients.full_value.values)
+
+
+class TestDescriptorArray:
+    @pytest.fixture
+    def descriptor(self) -> DescriptorArray:
+        return DescriptorArray(name="name", value=[[1, 2, 3], [4, 5, 6]], unit="m", variance=np.full((2, 3), 0.01))
+
+    def test_init(self, descriptor: DescriptorArray):
+        # When Then Expect
+        assert descriptor.name == "name"
+        assert descriptor.unit == "m"
+        assert descriptor.shape == (2, 3)
+        assert descriptor.dims == ["dim_0", "dim_1"]
+        assert len(descriptor) == 2
+        assert np.array_equal(descriptor.value, [[1, 2, 3], [4, 5, 6]])
+        assert np.allclose(descriptor.error, 0.1)
+        assert repr(descriptor) == "<DescriptorArray 'name': shape=(2, 3) m>"
+
+    @pytest.mark.parametrize(
+        "kwargs, error",
+        [
+            ({"value": 1.0}, ValueError),
+            ({"value": ["a"]}, TypeError),
+            ({"value": [1.0], "variance": [-1.0]}, ValueError),
+            ({"value": [1.0], "variance": [1.0, 2.0]}, ValueError),
+            ({"value": [1.0], "dims": ["x", "y"]}, ValueError),
+            ({"value": [1.0], "unit": "unknown"}, UnitError),
+        ],
+        ids=["scalar", "not_numbers", "negative_variance", "variance_shape", "dims", "unit"],
+    )
+    def test_init_exceptions(self, kwargs, error):
+        # When Then Expect
+        with pytest.raises(error):
+            DescriptorArray(name="name", **kwargs)
+
+    def test_value_is_copy(self, descriptor: DescriptorArray):
+        # When
+        value = descriptor.value
+
+        # Then
+        value[0, 0] = 10
+
+        # Expect
+        assert descriptor.value[0, 0] == 1
+
+    def test_set_value(self, descriptor: DescriptorArray):
+        # When
+        epoch = global_object.value_epoch
+
+        # Then
+        descriptor.value = np.zeros((2, 3))
+
+        # Expect
+        assert np.array_equal(descriptor.value, np.zeros((2, 3)))
+        assert global_object.value_epoch > epoch
+        with pytest.raises(ValueError):
+            descriptor.value = np.zeros(6)
+
+    def test_elements(self, descriptor: DescriptorArray):
+        # When
+        element = descriptor[1, -1]
+
+        # Then
+        element.value = 10
+        element.error = 0.5
+
+        # Expect
+        assert isinstance(element, ArrayElement)
+        assert element.name == "name[1, 2]"
+        assert element.unique_name == f"{descriptor.unique_name}__5"
+        assert element.unit == "m"
+        assert descriptor.value[1, 2] == 10
+        assert descriptor.variance[1, 2] == 0.25
+        assert element == descriptor[1, 2]
+        assert [e.value for e in descriptor] == [1, 2, 3, 4, 5, 10]
+        with pytest.raises(IndexError):
+            descriptor[2, 0]
+        with pytest.raises(IndexError):
+            descriptor[0]
+        with pytest.raises(TypeError):
+            descriptor[0:1]
+
+    def test_convert_unit(self, descriptor: DescriptorArray):
+        # When Then
+        descriptor.convert_unit("cm")
+
+        # Expect
+        assert descriptor.unit == "cm"
+        assert np.array_equal(descriptor.value, [[100, 200, 300], [400, 500, 600]])
+
+    def test_as_dict_from_dict(self, descriptor: DescriptorArray):
+        # When Then
+        new_descriptor = DescriptorArray.from_dict(descriptor.as_dict(skip=["unique_name"]))
+
+        # Expect
+        assert np.array_equal(new_descriptor.value, descriptor.value)
+        assert np.array_equal(new_descriptor.variance, descriptor.variance)
+        assert new_descriptor.unit == descriptor.unit
+        assert new_descriptor.dims == descriptor.dims
+
+
+class TestParameterArray:
+    @pytest.fixture
+    def parameter(self) -> ParameterArray:
+        return ParameterArray(name="name", value=[1, 2, 3, 4], unit="m", min=0, max=[5, 5, 5, 10], fixed=[False, True, False, False])
+
+    def test_init(self, parameter: ParameterArray):
+        # When Then Expect
+        assert np.array_equal(parameter.min, [0, 0, 0, 0])
+        assert np.array_equal(parameter.max, [5, 5, 5, 10])
+        assert np.array_equal(parameter.fixed, [False, True, False, False])
+        assert np.array_equal(parameter.free, [True, False, True, True])
+        assert np.array_equal(parameter.variance, [0, 0, 0, 0])
+        assert parameter.enabled is True
+        assert repr(parameter) == "<ParameterArray 'name': shape=(4,) m, free=3>"
+
+    @pytest.mark.parametrize(
+        "kwargs, error",
+        [
+            ({"min": 2}, ValueError),
+            ({"max": 3}, ValueError),
+            ({"min": 0, "max": [1, 2]}, ValueError),
+            ({"min": 4, "max": 4}, ValueError),
+            ({"fixed": 1}, TypeError),
+            ({"fixed": [True, False]}, ValueError),
+        ],
+        ids=["min", "max", "bounds_shape", "identical_bounds", "fixed_type", "fixed_shape"],
+    )
+    def test_init_exceptions(self, kwargs, error):
+        # When Then Expect
+        with pytest.raises(error):
+            ParameterArray(name="name", value=[1, 2, 3, 4], **kwargs)
+
+    def test_set_value_bounds(self, parameter: ParameterArray):
+        # When Then
+        parameter.value = [-1, 2, 6, 6]
+        parameter[0].value = 7
+
+        # Expect
+        assert np.array_equal(parameter.value, [5, 2, 5, 6])
+
+    def test_set_bounds(self, parameter: ParameterArray):
+        # When Then
+        parameter.min = -1
+        parameter[3].max = 20
+
+        # Expect
+        assert np.array_equal(parameter.min, [-1, -1, -1, -1])
+        assert np.array_equal(parameter.max, [5, 5, 5, 20])
+        with pytest.raises(ValueError):
+            parameter.max = 3
+        with pytest.raises(ValueError):
+            parameter[0].min = 2
+
+    def test_element(self, parameter: ParameterArray):
+        # When
+        element = parameter[2]
+
+        # Then
+        element.fixed = True
+
+        # Expect
+        assert isinstance(element, ParameterArrayElement)
+        assert element.value == element.raw_value == 3
+        assert element.bounds == (0, 5)
+        assert element.enabled is True
+        assert element.user_constraints == {}
+        assert np.array_equal(parameter.fixed, [False, True, True, False])
+        assert repr(element) == "<ParameterArrayElement 'name[2]': 3.0000 m (fixed), bounds=[0.0:5.0]>"
+
+    def test_get_fit_parameters(self, parameter: ParameterArray):
+        # When Then
+        fit_parameters = parameter.get_fit_parameters()
+
+        # Expect
+        assert [element.index for element in fit_parameters] == [(0,), (2,), (3,)]
+        assert len(parameter.get_parameters()) == 4
+        parameter.enabled = False
+        assert parameter.get_fit_parameters() == []
+
+    def test_convert_unit(self, parameter: ParameterArray):
+        # When Then
+        parameter.convert_unit("cm")
+
+        # Expect
+        assert np.array_equal(parameter.value, [100, 200, 300, 400])
+        assert np.array_equal(parameter.max, [500, 500, 500, 1000])
+
+    def test_undo_redo(self, parameter: ParameterArray):
+        # When
+        global_object.stack.enabled = True
+
+        # Then
+        parameter[0].value = 4
+        parameter.value = [2, 2, 2, 2]
+        parameter.fixed = True
+
+        # Expect
+        global_object.stack.undo()
+        assert np.array_equal(parameter.fixed, [False, True, False, False])
+        global_object.stack.undo()
+        assert np.array_equal(parameter.value, [4, 2, 3, 4])
+        global_object.stack.undo()
+        assert np.array_equal(parameter.value, [1, 2, 3, 4])
+        global_object.stack.redo()
+        assert np.array_equal(parameter.value, [4, 2, 3, 4])
+        global_object.stack.enabled = False
+
+    def test_set_flat_values(self, parameter: ParameterArray):
+        # When
+        global_object.stack.enabled = True
+
+        # Then
+        parameter.set_flat_values([0, 3], [-1, 3])
+
+        # Expect
+        assert np.array_equal(parameter.value, [0, 2, 3, 3])
+        global_object.stack.undo()
+        assert np.array_equal(parameter.value, [1, 2, 3, 4])
+        global_object.stack.enabled = False
+
+    def test_as_dict_from_dict(self, parameter: ParameterArray):
+        # When Then
+        new_parameter = ParameterArray.from_dict(parameter.as_dict(skip=["unique_name"]))
+
+        # Expect
+        assert np.array_equal(new_parameter.value, parameter.value)
+        assert np.array_equal(new_parameter.min, parameter.min)
+        assert np.array_equal(new_parameter.max, parameter.max)
+        assert np.array_equal(new_parameter.fixed, parameter.fixed)
+
+    @pytest.mark.parametrize("minimizer", [AvailableMinimizers.LMFit, AvailableMinimizers.Bumps_lm, AvailableMinimizers.DFO])
+    def test_fit(self, minimizer):
+        # When
+        coefficients = ParameterArray(name="coefficients", value=[1.0, 1.0, 1.0, 0.0], fixed=[False, False, False, True])
+        polynomial = Polynomial(coefficients)
+        x = np.linspace(0, 1, 20)
+        y = 1.0 + 2.0 * x + 3.0 * x**2
+        # Then
+        fitter = Fitter(polynomial, polynomial)
+        fitter.switch_minimizer(minimizer)
+        result = fitter.fit(x, y)
+
+        # Expect
+        assert result.success
+        assert len(polynomial.get_fit_parameters()) == 3
+        assert np.allclose(coefficients.value, [1.0, 2.0, 3.0, 0.0], atol=1e-3)
+        vertices = global_object.map.vertices()
+        assert coefficients.unique_name in vertices
+        assert not any(element.unique_name in vertices for element in coefficients)
+
+    def test_fit_writes_in_bulk(self, monkeypatch):
+        # When
+        coefficients = ParameterArray(name="coefficients", value=[1.0, 1.0, 1.0, 0.0], fixed=[False, False, False, True])
+        polynomial = Polynomial(coefficients)
+        x = np.linspace(0, 1, 20)
+        y = 1.0 + 2.0 * x + 3.0 * x**2
+        writes = []
+        set_flat_values = ParameterArray.set_flat_values
+
+        def spy(self, indices, values):
+            writes.append(sorted(indices))
+            set_flat_values(self, indices, values)
+
+        monkeypatch.setattr(ParameterArray, "set_flat_values", spy)
+
+        # Then
+        result = Fitter(polynomial, polynomial).fit(x, y)
+
+        # Expect
+        assert result.success
+        assert writes and all(indices == [0, 1, 2] for indices in writes)
@@ -0,0 +1,119 @@
+import pytest
+import numpy as np
+
+from scipp import UnitError
+
+from easyscience.Objects.new_variable.descriptor_number import DescriptorNumber
+from easyscience.Objects.new_variable.expression import Expression
+from easyscience.Objects.new_variable.expression import lazy
+from easyscience.Objects.new_variable.parameter import Parameter
+from easyscience import global_object
+
+
+class TestExpression:
+    @pytest.fixture
+    def a(self) -> Parameter:
+        return Parameter(name="a", value=2.0, unit="m", variance=0.01, min=0, max=5)
+
+    @pytest.fixture
+    def c(self) -> Parameter:
+        return Parameter(name="c", value=1.0, unit="m^2", min=-1, max=2)
+
+    @pytest.fixture
+    def d(self) -> DescriptorNumber:
+        return DescriptorNumber(name="d", value=4.0, unit="m", variance=0.04)
+
+    @pytest.fixture
+    def e(self) -> Parameter:
+        return Parameter(name="e", value=0.5, min=0, max=1)
+
+    @pytest.mark.parametrize(
+        "function",
+        [
+            lambda a, c, d, e: a * d + c,
+            lambda a, c, d, e: (a * d - c) / d,
+            lambda a, c, d, e: -abs(a * d - c) ** 2,
+            lambda a, c, d, e: 2 * a / c,
+            lambda a, c, d, e: d / c,
+            lambda a, c, d, e: 1 / e - 1,
+            lambda a, c, d, e: c / e * 3 - a * a,
+            lambda a, c, d, e: e**0.5 + 1,
+            lambda a, c, d, e: d - a,
+            lambda a, c, d, e: (d * 100) * a,
+        ],
+        ids=["mul_add", "sub_div", "abs_pow", "scalar_div", "descriptor_div", "rdiv", "mixed", "sqrt", "rsub", "units"],
+    )
+    def test_materialize_matches_eager(self, a, c, d, e, function):
+        # When
+        expected = function(a, c, d, e)
+        n_vertices = len(global_object.map.vertices())
+
+        # Then
+        expression = function(lazy(a), lazy(c), lazy(d), lazy(e))
+        assert len(global_object.map.vertices()) == n_vertices
+        result = expression.materialize()
+
+        # Expect
+        assert isinstance(expression, Expression)
+        assert type(result) is type(expected)
+        assert result.name == result.unique_name
+        assert result.value == pytest.approx(expected.value)
+        assert result.unit == expected.unit
+        assert result.variance == pytest.approx(expected.variance)
+        assert result.min == pytest.approx(expected.min)
+        assert result.max == pytest.approx(expected.max)
+        assert result.unique_name in global_object.map.vertices()
+
+    def test_evaluate_reads_current_values(self, a, d):
+        # When
+        expression = lazy(a) * d
+        n_vertices = len(global_object.map.vertices())
+
+        # Then
+        first = expression.evaluate()
+        a.value = 3.0
+
+        # Expect
+        assert first.value == 8.0
+        assert expression.value == 12.0
+        assert expression.unit == "m^2"
+        assert expression.error == pytest.approx(np.sqrt(16 * 0.01 + 9 * 0.04))
+        assert expression.bounds() == (0.0, 20.0)
+        assert len(global_object.map.vertices()) == n_vertices
+
+    def test_descriptor_only(self, d):
+        # When Then
+        result = (2 * lazy(d) + d).materialize(name="result")
+
+        # Expect
+        assert type(result) is DescriptorNumber
+        assert result.name == "result"
+        assert result.value == 12.0
+        assert result.unit == "m"
+
+    def test_leaves_and_repr(self, a, d):
+        # When Then
+        expression = -(lazy(a) * d + a)
+
+        # Expect
+        assert expression.leaves == [a, d]
+        assert repr(expression) == "neg(((a * d) + a))"
+
+    def test_errors(self, a, c, d, e):
+        # When Then Expect
+        with pytest.raises(UnitError):
+            (lazy(a) + c).evaluate()
+        with pytest.raises(UnitError):
+            (lazy(a) + 1).evaluate()
+        with pytest.raises(ZeroDivisionError):
+            (lazy(a) / (d - d)).evaluate()
+        with pytest.raises(TypeError):
+            (lazy(a) ** e).evaluate()
+        with pytest.raises(UnitError):
+            (lazy(a) ** d).evaluate()
+        with pytest.raises(ValueError):
+            (lazy(a) ** DescriptorNumber(name="n", value=2, variance=0.1)).evaluate()
+        with pytest.raises(TypeError):
+            lazy("a")
+        with pytest.raises(TypeError):
+            lazy(a) + "a"
@@ -6,7 +6,9 @@ __version__ = "0.1.0"
 #  © 2021-2023 Contributors to the EasyScience project <https://github.com/easyScience/EasyScience
 
 from typing import List
+from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
 
 import easyscience
@@ -319,6 +321,7 @@ def test_baseCollection_dir(cls):
         "as_data_dict",
         "interface",
         "from_dict",
+        "from_iterable",
         "name",
         "switch_interface",
         "get_parameters",
@@ -328,6 +331,7 @@ def test_baseCollection_dir(cls):
         "count",
         "generate_bindings",
         "unsafe_hash",
+        "value_array",
         "decode",
         "encode_data",
         "sort",
@@ -543,6 +547,129 @@ def test_baseCollection_sort_reverse(cls):
         assert item.value == expected[i]
 
 
+@pytest.mark.parametrize("cls", class_constructors)
+def test_baseCollection_value_array(cls):
+    name = "test"
+    p = [Parameter(f"p{i}", v) for i, v in enumerate([1, 2, 3])]
+    d = cls(name, *p)
+
+    values = d.value_array
+    assert np.array_equal(values, [1, 2, 3])
+    assert not values.flags.writeable
+    assert d.value_array is values
+
+    p[1].value = 5
+    assert np.array_equal(d.value_array, [1, 5, 3])
+    d.sort(lambda x: x.value, reverse=True)
+    assert np.array_equal(d.value_array, [5, 3, 1])
+    del d[0]
+    assert np.array_equal(d.value_array, [3, 1])
+
+
+@pytest.mark.parametrize("cls", class_constructors)
+def test_baseCollection_value_array_callback(cls):
+    interface_values = {"p1": 2.0}
+    p = [Parameter(f"p{i}", v) for i, v in enumerate([1, 2])]
+    p[1]._callback = property(fget=lambda: interface_values["p1"])
+    d = cls("test", *p)
+
+    assert np.array_equal(d.value_array, [1, 2])
+    interface_values["p1"] = 7.0
+    assert np.array_equal(d.value_array, [1, 7])
+
+
+@pytest.mark.parametrize("cls", class_constructors)
+def test_baseCollection_index_tracks_changes(cls):
+    name = "test"
+    p = [Parameter(f"p{i}", i) for i in range(4)]
+    d = cls(name, *p[:3])
+
+    assert d["p1"] is p[1]
+    assert [item.value for item in d[::-1]] == [2, 1, 0]
+    d.insert(0, p[3])
+    assert d[0] is p[3] and d["p3"] is p[3]
+    p[0].name = "p1"
+    assert len(d["p1"]) == 2
+    del d[1]
+    assert d["p1"] is p[1]
+    d[0] = p[0]
+    assert [item.unique_name for item in d] == [p[0].unique_name, p[1].unique_name, p[2].unique_name]
+    with pytest.raises(IndexError):
+        d["p3"]
+
+    p4 = Parameter("p4", 4)
+    global_object.stack.enabled = True
+    d.insert(1, p4)
+    assert d[1] is p4
+    global_object.stack.undo()
+    assert len(d) == 3 and d[1] is p[1]
+    global_object.stack.redo()
+    assert d[1] is p4 and d["p4"] is p4
+    global_object.stack.enabled = False
+
+
+@pytest.mark.parametrize("cls", class_constructors)
+def test_baseCollection_extend(cls):
+    p = [Parameter(f"p{i}", i) for i in range(4)]
+    d = cls("test", p[0])
+
+    global_object.stack.enabled = True
+    d.extend(item for item in p[1:])
+    assert [item.value for item in d] == [0, 1, 2, 3]
+    assert d["p2"] is p[2]
+    edges = global_object.map.get_edges(d)
+    assert all(item.unique_name in edges for item in p)
+    global_object.stack.undo()
+    assert len(d) == 1
+    global_object.stack.redo()
+    assert len(d) == 4
+    global_object.stack.enabled = False
+
+    with pytest.raises(AttributeError):
+        d.extend([Parameter("p4", 4), "p5"])
+    assert len(d) == 4
+
+    p5 = Parameter("p5", 5)
+    d.extend([p5, p5])
+    assert len(d) == 5
+    assert global_object.map.get_edges(d).count(p5.unique_name) == 1
+
+    p6 = Parameter("p6", 6)
+    d.extend([p[1], p6])
+    assert [item.value for item in d] == [0, 1, 2, 3, 5, 6]
+
+
+@pytest.mark.parametrize("cls", class_constructors)
+def test_baseCollection_extend_interface(cls):
+    interface = MagicMock()
+    existing = Beta("b", p=Parameter("p", -1))
+    d = cls("test", existing, interface=interface)
+    interface.generate_bindings.reset_mock()
+    items = [Beta(f"b{i}", p=Parameter("p", i)) for i in range(3)]
+
+    d.extend(items)
+
+    assert all(item.interface is interface for item in items)
+    bound = [call.args[0] for call in interface.generate_bindings.call_args_list]
+    assert len(bound) == len(items)
+    assert all(any(item is model for model in bound) for item in items)
+    assert not any(model is d or model is existing for model in bound)
+
+
+@pytest.mark.parametrize("cls", class_constructors)
+def test_baseCollection_from_iterable(cls):
+    interface = MagicMock()
+    p = [Parameter(f"p{i}", i) for i in range(3)]
+
+    d = cls.from_iterable("test", iter(p), interface=interface)
+
+    assert isinstance(d, cls)
+    assert d.name == "test"
+    assert [item.value for item in d] == [0, 1, 2]
+    assert d.interface is interface
+    interface.generate_bindings.assert_called_once_with(d)
+
+
 class Beta(BaseObj):
     pass
 
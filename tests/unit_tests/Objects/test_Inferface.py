@@ -0,0 +1,246 @@
+import numpy as np
+import pytest
+
+from easyscience.fitting import Fitter
+from easyscience.Objects.Inferface import InterfaceFactoryTemplate
+from easyscience.Objects.Inferface import ItemContainer
+from easyscience.Objects.new_variable import Parameter
+from easyscience.Objects.ObjectClasses import BaseObj
+
+
+class LineCalculator:
+    name = 'single'
+
+    def __init__(self):
+        self.values = {'m': 0.0, 'c': 0.0}
+        self.calls = []
+        self.created = 0
+
+    def create(self, model):
+        self.created += 1
+        return [ItemContainer('line', {'m': 'm', 'c': 'c'}, self.get_value, self.set_value)]
+
+    def get_value(self, link_name, key):
+        self.calls.append(('get', key))
+        return self.values[key]
+
+    def set_value(self, link_name, **kwargs):
+        self.calls.append(('set', *kwargs.keys()))
+        self.values.update(kwargs)
+
+    def fit_func(self, x):
+        return self.values['m'] * x + self.values['c']
+
+
+class BatchedLineCalculator(LineCalculator):
+    name = 'batched'
+
+    def set_many(self, updates):
+        self.calls.append(('set_many', updates))
+        self.values.update(updates['line'])
+
+    def get_many(self, requests):
+        self.calls.append(('get_many', requests))
+        return {'line': {key: self.values[key] for key in requests['line']}}
+
+
+class Interface(InterfaceFactoryTemplate):
+    def __init__(self, **kwargs):
+        super().__init__([BatchedLineCalculator, LineCalculator], **kwargs)
+
+
+class Line(BaseObj):
+    def __init__(self, interface=None):
+        super().__init__('line', m=Parameter('m', 2.0), c=Parameter('c', 1.0))
+        self.interface = interface
+
+    def __call__(self, x):
+        return self.interface.fit_func(x)
+
+
+def test_bindings_not_batched():
+    # When
+    line = Line(Interface(interface_name='single'))
+    calculator = line.interface()
+
+    # Then
+    line.m.value = 3.0
+
+    # Expect
+    assert not line.interface.batched
+    assert calculator.values['m'] == 3.0
+    assert ('set', 'm') in calculator.calls
+
+
+def test_bindings_batched_flush():
+    # When
+    line = Line(Interface())
+    calculator = line.interface()
+    calculator.calls.clear()
+
+    # Then
+    line.m.value = 3.0
+    line.c.value = 4.0
+
+    # Expect
+    assert line.interface.batched
+    # Reading the old values is one call
+    assert calculator.calls == [('get_many', {'line': ['m', 'c']})]
+    assert line.m.value == 3.0
+    assert calculator.values == {'m': 2.0, 'c': 1.0}
+    line.interface.flush()
+    assert calculator.calls[1:] == [('set_many', {'line': {'m': 3.0, 'c': 4.0}})]
+    assert calculator.values == {'m': 3.0, 'c': 4.0}
+
+
+def test_bindings_batched_get_cached():
+    # When
+    line = Line(Interface())
+    calculator = line.interface()
+    line.interface.flush()
+    calculator.calls.clear()
+    calculator.values['m'] = 5.0
+
+    # Then
+    values = [line.m.value, line.c.value, line.m.value]
+
+    # Expect
+    assert values == [5.0, 1.0, 5.0]
+    assert calculator.calls == [('get_many', {'line': ['m', 'c']})]
+
+
+def test_fit_func_flushes():
+    # When
+    line = Line(Interface())
+    calculator = line.interface()
+    calculator.calls.clear()
+    line.m.value = 3.0
+
+    # Then
+    y = line(np.array([1.0, 2.0]))
+
+    # Expect
+    assert np.allclose(y, [4.0, 7.0])
+    assert calculator.calls == [('get_many', {'line': ['m', 'c']}), ('set_many', {'line': {'m': 3.0}})]
+
+
+@pytest.mark.parametrize('interface_name', ['batched', 'single'])
+def test_fit_batched(interface_name):
+    # When
+    line = Line(Interface(interface_name=interface_name))
+    calculator = line.interface()
+    x = np.linspace(0, 10, 20)
+    fitter = Fitter(line, line)
+
+    # Then
+    fitter.fit(x, 3.0 * x + 2.0)
+
+    # Expect
+    assert line.m.value == pytest.approx(3.0)
+    assert line.c.value == pytest.approx(2.0)
+    if interface_name == 'batched':
+        assert not any(call[0] == 'set' for call in calculator.calls)
+
+
+class TrackingLineCalculator(LineCalculator):
+    name = 'tracking'
+
+    def __init__(self):
+        super().__init__()
+        self.received = []
+
+    def fit_func(self, x, changed=None):
+        self.received.append(changed)
+        return super().fit_func(x)
+
+
+class TrackingInterface(InterfaceFactoryTemplate):
+    def __init__(self, **kwargs):
+        super().__init__([TrackingLineCalculator, BatchedLineCalculator], **kwargs)
+
+
+@pytest.mark.parametrize('interface_name', ['tracking', 'batched'])
+def test_changed(interface_name):
+    # When
+    line = Line(TrackingInterface(interface_name=interface_name))
+    assert line.interface.changed == {'line': {'m', 'c'}}
+    line(np.ones(2))
+
+    # Then
+    line.c.value = 4.0
+
+    # Expect
+    assert line.interface.changed == {'line': {'c'}}
+    line(np.ones(2))
+    assert line.interface.changed == {}
+
+
+def test_fit_func_changed():
+    # When
+    line = Line(TrackingInterface())
+    calculator = line.interface()
+    line(np.ones(2))
+
+    # Then
+    line.m.value = 3.0
+    line(np.ones(2))
+    line(np.ones(2))
+
+    # Expect
+    assert calculator.received == [{'line': {'m', 'c'}}, {'line': {'m'}}, {}]
+
+
+def test_switch_reuses_interface():
+    # When
+    line = Line(Interface(interface_name='single'))
+    single = line.interface()
+    line.switch_interface('batched')
+    batched = line.interface()
+    line.m.value = 3.0
+
+    # Then
+    single.calls.clear()
+    line.switch_interface('single')
+
+    # Expect
+    assert line.interface() is single
+    assert single.created == 1
+    # Only the diverged value is set again
+    assert single.calls == [('set', 'm')]
+    assert single.values == {'m': 3.0, 'c': 1.0}
+    # The pending change was pushed to the interface we left
+    assert batched.values == {'m': 3.0, 'c': 1.0}
+    line.switch_interface('batched')
+    assert line.interface() is batched
+    assert batched.created == 1
+
+
+def test_generate_bindings_table_reused():
+    # When
+    line = Line(Interface(interface_name='single'))
+    calculator = line.interface()
+    calculator.calls.clear()
+
+    # Then
+    line.generate_bindings()
+    line.c.value = 5.0
+
+    # Expect
+    assert calculator.created == 1
+    assert calculator.calls == [('get', 'c'), ('set', 'c')]
+    assert calculator.values['c'] == 5.0
+
+
+def test_create_replaces_pooled_interface():
+    # When
+    line = Line(Interface(interface_name='single'))
+    single = line.interface()
+
+    # Then
+    line.interface.create(interface_name='single')
+    line.generate_bindings()
+
+    # Expect
+    assert line.interface() is not single
+    assert line.interface().created == 1
+    assert line.interface().values == {'m': 2.0, 'c': 1.0}
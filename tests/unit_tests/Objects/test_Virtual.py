@@ -5,10 +5,16 @@
 __author__ = "github.com/wardsimon"
 __version__ = "0.0.1"
 
+import gc
+import weakref
+
+import numpy as np
 import pytest
 
+from easyscience import global_object
 from easyscience.models.polynomial import Line
 from easyscience.Objects import virtual as Virtual
+from easyscience.Objects.new_variable import Parameter as NewParameter
 from easyscience.Objects.Variable import Parameter
 
 
@@ -95,3 +101,79 @@ def test_Base_obj():
     assert l.m.raw_value == m
     assert v_l.m.raw_value == m_other
     assert l.c.raw_value == v_l.c.raw_value
+
+
+def test_virtual_class_cached():
+    obj_1 = Parameter(name="a", value=1)
+    obj_2 = Parameter(name="b", value=2)
+    v_obj_1 = Virtual.virtualizer(obj_1)
+    v_obj_2 = Virtual.virtualizer(obj_2)
+
+    assert v_obj_1.__old_class__ is v_obj_2.__old_class__
+    assert v_obj_1._derived_from == obj_1.unique_name
+    assert v_obj_2._derived_from == obj_2.unique_name
+    with pytest.raises(AttributeError):
+        v_obj_1.fixed = False
+
+
+def test_virtual_class_registry_weak():
+    klass = type("Temporary", (Parameter,), {})
+    cls = Virtual._virtual_class(klass)
+    klass_ref = weakref.ref(klass)
+
+    assert Virtual._virtual_class(klass) is cls
+    del klass, cls
+    gc.collect()
+    assert klass_ref() is None
+
+
+@pytest.mark.parametrize("cls", [Parameter, NewParameter])
+def test_parameter_views(cls):
+    x = cls(name="x", value=0.25, min=0, max=1)
+    y = cls(name="y", value=0.5, min=0, max=1)
+    n_vertices = len(global_object.map.vertices())
+    views = Virtual.ParameterViews([x, y], index=[0, 1, 0], scale=[1, 1, -1], offset=[0, 0.5, 1])
+
+    assert len(views) == 3
+    assert len(global_object.map.vertices()) == n_vertices
+    assert np.allclose(views.values, [0.25, 1.0, 0.75])
+    assert views[2].name == "x"
+    assert views[2]._derived_from == x.unique_name
+    assert views[-1].value == 0.75
+    assert (views[2].min, views[2].max) == (0, 1)
+    assert views[2].is_virtual
+
+    x.value = 0.5
+    assert np.allclose(views.values, [0.5, 1.0, 0.5])
+    assert [view.value for view in views] == [0.5, 1.0, 0.5]
+
+
+def test_parameter_views_read_only():
+    x = NewParameter(name="x", value=0.25, variance=0.01)
+    views = Virtual.ParameterViews([x], scale=2)
+
+    with pytest.raises(AttributeError):
+        views[0].value = 1
+    with pytest.raises(AttributeError):
+        views[0].fixed = False
+    with pytest.raises(ValueError):
+        views.values[0] = 1
+    with pytest.raises(IndexError):
+        views[1]
+    with pytest.raises(IndexError):
+        Virtual.ParameterViews([x], index=[1])
+    assert views.errors == pytest.approx([0.2])
+
+
+def test_parameter_view_realize():
+    x = NewParameter(name="x", value=0.25, unit="m", variance=0.01)
+    views = Virtual.ParameterViews([x], offset=1)
+
+    real = views[0].realize()
+    x.value = 0.5
+
+    assert isinstance(real, NewParameter)
+    assert real.value == 1.25
+    assert real.unit == "m"
+    assert real.error == pytest.approx(0.1)
+    assert views[0].value == 1.5
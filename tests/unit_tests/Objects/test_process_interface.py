@@ -0,0 +1,253 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+
+from easyscience.fitting import Fitter
+from easyscience.fitting.multi_fitter import MultiFitter
+from easyscience.Objects.Inferface import InterfaceFactoryTemplate
+from easyscience.Objects.Inferface import ItemContainer
+from easyscience.Objects.new_variable import Parameter
+from easyscience.Objects.ObjectClasses import BaseObj
+from easyscience.Objects.process_interface import PendingResult
+from easyscience.Objects.process_interface import ProcessInterface
+from easyscience.Objects.process_interface import out_of_process
+
+needs_fork = pytest.mark.skipif(
+    'fork' not in multiprocessing.get_all_start_methods(), reason='The worker process is started with fork'
+)
+
+
+class LineCalculator:
+    name = 'line'
+
+    def __init__(self, offset=0.0):
+        self.values = {'m': 0.0, 'c': 0.0}
+        self.offset = offset
+
+    def create(self, model):
+        return [ItemContainer('line', {'m': 'm', 'c': 'c'}, self.get_value, self.set_value)]
+
+    def get_value(self, link_name, key):
+        return self.values[key]
+
+    def set_value(self, link_name, **kwargs):
+        self.values.update(kwargs)
+
+    def fit_func(self, x):
+        if np.any(np.isnan(x)):
+            raise ValueError('nan in x')
+        return self.values['m'] * x + self.values['c'] + self.offset
+
+
+class PidCalculator(LineCalculator):
+    name = 'pid'
+
+    def fit_func(self, x, changed=None):
+        # The process id and the number of changed parameters
+        return np.array([os.getpid(), len(changed.get('line', ()))], dtype=np.float64)
+
+
+class Interface(InterfaceFactoryTemplate):
+    def __init__(self, **kwargs):
+        super().__init__([out_of_process(LineCalculator), out_of_process(PidCalculator)], **kwargs)
+
+
+class Line(BaseObj):
+    def __init__(self, m=None, c=None, interface=None, unique_name=None):
+        m = Parameter('m', 2.0) if m is None else m
+        c = Parameter('c', 1.0) if c is None else c
+        super().__init__('line', unique_name=unique_name, m=m, c=c)
+        self.interface = interface
+
+    def __call__(self, x):
+        return self.interface.fit_func(x)
+
+
+def test_out_of_process_name():
+    # When
+    interface = Interface()
+
+    # Then
+    calculator = interface()
+
+    # Expect
+    assert interface.available_interfaces == ['line', 'pid']
+    assert isinstance(calculator, ProcessInterface)
+    assert calculator.interface_class is LineCalculator
+    calculator.close()
+
+
+@needs_fork
+def test_fit_func():
+    # When
+    line = Line(interface=Interface())
+    x = np.linspace(0, 1, 5)
+
+    # Then
+    line.m.value = 3.0
+    y = line(x)
+
+    # Expect
+    assert np.allclose(y, 3.0 * x + 1.0)
+    assert line.m.value == 3.0
+    line.interface().close()
+
+
+@needs_fork
+def test_fit_func_shapes():
+    # When
+    line = Line(interface=Interface())
+
+    # Then
+    small = line(np.ones(3))
+    large = line(np.ones((50, 2)))
+    again = line(np.ones(4))
+
+    # Expect
+    assert np.allclose(small, 3.0)
+    assert large.shape == (50, 2)
+    assert np.allclose(large, 3.0)
+    assert np.allclose(again, 3.0)
+    line.interface().close()
+
+
+@needs_fork
+def test_worker_process_and_changed():
+    # When
+    line = Line(interface=Interface(interface_name='pid'))
+    first = line(np.ones(1))
+
+    # Then
+    line.c.value = 4.0
+    second = line(np.ones(1))
+
+    # Expect
+    assert first[0] != os.getpid()
+    assert first[1] == 2
+    assert second[1] == 1
+    line.interface().close()
+
+
+@needs_fork
+def test_submit_parallel():
+    # When
+    calculators = [out_of_process(LineCalculator)(offset=offset) for offset in [0.0, 10.0]]
+    for calculator in calculators:
+        calculator.create(Line())
+        calculator.set_many({'line': {'m': 1.0}})
+
+    # Then
+    pending = [calculator.submit(np.arange(3.0)) for calculator in calculators]
+
+    # Expect
+    assert np.allclose(pending[1].result(), np.arange(3.0) + 10.0)
+    assert np.allclose(pending[0].result(), np.arange(3.0))
+    assert calculators[0].get_many({'line': ['m', 'c']}) == {'line': {'m': 1.0, 'c': 0.0}}
+    for calculator in calculators:
+        calculator.close()
+
+
+@needs_fork
+def test_multi_fitter_submits_all(monkeypatch):
+    # When
+    lines = [Line(interface=Interface()), Line(interface=Interface())]
+    x = [np.linspace(0, 10, 20), np.linspace(0, 5, 10)]
+    y = [3.0 * x[0] + 2.0, 0.5 * x[1] - 1.0]
+    calls = []
+    submit = ProcessInterface.submit
+    result = PendingResult.result
+
+    def spy_submit(self, *args, **kwargs):
+        calls.append('submit')
+        return submit(self, *args, **kwargs)
+
+    def spy_result(self):
+        if not self._done:
+            calls.append('result')
+        return result(self)
+
+    monkeypatch.setattr(ProcessInterface, 'submit', spy_submit)
+    monkeypatch.setattr(PendingResult, 'result', spy_result)
+    fitter = MultiFitter(lines, [line.interface.fit_func for line in lines])
+
+    # Then
+    results = fitter.fit(x, y)
+
+    # Expect
+    assert all(result.success for result in results)
+    assert lines[0].m.value == pytest.approx(3.0)
+    assert lines[1].c.value == pytest.approx(-1.0)
+    assert calls[:4] == ['submit', 'submit', 'result', 'result']
+    for line in lines:
+        line.interface().close()
+
+
+@needs_fork
+def test_worker_error():
+    # When
+    line = Line(interface=Interface())
+
+    # Then Expect
+    with pytest.raises(ValueError):
+        line(np.array([np.nan]))
+    assert np.allclose(line(np.ones(2)), 3.0)
+    line.interface().close()
+
+
+@needs_fork
+def test_fit():
+    # When
+    line = Line(interface=Interface())
+    x = np.linspace(0, 10, 20)
+    fitter = Fitter(line, line)
+
+    # Then
+    result = fitter.fit(x, 3.0 * x + 2.0)
+
+    # Expect
+    assert result.success
+    assert line.m.value == pytest.approx(3.0)
+    assert line.c.value == pytest.approx(2.0)
+    line.interface().close()
+
+
+def test_close():
+    # When
+    calculator = out_of_process(LineCalculator)()
+
+    # Then
+    calculator.close()
+
+    # Expect
+    with pytest.raises(RuntimeError):
+        calculator.fit_func(np.ones(2))
+
+
+@needs_fork
+def test_create_model_made_after_start():
+    # When
+    calculator = out_of_process(LineCalculator)()
+    calculator.create(Line())
+    model = Line()
+
+    # Then
+    links = calculator.create(model)
+    links[0].setter_fn('line', m=5.0)
+
+    # Expect
+    assert [(link.link_name, link.name_conversion) for link in links] == [('line', {'m': 'm', 'c': 'c'})]
+    assert links[0].getter_fn('line', 'm') == 5.0
+    calculator.close()
+
+
+def test_start_without_fork(monkeypatch):
+    # When
+    calculator = out_of_process(LineCalculator)()
+    monkeypatch.setattr(multiprocessing, 'get_all_start_methods', lambda: ['spawn'])
+
+    # Then Expect
+    with pytest.raises(RuntimeError, match='fork'):
+        calculator.fit_func(np.ones(2))
+    calculator.close()
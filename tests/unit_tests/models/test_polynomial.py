@@ -61,3 +61,55 @@ def test_Polynomial_pars(coo):
     x = np.linspace(0, 10, 100)
     y = np.polyval(coo, x)
     assert np.allclose(poly(x), y)
+
+
+@pytest.mark.parametrize("coo", [(), *poly_test_cases])
+def test_horner(coo):
+    from easyscience.models.polynomial import horner
+
+    x = np.linspace(-3, 3, 12).reshape(3, 4)
+    assert np.allclose(horner(np.array(coo), x), np.polyval(coo, x))
+    assert horner(np.array(coo), 2.0) == pytest.approx(np.polyval(coo, 2.0))
+
+    batch = np.array([coo, np.multiply(coo, 2)]).reshape(2, len(coo))
+    result = horner(batch, x)
+    assert result.shape == (2, 3, 4)
+    assert np.allclose(result[1], np.polyval(batch[1], x))
+
+
+def test_Polynomial_coefficient_changed():
+    poly = Polynomial(coefficients=[1., 2., 3.])
+    x = np.linspace(0, 10, 5)
+    values = poly.coefficients.value_array
+    assert poly.coefficients.value_array is values
+
+    poly.coefficients[1].value = 5.
+    assert poly.coefficients.value_array is not values
+    assert np.allclose(poly(x), np.polyval([1., 5., 3.], x))
+
+    poly.coefficients.append(Parameter("c3", 4.))
+    assert np.allclose(poly(x), np.polyval([1., 5., 3., 4.], x))
+
+
+def test_Polynomial_batch_call():
+    poly = Polynomial(coefficients=[1., 2., 3.])
+    poly.coefficients[1].fixed = True
+    x = np.linspace(0, 10, 5)
+    parameter_sets = np.array([[1., 3.], [2., 4.], [0., 0.]])
+
+    result = poly.batch_call(x, parameter_sets)
+
+    assert result.shape == (3, 5)
+    for values, y in zip(parameter_sets, result):
+        assert np.allclose(y, np.polyval([values[0], 2., values[1]], x))
+    assert [c.raw_value for c in poly.coefficients] == [1., 2., 3.]
+
+
+def test_Line_batch_call():
+    line = Line(2., 1.)
+    line.m.fixed = True
+    x = np.linspace(0, 10, 5)
+
+    result = line.batch_call(x, np.array([[0.], [3.]]))
+
+    assert np.allclose(result, [2. * x, 2. * x + 3.])
@@ -0,0 +1,99 @@
+import pytest
+import scipp as sc
+
+from scipp import UnitError
+
+from easyscience import global_object
+from easyscience.Objects.new_variable import DescriptorNumber
+from easyscience.Objects.new_variable import Parameter
+from easyscience.Objects.Variable import Parameter as LegacyParameter
+from easyscience.Utils.units import pint_conversion
+from easyscience.Utils.units import pint_unit
+from easyscience.Utils.units import scipp_factor
+from easyscience.Utils.units import scipp_unit
+from easyscience.Utils.units import to_unit
+from easyscience.Utils.units import ureg_unit
+
+
+def test_scipp_unit_cached():
+    # When
+    scipp_unit.cache_clear()
+
+    # Then
+    first = scipp_unit("m/s")
+    second = scipp_unit("m/s")
+
+    # Expect
+    assert first == sc.Unit("m/s")
+    assert first is second
+    assert scipp_unit.cache_info().hits == 1
+    with pytest.raises(UnitError):
+        scipp_unit("unknown")
+
+
+def test_scipp_factor():
+    # When Then Expect
+    assert scipp_factor("m", "cm") == pytest.approx(100)
+    assert scipp_factor("m", "m") == 1
+    with pytest.raises(UnitError):
+        scipp_factor("m", "s")
+
+
+def test_to_unit():
+    # When
+    variable = sc.scalar(2.0, unit="m", variance=0.01)
+
+    # Then
+    converted = to_unit(variable, "cm")
+
+    # Expect
+    assert to_unit(variable, "m") is variable
+    assert converted.value == pytest.approx(200)
+    assert converted.variance == pytest.approx(100)
+    assert converted.unit == "cm"
+
+
+def test_pint_unit_and_conversion():
+    # When Then Expect
+    assert pint_unit("m/s") is pint_unit("m/s")
+    assert ureg_unit("m/s") is ureg_unit("m/s")
+    assert str(ureg_unit("m")) == "meter"
+    assert pint_conversion("m", "cm") == pytest.approx((100, 0))
+    assert pint_conversion("degC", "K") == pytest.approx((1, 273.15))
+
+
+def test_arithmetic_leaves_operands_unchanged():
+    # When
+    a = Parameter(name="a", value=1, unit="m", min=0, max=2)
+    b = Parameter(name="b", value=10, unit="cm", min=5, max=20)
+    d = DescriptorNumber(name="d", value=10, unit="cm")
+    epoch = global_object.value_epoch
+
+    # Then
+    added = a + b
+    subtracted = d - a
+
+    # Expect
+    assert global_object.value_epoch == epoch
+    assert b.unit == "cm" and b.value == 10 and b.min == 5
+    assert a.unit == "m" and a.value == 1 and a.max == 2
+    assert added.value == pytest.approx(1.1)
+    assert added.min == pytest.approx(0.05)
+    assert added.max == pytest.approx(2.2)
+    assert subtracted.unit == "cm"
+    assert subtracted.value == pytest.approx(-90)
+    assert subtracted.min == pytest.approx(-190)
+    assert subtracted.max == pytest.approx(10)
+
+
+def test_legacy_parameter_convert_unit_bounds():
+    # When
+    parameter = LegacyParameter("t", 300, units="K", min=200, max=400)
+
+    # Then
+    parameter.convert_unit("degC")
+
+    # Expect
+    assert parameter.raw_value == pytest.approx(26.85)
+    assert parameter.min == pytest.approx(-73.15)
+    assert parameter.max == pytest.approx(126.85)